@@ -0,0 +1,122 @@
+"""
+Compares validating a corpus of dev container configs with the discriminated
+`DevContainer` union against the previous plain union, which pydantic validates in
+smart mode, trying each variant in turn. Invalid configs are timed separately, with
+the number of errors each one reports.
+
+Run from the repository root: `python -m benchmarks.bench_devcontainer`
+"""
+
+import argparse
+import json
+import random
+import time
+from typing import Union
+
+from pydantic import RootModel, ValidationError
+
+from hide.devcontainer.model import (
+    ComposeDevContainer,
+    DevContainerRoot,
+    DockerfileDevContainer,
+    ImageDevContainer,
+)
+
+
+class UnionRoot(RootModel):
+    root: Union[DockerfileDevContainer, ImageDevContainer, ComposeDevContainer]
+
+
+def common(rng: random.Random, i: int) -> dict:
+    config = {
+        "name": f"project {i}",
+        "forwardPorts": [8000 + n for n in range(rng.randint(0, 3))],
+        "postCreateCommand": "pip install -r requirements.txt",
+        "remoteEnv": {"PYTHONPATH": "/workspace/src"},
+        "customizations": {
+            "hide": {
+                "tasks": [
+                    {"alias": "test", "command": "pytest"},
+                    {"alias": "lint", "command": "ruff check ."},
+                ]
+            },
+            "vscode": {"extensions": ["ms-python.python"]},
+        },
+    }
+    if rng.random() < 0.5:
+        config["onCreateCommand"] = {"deps": ["make", "deps"], "db": "make db"}
+    if rng.random() < 0.3:
+        config["hostRequirements"] = {"cpus": 4, "memory": "8gb"}
+    return config
+
+
+def valid_config(rng: random.Random, i: int) -> dict:
+    kind = i % 3
+    config = common(rng, i)
+    if kind == 0:
+        config["dockerfile"] = "Dockerfile"
+        config["build"] = {"args": {"VARIANT": "3.12"}, "target": "dev"}
+    elif kind == 1:
+        config["image"] = "mcr.microsoft.com/devcontainers/python:3.12"
+        config["runArgs"] = ["--init"]
+    else:
+        config["dockerComposeFile"] = ["compose.yml", "compose.dev.yml"]
+        config["service"] = "app"
+        config["workspaceFolder"] = "/workspace"
+    return config
+
+
+def invalid_config(rng: random.Random, i: int) -> dict:
+    config = valid_config(rng, i)
+    config.pop("workspaceFolder", None)
+    config["forwardPorts"] = [{"port": 8000}]
+    return config
+
+
+def best_of(repeat: int, func) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def validate_all(cls, configs: list[bytes]) -> int:
+    errors = 0
+    for config in configs:
+        try:
+            cls.model_validate_json(config)
+        except ValidationError as e:
+            errors += e.error_count()
+    return errors
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--configs", type=int, default=3_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    corpus = {
+        "valid": [
+            json.dumps(valid_config(rng, i)).encode() for i in range(args.configs)
+        ],
+        "invalid": [
+            json.dumps(invalid_config(rng, i)).encode() for i in range(args.configs)
+        ],
+    }
+
+    print(f"{args.configs} configs each")
+    print(f"{'':22} {'per config':>12} {'errors':>8}")
+    for name, configs in corpus.items():
+        for label, cls in [("union", UnionRoot), ("discriminated", DevContainerRoot)]:
+            elapsed = best_of(args.repeat, lambda: validate_all(cls, configs))
+            per_config = elapsed / len(configs) * 1e6
+            errors = validate_all(cls, configs) / len(configs)
+            print(f"{name + ' ' + label:22} {per_config:10.1f}us {errors:8.1f}")
+
+
+if __name__ == "__main__":
+    main()
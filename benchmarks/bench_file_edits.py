@@ -0,0 +1,82 @@
+"""
+Compares a multi-hunk edit applied with `File.apply_edits` against the same hunks
+applied one by one, with `File.replace_lines` and with the previous list-of-`Line`
+implementation.
+
+Run from the repository root: `python -m benchmarks.bench_file_edits`
+"""
+
+import argparse
+import time
+
+from hide.model import File, Line, LineDiffUpdate
+
+
+def legacy_replace_lines(
+    lines: list[Line], start_line: int, end_line: int, content: str
+) -> list[Line]:
+    result = []
+    new_lines = content.splitlines()
+    result.extend(lines[: start_line - 1])
+    for idx, line in enumerate(new_lines):
+        result.append(Line(number=start_line + idx, content=line))
+    result.extend(lines[end_line - 1 :])
+    for line in result[start_line + len(new_lines) - 1 :]:
+        line.number += len(new_lines) - (end_line - start_line)
+    return result
+
+
+def timed(func) -> float:
+    start = time.perf_counter()
+    func()
+    return (time.perf_counter() - start) * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--lines", type=int, default=100_000)
+    parser.add_argument("--hunks", type=int, default=200)
+    args = parser.parse_args()
+
+    content = "".join(f"value_{i} = {i}  # some code\n" for i in range(args.lines))
+    step = args.lines // args.hunks
+    # Each hunk replaces one line with two.
+    edits = [
+        LineDiffUpdate(start_line=line, end_line=line + 1, content="a = 1\nb = 2")
+        for line in range(1, args.lines, step)
+    ]
+
+    def legacy():
+        lines = [
+            Line(number=i + 1, content=line)
+            for i, line in enumerate(content.splitlines())
+        ]
+        # Later hunks first, so earlier edits do not move them.
+        for edit in reversed(edits):
+            lines = legacy_replace_lines(
+                lines, edit.start_line, edit.end_line, edit.content
+            )
+        return lines
+
+    def one_by_one():
+        file = File.from_content("big.py", content)
+        for edit in reversed(edits):
+            file.replace_lines(edit.start_line, edit.end_line, edit.content)
+        return file
+
+    def one_pass():
+        return File.from_content("big.py", content).apply_edits(edits)
+
+    assert one_by_one().lines == one_pass().lines == legacy()
+
+    print(f"{args.lines} line file, {len(edits)} hunks")
+    for name, func in [
+        ("list[Line], one by one", legacy),
+        ("replace_lines, one by one", one_by_one),
+        ("apply_edits", one_pass),
+    ]:
+        print(f"{name:28} {timed(func):10.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""
+Compares parse time and memory of `File`, which keeps lines in one text buffer,
+against the previous model holding a list of `Line` objects.
+
+Run from the repository root: `python -m benchmarks.bench_file_model`
+"""
+
+import argparse
+import json
+import time
+import tracemalloc
+from typing import List
+
+from pydantic import BaseModel, Field
+
+from hide.model import Diagnostic, File, FilePath, Line
+
+
+class ListFile(BaseModel):
+    path: FilePath
+    lines: List[Line] = Field(default_factory=list)
+    diagnostics: List[Diagnostic] = Field(default_factory=list)
+
+
+def best_of(repeat: int, func) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings) * 1000
+
+
+def retained(func) -> int:
+    tracemalloc.start()
+    result = func()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return size
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--lines", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    data = {
+        "path": "big.py",
+        "lines": [
+            {"number": i + 1, "content": f"value_{i} = {i}  # some code"}
+            for i in range(args.lines)
+        ],
+    }
+    raw = json.dumps(data)
+
+    print(f"{args.lines} line file")
+    print(f"{'':12} {'validate':>12} {'validate_json':>14} {'memory':>10}")
+    for name, cls in [("list[Line]", ListFile), ("File", File)]:
+        validate = best_of(args.repeat, lambda: cls.model_validate(data))
+        validate_json = best_of(args.repeat, lambda: cls.model_validate_json(raw))
+        memory = retained(lambda: cls.model_validate_json(raw)) / 1024 / 1024
+        print(f"{name:12} {validate:10.1f}ms {validate_json:12.1f}ms {memory:8.1f}MB")
+
+
+if __name__ == "__main__":
+    main()
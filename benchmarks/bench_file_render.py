@@ -0,0 +1,103 @@
+"""
+Compares rendering a large file with many diagnostics (`str(file)`) against the
+previous renderer, which checked every diagnostic for every line, and against a
+windowed render of a few lines.
+
+Run from the repository root: `python -m benchmarks.bench_file_render`
+"""
+
+import argparse
+import time
+
+from hide.model import (
+    Diagnostic,
+    DiagnosticSeverity,
+    File,
+    HorizontalEllipsis,
+    LowerLeftCorner,
+    Position,
+    Range,
+    UpperLeftCorner,
+    VerticalLine,
+)
+
+
+def legacy_str(file: File) -> str:
+    output = []
+    line_number_width = len(str(file.lines[-1].number))
+    prev_line = 0
+    output.append(f"{' ' * line_number_width} {UpperLeftCorner} {file.path}")
+    for line in file.lines:
+        if line.number != prev_line + 1:
+            output.append(
+                f"{' ' * (line_number_width - 1)}{HorizontalEllipsis} {VerticalLine} {HorizontalEllipsis}"
+            )
+        output.append(
+            f"{line.number:>{line_number_width}} {VerticalLine} {line.content}"
+        )
+        for diagnostic in file.diagnostics:
+            line_index = line.number - 1
+            if diagnostic.range.start.line <= line_index <= diagnostic.range.end.line:
+                start = (
+                    diagnostic.range.start.character
+                    if line_index == diagnostic.range.start.line
+                    else 0
+                )
+                end = (
+                    diagnostic.range.end.character
+                    if line_index == diagnostic.range.end.line
+                    else len(line.content)
+                )
+                offset = " " * (start + line_number_width + 3)
+                caret_line = offset + "^" * (end - start)
+                severity = diagnostic.severity.name if diagnostic.severity else ""
+                output.append(f"{caret_line} {severity}: {diagnostic.message}")
+                output.append("")
+        prev_line = line.number
+    output.append(f"{' ' * line_number_width} {LowerLeftCorner}")
+    return "\n".join(output)
+
+
+def timed(func) -> float:
+    start = time.perf_counter()
+    func()
+    return (time.perf_counter() - start) * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--lines", type=int, default=10_000)
+    parser.add_argument("--diagnostics", type=int, default=2_000)
+    args = parser.parse_args()
+
+    file = File.from_content(
+        "big.py", "".join(f"value_{i} = {i}  # some code\n" for i in range(args.lines))
+    )
+    step = args.lines // args.diagnostics
+    file.diagnostics = [
+        Diagnostic(
+            range=Range(
+                start=Position(line=line, character=0),
+                # Every tenth diagnostic spans a few lines.
+                end=Position(line=line + (3 if i % 10 == 0 else 0), character=5),
+            ),
+            severity=DiagnosticSeverity.Warning,
+            message="unused variable",
+        )
+        for i, line in enumerate(range(0, args.lines, step))
+    ]
+
+    assert str(file) == legacy_str(file)
+
+    middle = args.lines // 2
+    print(f"{args.lines} line file, {len(file.diagnostics)} diagnostics")
+    for name, func in [
+        ("previous str", lambda: legacy_str(file)),
+        ("str", lambda: str(file)),
+        ("render 50 lines", lambda: file.render(middle, middle + 50, context=5)),
+    ]:
+        print(f"{name:20} {timed(func):10.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
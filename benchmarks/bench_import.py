@@ -0,0 +1,74 @@
+"""
+Measures how long importing `hide` and its entry points takes in a fresh
+interpreter, from the `python -X importtime` report, and fails if `import hide`
+exceeds its budget.
+
+Run from the repository root: `python -m benchmarks.bench_import`
+"""
+
+import argparse
+import statistics
+import subprocess
+import sys
+
+STATEMENTS = {
+    "import hide": "import hide",
+    "hide.Client": "import hide; hide.Client",
+    "hide.AsyncClient": "import hide; hide.AsyncClient",
+    "Toolkit": "from hide.toolkit import Toolkit",
+    "devcontainer": "import hide.devcontainer.model",
+}
+
+
+def top_level_imports(statement: str) -> dict[str, int]:
+    """Cumulative import time in microseconds of each top-level import."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    imports = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line.removeprefix("import time:").split("|")
+        if not name.startswith("  "):
+            imports[name.strip()] = int(cumulative)
+    return imports
+
+
+def import_time(statement: str, startup: set[str]) -> float:
+    """Milliseconds spent importing modules for `statement` beyond startup."""
+    imports = top_level_imports(statement)
+    return sum(imports[name] for name in imports.keys() - startup) / 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repeat", type=int, default=10)
+    parser.add_argument(
+        "--budget-ms",
+        type=float,
+        default=25.0,
+        help="fail if the median time of `import hide` is above this",
+    )
+    args = parser.parse_args()
+
+    startup = set(top_level_imports("pass"))
+    medians = {}
+    print(f"{'':18} {'median':>9} {'max':>9}")
+    for label, statement in STATEMENTS.items():
+        timings = [import_time(statement, startup) for _ in range(args.repeat)]
+        medians[label] = statistics.median(timings)
+        print(f"{label:18} {medians[label]:7.1f}ms {max(timings):7.1f}ms")
+
+    if medians["import hide"] > args.budget_ms:
+        sys.exit(
+            f"import hide took {medians['import hide']:.1f}ms, "
+            f"over the budget of {args.budget_ms}ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
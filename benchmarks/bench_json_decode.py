@@ -0,0 +1,131 @@
+"""
+Compares CPU time and peak memory of decoding large responses: parsing with
+`json.loads` and validating each item (the previous path), validating straight from
+bytes (`JsonCodec`), and parsing with orjson first (`OrjsonCodec`). "streamed" decodes
+the response in 64KiB chunks as `iter_files` does, handling one item at a time
+without keeping it. For flat models, "model_construct" shows what skipping validation
+for a trusted server would cost instead.
+
+Run from the repository root: `python -m benchmarks.bench_json_decode`
+"""
+
+import argparse
+import json
+import time
+import tracemalloc
+
+from hide import model
+from hide.client import endpoints
+from hide.client.codec import JsonCodec, OrjsonCodec
+from hide.client.streaming import decode_json_array
+
+
+class Response:
+    status_code = 200
+
+    def __init__(self, content: bytes) -> None:
+        self.content = content
+
+    def json(self):
+        return json.loads(self.content)
+
+
+def per_item(cls):
+    def parse(response: Response):
+        return [cls.model_validate(item) for item in response.json()]
+
+    return parse
+
+
+def streamed(adapter, content: bytes) -> int:
+    chunks = (content[i : i + 65536] for i in range(0, len(content), 65536))
+    return sum(1 for item in decode_json_array(chunks) if adapter.validate_python(item))
+
+
+def constructed(cls):
+    def parse(response: Response):
+        return [cls.model_construct(**item) for item in response.json()]
+
+    return parse
+
+
+def cpu_time(repeat: int, func) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.process_time()
+        func()
+        timings.append(time.process_time() - start)
+    return min(timings) * 1000
+
+
+def peak_memory(func) -> float:
+    tracemalloc.start()
+    result = func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return peak / 1024 / 1024
+
+
+def search_results(files: int, lines: int) -> list[dict]:
+    return [
+        {
+            "path": f"src/package_{i % 20}/module_{i}.py",
+            "lines": [
+                {"number": n + 1, "content": f"    result_{n} = search_target({n})"}
+                for n in range(lines)
+            ],
+        }
+        for i in range(files)
+    ]
+
+
+def file_infos(files: int) -> list[dict]:
+    return [{"path": f"src/package_{i % 20}/module_{i}.py"} for i in range(files)]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--files", type=int, default=2_000)
+    parser.add_argument("--lines", type=int, default=100)
+    parser.add_argument("--items", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    cases = [
+        (
+            "search_files",
+            search_results(args.files, args.lines),
+            model.File,
+            endpoints.FILE,
+            endpoints.search_files("p", "target").parse,
+        ),
+        (
+            "list_files",
+            file_infos(args.items),
+            model.FileInfo,
+            endpoints.FILE_INFO,
+            endpoints.list_files("p").parse,
+        ),
+    ]
+    for name, data, cls, adapter, parse in cases:
+        raw = json.dumps(data).encode()
+        response = Response(raw)
+        print(f"{name}: {len(data)} items, {len(raw) / 1024 / 1024:.1f}MB")
+        print(f"{'':16} {'cpu':>10} {'peak memory':>12}")
+        modes = [
+            ("json + per item", lambda: per_item(cls)(response)),
+            ("JsonCodec", lambda: parse(response, JsonCodec())),
+            ("OrjsonCodec", lambda: parse(response, OrjsonCodec())),
+            ("streamed", lambda: streamed(adapter, raw)),
+        ]
+        if cls is model.FileInfo:
+            modes.append(("model_construct", lambda: constructed(cls)(response)))
+        for label, decode in modes:
+            cpu = cpu_time(args.repeat, decode)
+            peak = peak_memory(decode)
+            print(f"{label:16} {cpu:8.0f}ms {peak:10.1f}MB")
+
+
+if __name__ == "__main__":
+    main()
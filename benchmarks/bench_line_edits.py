@@ -0,0 +1,74 @@
+"""
+Compares a one-line edit through `Toolkit.replace_lines` (single line-diff update)
+against the previous get_file + overwrite round trip on a large file.
+
+Run from the repository root: `python -m benchmarks.bench_line_edits`
+"""
+
+import argparse
+import time
+
+import hide
+from hide.model import OverwriteUpdate, Project, Repository
+from hide.toolkit import Toolkit
+from tests.fake_server import FakeHideServer
+
+PATH = "big.py"
+
+
+def get_and_overwrite(toolkit: Toolkit, line: int) -> None:
+    client, project_id = toolkit.client, toolkit.project.id
+    file = client.get_file(project_id=project_id, path=PATH)
+    file = file.replace_lines(line, line + 1, "edited = True")
+    client.update_file(
+        project_id=project_id,
+        path=PATH,
+        update=OverwriteUpdate(content=file.content()),
+    )
+
+
+def line_diff(toolkit: Toolkit, line: int) -> None:
+    result = toolkit.replace_lines(PATH, line, line + 1, "edited = True")
+    assert result.startswith("File updated"), result
+
+
+def measure(server: FakeHideServer, toolkit: Toolkit, edit, edits: int):
+    received, sent = server.bytes_received, server.bytes_sent
+    start = time.perf_counter()
+    for i in range(edits):
+        edit(toolkit, 1 + i * 97)
+    elapsed = (time.perf_counter() - start) / edits
+    return (
+        elapsed * 1000,
+        (server.bytes_received - received) / edits,
+        (server.bytes_sent - sent) / edits,
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--lines", type=int, default=50_000)
+    parser.add_argument("--edits", type=int, default=10)
+    args = parser.parse_args()
+
+    with FakeHideServer() as server:
+        fake_project = server.add_project()
+        fake_project.files[PATH] = "".join(
+            f"value_{i} = {i}  # some code\n" for i in range(args.lines)
+        )
+        project = Project(id=fake_project.id, repository=Repository(url="u"))
+
+        with hide.Client(base_url=server.base_url) as client:
+            toolkit = Toolkit(project=project, client=client)
+            print(f"{args.lines} line file, {args.edits} one-line edits")
+            print(f"{'':20} {'ms/edit':>10} {'uploaded':>12} {'downloaded':>12}")
+            for name, edit in [
+                ("get + overwrite", get_and_overwrite),
+                ("line diff", line_diff),
+            ]:
+                ms, up, down = measure(server, toolkit, edit, args.edits)
+                print(f"{name:20} {ms:10.1f} {up:11.0f}B {down:11.0f}B")
+
+
+if __name__ == "__main__":
+    main()
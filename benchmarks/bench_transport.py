@@ -0,0 +1,50 @@
+"""
+Compares calls/sec of the pooled HideClient transport against one-off `requests`
+calls that open a new connection per request.
+
+Run from the repository root: `python -m benchmarks.bench_transport`
+"""
+
+import argparse
+import time
+
+import requests
+
+import hide
+from tests.fake_server import FakeHideServer
+
+
+def one_off_calls(base_url: str, project_id: str, calls: int) -> float:
+    start = time.perf_counter()
+    for _ in range(calls):
+        response = requests.get(f"{base_url}/projects/{project_id}/files/README.md")
+        response.raise_for_status()
+    return calls / (time.perf_counter() - start)
+
+
+def pooled_calls(base_url: str, project_id: str, calls: int) -> float:
+    with hide.Client(base_url=base_url) as client:
+        start = time.perf_counter()
+        for _ in range(calls):
+            client.get_file(project_id, "README.md")
+        return calls / (time.perf_counter() - start)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--calls", type=int, default=2000)
+    args = parser.parse_args()
+
+    with FakeHideServer() as server:
+        project = server.add_project()
+        project.files["README.md"] = "Hello World\n"
+
+        one_off = one_off_calls(server.base_url, project.id, args.calls)
+        pooled = pooled_calls(server.base_url, project.id, args.calls)
+
+    print(f"one-off requests: {one_off:8.0f} calls/sec")
+    print(f"pooled client:    {pooled:8.0f} calls/sec ({pooled / one_off:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
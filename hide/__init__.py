@@ -1 +1,17 @@
-from .client.hide_client import HideClient as Client
+from typing import TYPE_CHECKING
+
+from hide._lazy import lazy_attributes
+
+if TYPE_CHECKING:
+    from .client.async_hide_client import AsyncHideClient as AsyncClient
+    from .client.hide_client import HideClient as Client
+
+__all__ = ["AsyncClient", "Client"]
+
+__getattr__, __dir__ = lazy_attributes(
+    __name__,
+    {
+        "AsyncClient": (".client.async_hide_client", "AsyncHideClient"),
+        "Client": (".client.hide_client", "HideClient"),
+    },
+)
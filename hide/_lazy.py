@@ -0,0 +1,40 @@
+"""
+Lazy attributes of packages, so that importing a package does not import the
+modules behind its exports (and their dependencies) until they are first used.
+"""
+
+import importlib
+from typing import Any, Callable
+
+
+def lazy_attributes(
+    package: str, exports: dict[str, tuple[str, str]]
+) -> tuple[Callable[[str], Any], Callable[[], list[str]]]:
+    """
+    Returns the module `__getattr__` and `__dir__` of `package`, resolving each of
+    `exports` from its (module, attribute) on first access. Other names are looked
+    up as submodules, as if the package had imported them.
+    """
+    namespace = importlib.import_module(package).__dict__
+
+    def __getattr__(name: str) -> Any:
+        if name not in exports:
+            return _submodule(package, name)
+        module, attribute = exports[name]
+        value = getattr(importlib.import_module(module, package), attribute)
+        namespace[name] = value
+        return value
+
+    def __dir__() -> list[str]:
+        return sorted({*namespace, *exports})
+
+    return __getattr__, __dir__
+
+
+def _submodule(package: str, name: str) -> Any:
+    try:
+        return importlib.import_module(f"{package}.{name}")
+    except ModuleNotFoundError as e:
+        if e.name != f"{package}.{name}":
+            raise
+        raise AttributeError(f"module {package!r} has no attribute {name!r}") from None
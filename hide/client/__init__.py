@@ -1 +1,77 @@
-from .hide_client import HideClientError
+from typing import TYPE_CHECKING
+
+from hide._lazy import lazy_attributes
+
+if TYPE_CHECKING:
+    from .async_hide_client import AsyncHideClient
+    from .cache import CacheStats, FileCache, SymbolCache
+    from .changeset import Changeset
+    from .codec import JsonCodec, OrjsonCodec
+    from .errors import DeadlineExceeded, HideClientError
+    from .hide_client import HideClient
+    from .instrumentation import LatencyHistograms, RequestEvent, RequestHook, Span
+    from .limits import Limit, RateLimiter, RateLimits
+    from .retry import RetryPolicy, RetryStats
+    from .streaming import TaskOutputBuffer
+    from .task_handle import AsyncTaskHandle, TaskHandle
+    from .timeouts import Timeout, deadline
+    from .transport import create_session
+
+__all__ = [
+    "AsyncHideClient",
+    "AsyncTaskHandle",
+    "CacheStats",
+    "Changeset",
+    "create_session",
+    "deadline",
+    "DeadlineExceeded",
+    "FileCache",
+    "HideClient",
+    "HideClientError",
+    "JsonCodec",
+    "LatencyHistograms",
+    "Limit",
+    "OrjsonCodec",
+    "RateLimiter",
+    "RateLimits",
+    "RequestEvent",
+    "RequestHook",
+    "RetryPolicy",
+    "RetryStats",
+    "Span",
+    "SymbolCache",
+    "TaskHandle",
+    "TaskOutputBuffer",
+    "Timeout",
+]
+
+__getattr__, __dir__ = lazy_attributes(
+    __name__,
+    {
+        "AsyncHideClient": (".async_hide_client", "AsyncHideClient"),
+        "CacheStats": (".cache", "CacheStats"),
+        "FileCache": (".cache", "FileCache"),
+        "SymbolCache": (".cache", "SymbolCache"),
+        "Changeset": (".changeset", "Changeset"),
+        "JsonCodec": (".codec", "JsonCodec"),
+        "OrjsonCodec": (".codec", "OrjsonCodec"),
+        "DeadlineExceeded": (".errors", "DeadlineExceeded"),
+        "HideClientError": (".errors", "HideClientError"),
+        "HideClient": (".hide_client", "HideClient"),
+        "LatencyHistograms": (".instrumentation", "LatencyHistograms"),
+        "RequestEvent": (".instrumentation", "RequestEvent"),
+        "RequestHook": (".instrumentation", "RequestHook"),
+        "Span": (".instrumentation", "Span"),
+        "Limit": (".limits", "Limit"),
+        "RateLimiter": (".limits", "RateLimiter"),
+        "RateLimits": (".limits", "RateLimits"),
+        "RetryPolicy": (".retry", "RetryPolicy"),
+        "RetryStats": (".retry", "RetryStats"),
+        "TaskOutputBuffer": (".streaming", "TaskOutputBuffer"),
+        "AsyncTaskHandle": (".task_handle", "AsyncTaskHandle"),
+        "TaskHandle": (".task_handle", "TaskHandle"),
+        "Timeout": (".timeouts", "Timeout"),
+        "deadline": (".timeouts", "deadline"),
+        "create_session": (".transport", "create_session"),
+    },
+)
@@ -0,0 +1,711 @@
+import asyncio
+import functools
+from contextlib import (
+    AbstractAsyncContextManager,
+    AbstractContextManager,
+    AsyncExitStack,
+    nullcontext,
+)
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    AsyncGenerator,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Literal,
+    Optional,
+    Sequence,
+    TypeVar,
+    Union,
+    overload,
+)
+
+import httpx
+from pydantic import TypeAdapter
+
+from hide import model
+from hide.client import endpoints
+from hide.client.cache import FileCache, SymbolCache
+from hide.client.changeset import Changeset, touched_paths
+from hide.client.codec import DEFAULT_CODEC, JSON_CONTENT, JsonCodec
+from hide.client.errors import DeadlineExceeded, HideClientError
+from hide.client.instrumentation import (
+    Instrumentation,
+    RequestEvent,
+    RequestHook,
+    body_size,
+    content_length,
+)
+from hide.client.limits import RateLimiter, RateLimits, shared_limiter
+from hide.client.retry import RetryPolicy, RetryStats
+from hide.client.streaming import CHUNK_SIZE, JsonArrayDecoder, TaskEventDecoder
+from hide.client.task_handle import AsyncTaskHandle
+from hide.client.timeouts import Timeout, allows, expired, task_timeout
+
+if TYPE_CHECKING:
+    from hide.devcontainer.model import DevContainer
+
+DEFAULT_LIMITS = httpx.Limits(max_connections=100, max_keepalive_connections=20)
+
+T = TypeVar("T")
+
+
+def _hold_until_closed(response: httpx.Response, limit: AsyncExitStack) -> None:
+    """Keeps the rate limit slot of a streamed response until it is closed."""
+    aclose = response.aclose
+
+    async def release() -> None:
+        try:
+            await aclose()
+        finally:
+            await limit.aclose()
+
+    response.aclose = release  # type: ignore[method-assign]
+
+
+class AsyncHideClient:
+    def __init__(
+        self,
+        base_url: str = endpoints.DEFAULT_BASE_URL,
+        client: Optional[httpx.AsyncClient] = None,
+        limits: httpx.Limits = DEFAULT_LIMITS,
+        file_cache: Optional[FileCache] = None,
+        retry: RetryPolicy = RetryPolicy(),
+        rate_limits: Optional[RateLimits] = None,
+        timeout: Timeout = Timeout(),
+        hooks: Sequence[RequestHook] = (),
+        codec: JsonCodec = DEFAULT_CODEC,
+        symbol_cache: Optional[SymbolCache] = None,
+    ) -> None:
+        """
+        Asyncio counterpart of `HideClient`. Requests share one pool of keep-alive
+        connections bounded by `limits`. Pass `client` to use a preconfigured
+        `httpx.AsyncClient` (e.g. with a custom transport). Pass `file_cache` to
+        cache the files read by `get_file`, and `symbol_cache` to cache outlines
+        and symbol searches. Failed requests are retried according to `retry`,
+        limited by `rate_limits`, bounded by `timeout` and the current `deadline`,
+        reported to `hooks` and decoded by `codec`, as in `HideClient`.
+        """
+        self.base_url = base_url
+        self.client = client or httpx.AsyncClient(
+            limits=limits, timeout=None, follow_redirects=True
+        )
+        self.file_cache = file_cache
+        self.symbol_cache = symbol_cache
+        self.retry = retry
+        self.retry_stats = RetryStats()
+        self.rate_limiter: Optional[RateLimiter] = (
+            shared_limiter(base_url, rate_limits) if rate_limits else None
+        )
+        self.timeout = timeout
+        self.instrumentation = Instrumentation(hooks)
+        self.codec = codec
+        self.max_parallel_reads = limits.max_keepalive_connections or 20
+        # Unknown until the first batch read or changeset.
+        self._batch_reads: Optional[bool] = None
+        self._batch_changes: Optional[bool] = None
+
+    async def aclose(self) -> None:
+        await self.client.aclose()
+
+    async def __aenter__(self) -> "AsyncHideClient":
+        return self
+
+    async def __aexit__(self, *args: Any) -> None:
+        await self.aclose()
+
+    async def _call(self, endpoint: endpoints.Endpoint[T]) -> T:
+        return endpoint.parse(await self._send(endpoint), self.codec)
+
+    async def _send(self, endpoint: endpoints.Endpoint[Any]) -> httpx.Response:
+        return await self._request(endpoint)
+
+    async def _request(
+        self, endpoint: endpoints.Endpoint[Any], stream: bool = False
+    ) -> httpx.Response:
+        event = self.instrumentation.start(endpoint)
+        try:
+            response = await self._send_with_retries(endpoint, event, stream)
+        except BaseException as e:
+            self.instrumentation.finish(event, error=e)
+            raise
+        if event is not None:
+            self.instrumentation.finish(
+                event,
+                response.status_code,
+                body_size(response.request.content),
+                content_length(response.headers) if stream else len(response.content),
+            )
+        return response
+
+    async def _send_with_retries(
+        self,
+        endpoint: endpoints.Endpoint[Any],
+        event: Optional[RequestEvent],
+        stream: bool,
+    ) -> httpx.Response:
+        payload, headers = endpoint.json, endpoint.headers
+        body = None if payload is None else self.codec.encode(payload)
+        if body is not None:
+            payload, headers = None, {**(headers or {}), **JSON_CONTENT}
+
+        attempt = 1
+        while True:
+            try:
+                async with AsyncExitStack() as limit:
+                    await limit.enter_async_context(self._limit(endpoint.path))
+                    request = self.client.build_request(
+                        endpoint.method,
+                        f"{self.base_url}{endpoint.path}",
+                        params=endpoint.params,
+                        content=body,
+                        json=payload,
+                        headers=headers,
+                        timeout=self._timeout(endpoint),
+                    )
+                    response = await self.client.send(request, stream=stream)
+                    if stream:
+                        _hold_until_closed(response, limit.pop_all())
+            except httpx.TransportError as e:
+                if expired():
+                    raise DeadlineExceeded() from e
+                delay = self.retry.delay(endpoint.method, attempt)
+                if delay is None or not allows(delay):
+                    raise
+            else:
+                delay = self.retry.delay(
+                    endpoint.method, attempt, response.status_code, response.headers
+                )
+                if delay is None or not allows(delay):
+                    return response
+                await response.aclose()
+
+            self.retry_stats.record_retry()
+            if event is not None:
+                event.retries += 1
+            await asyncio.sleep(delay)
+            attempt += 1
+
+    def _timeout(self, endpoint: endpoints.Endpoint[Any]) -> httpx.Timeout:
+        connect, read = self.timeout.limits(endpoint.wait)
+        return httpx.Timeout(connect=connect, read=read, write=read, pool=connect)
+
+    def span(self, name: str, **attributes: Any) -> AbstractContextManager[Any]:
+        return self.instrumentation.span(name, **attributes)
+
+    def _limit(self, path: str) -> AbstractAsyncContextManager[None]:
+        if self.rate_limiter is None:
+            return nullcontext()
+        return self.rate_limiter.limit_async(path)
+
+    def _invalidate(
+        self, project_id: str, path: Optional[model.FilePath] = None
+    ) -> None:
+        if self.file_cache is not None:
+            self.file_cache.invalidate(project_id, path)
+        if self.symbol_cache is not None:
+            self.symbol_cache.invalidate(project_id, path)
+
+    async def get_project(self, project_id: str) -> model.Project:
+        return await self._call(endpoints.get_project(project_id))
+
+    async def get_projects(self) -> list[model.Project]:
+        return await self._call(endpoints.get_projects())
+
+    async def create_project(
+        self,
+        repository: model.Repository,
+        devcontainer: Optional["DevContainer"] = None,
+        languages: Optional[list[model.Language]] = None,
+    ) -> model.Project:
+        return await self._call(
+            endpoints.create_project(repository, devcontainer, languages)
+        )
+
+    async def delete_project(self, project: model.Project) -> bool:
+        try:
+            return await self._call(endpoints.delete_project(project))
+        finally:
+            self._invalidate(project.id)
+
+    async def get_tasks(self, project_id: str) -> list[model.Task]:
+        return await self._call(endpoints.get_tasks(project_id))
+
+    async def run_task(
+        self,
+        project_id: str,
+        command: Optional[str] = None,
+        alias: Optional[str] = None,
+        timeout: Optional[int] = None,
+    ) -> model.TaskResult:
+        try:
+            return await self._call(
+                endpoints.run_task(project_id, command, alias, task_timeout(timeout))
+            )
+        finally:
+            # Commands can change any file in the project.
+            self._invalidate(project_id)
+
+    def stream_task(
+        self,
+        project_id: str,
+        command: Optional[str] = None,
+        alias: Optional[str] = None,
+        timeout: Optional[int] = None,
+    ) -> AsyncGenerator[model.TaskEvent, None]:
+        endpoint = endpoints.stream_task(
+            project_id, command, alias, task_timeout(timeout)
+        )
+        return self._stream_task(project_id, endpoint)
+
+    async def _stream_task(
+        self, project_id: str, endpoint: endpoints.Endpoint[Any]
+    ) -> AsyncGenerator[model.TaskEvent, None]:
+        try:
+            response = await self._request(endpoint, stream=True)
+            try:
+                if response.status_code >= 400:
+                    await response.aread()
+                endpoint.parse(response, self.codec)
+
+                decoder = TaskEventDecoder()
+                async for chunk in response.aiter_bytes():
+                    for event in decoder.feed(chunk):
+                        yield event
+                decoder.close()
+            finally:
+                await response.aclose()
+        finally:
+            self._invalidate(project_id)
+
+    async def start_task(
+        self,
+        project_id: str,
+        command: Optional[str] = None,
+        alias: Optional[str] = None,
+        timeout: Optional[int] = None,
+    ) -> AsyncTaskHandle:
+        try:
+            task = await self._call(
+                endpoints.start_task(project_id, command, alias, timeout)
+            )
+            return AsyncTaskHandle(self, project_id, task)
+        finally:
+            self._invalidate(project_id)
+
+    async def get_background_task(
+        self, project_id: str, task_id: str
+    ) -> model.BackgroundTask:
+        try:
+            return await self._call(endpoints.get_background_task(project_id, task_id))
+        finally:
+            # The task may have changed files since the last check.
+            self._invalidate(project_id)
+
+    async def cancel_task(self, project_id: str, task_id: str) -> model.BackgroundTask:
+        try:
+            return await self._call(endpoints.cancel_task(project_id, task_id))
+        finally:
+            self._invalidate(project_id)
+
+    async def create_file(
+        self, project_id: str, path: model.FilePath, content: str
+    ) -> model.File:
+        try:
+            return await self._call(endpoints.create_file(project_id, path, content))
+        finally:
+            self._invalidate(project_id, path)
+
+    async def get_file(
+        self,
+        project_id: str,
+        path: model.FilePath,
+        start_line: Optional[int] = None,
+        num_lines: Optional[int] = None,
+    ) -> model.File:
+        endpoint = endpoints.get_file(project_id, path, start_line, num_lines)
+        if self.file_cache is None:
+            return await self._call(endpoint)
+
+        key = (project_id, path, start_line, num_lines)
+        file, endpoint, version = self.file_cache.lookup(key, endpoint)
+        if file is not None:
+            return file
+        try:
+            response = await self._send(endpoint)
+        except BaseException:
+            self.file_cache.cancel(version)
+            raise
+        return self.file_cache.store(key, version, endpoint, response, self.codec)
+
+    def get_files(
+        self,
+        project_id: str,
+        paths: Sequence[model.FilePath],
+        ranges: Optional[Sequence[Optional[tuple[int, int]]]] = None,
+    ) -> AsyncIterator[model.FileResult]:
+        reads = endpoints.file_reads(paths, ranges)
+        return self._get_files(project_id, reads)
+
+    async def _get_files(
+        self, project_id: str, reads: list[endpoints.FileRead]
+    ) -> AsyncIterator[model.FileResult]:
+        if self._batch_reads is not False:
+            try:
+                results = await self._call(endpoints.get_files(project_id, reads))
+                self._batch_reads = True
+                for result in results:
+                    yield result
+                return
+            except HideClientError as e:
+                if self._batch_reads or not endpoints.is_unsupported(e):
+                    raise
+                self._batch_reads = False
+
+        semaphore = asyncio.Semaphore(self.max_parallel_reads)
+
+        async def read(read: endpoints.FileRead) -> model.FileResult:
+            async with semaphore:
+                return await self._read_file(project_id, *read)
+
+        tasks = [asyncio.ensure_future(read(r)) for r in reads]
+        try:
+            for task in asyncio.as_completed(tasks):
+                yield await task
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def _read_file(
+        self,
+        project_id: str,
+        path: model.FilePath,
+        start_line: Optional[int],
+        num_lines: Optional[int],
+    ) -> model.FileResult:
+        result = model.FileResult(path=path, startLine=start_line, numLines=num_lines)
+        try:
+            result.file = await self.get_file(project_id, path, start_line, num_lines)
+        except Exception as e:
+            result.error = str(e)
+        return result
+
+    async def update_file(
+        self,
+        project_id: str,
+        path: model.FilePath,
+        update: Union[model.UdiffUpdate, model.LineDiffUpdate, model.OverwriteUpdate],
+    ) -> model.File:
+        try:
+            return await self._call(endpoints.update_file(project_id, path, update))
+        finally:
+            self._invalidate(project_id, path)
+
+    def changeset(self, project_id: str) -> Changeset[Awaitable[model.ChangesetResult]]:
+        return Changeset(lambda changes: self.apply_changeset(project_id, changes))
+
+    async def apply_changeset(
+        self, project_id: str, changes: Sequence[model.FileChange]
+    ) -> model.ChangesetResult:
+        try:
+            if self._batch_changes is not False:
+                try:
+                    endpoint = endpoints.apply_changeset(project_id, changes)
+                    result = await self._call(endpoint)
+                    self._batch_changes = True
+                    return result
+                except HideClientError as e:
+                    if self._batch_changes or not endpoints.is_unsupported(e):
+                        raise
+                    self._batch_changes = False
+
+            return await self._apply_changes(project_id, list(changes))
+        finally:
+            for path in touched_paths(list(changes)):
+                self._invalidate(project_id, path)
+
+    async def _read_originals(
+        self, project_id: str, paths: list[model.FilePath]
+    ) -> dict[model.FilePath, Optional[model.File]]:
+        """
+        Reads the files about to be changed, with None for those that do not exist.
+        Raises if another file cannot be read, so that nothing is changed that could
+        not be restored.
+        """
+        originals: dict[model.FilePath, Optional[model.File]] = {}
+        async for result in self.get_files(project_id, paths):
+            if result.file is None:
+                # Only a missing file is absent; any other failure is raised.
+                try:
+                    result.file = await self.get_file(project_id, result.path)
+                except HideClientError as e:
+                    if e.status_code != 404:
+                        raise
+            originals[result.path] = result.file
+        return originals
+
+    async def _apply_changes(
+        self, project_id: str, changes: list[model.FileChange]
+    ) -> model.ChangesetResult:
+        originals = await self._read_originals(project_id, touched_paths(changes))
+        result = model.ChangesetResult()
+        touched: list[model.FilePath] = []
+        for change in changes:
+            touched.append(change.path)
+            try:
+                match change.type:
+                    case model.FileChangeType.CREATE:
+                        file = await self.create_file(
+                            project_id, change.path, change.content or ""
+                        )
+                        result.files.append(file)
+                    case model.FileChangeType.UPDATE:
+                        if change.update is None:
+                            raise ValueError(f"Update of {change.path} has no update")
+                        file = await self.update_file(
+                            project_id, change.path, change.update
+                        )
+                        result.files.append(file)
+                    case model.FileChangeType.DELETE:
+                        await self.delete_file(project_id, change.path)
+                        result.deleted.append(change.path)
+            except Exception as e:
+                failed = await self._restore(
+                    project_id, {path: originals[path] for path in touched}
+                )
+                rollback = (
+                    f"could not restore {', '.join(failed)}"
+                    if failed
+                    else "changes were rolled back"
+                )
+                raise HideClientError(
+                    f"Failed to {change.type.value} {change.path}: {e}; {rollback}"
+                ) from e
+        return result
+
+    async def _restore(
+        self, project_id: str, originals: dict[model.FilePath, Optional[model.File]]
+    ) -> list[model.FilePath]:
+        """Puts files back as they were. Returns the paths that could not be restored."""
+        failed = []
+        for path, original in originals.items():
+            try:
+                await self._restore_file(project_id, path, original)
+            except Exception:
+                failed.append(path)
+        return failed
+
+    async def _restore_file(
+        self, project_id: str, path: model.FilePath, original: Optional[model.File]
+    ) -> None:
+        try:
+            if original is None:
+                await self.delete_file(project_id, path)
+            else:
+                update = model.OverwriteUpdate(content=original.content())
+                await self.update_file(project_id, path, update)
+        except HideClientError as e:
+            if e.status_code != 404:
+                raise
+            if original is not None:
+                # The file was deleted before the failure.
+                await self.create_file(project_id, path, original.content())
+
+    async def delete_file(
+        self, project_id: str, file: model.FilePath | model.File | model.FileInfo
+    ) -> bool:
+        try:
+            return await self._call(endpoints.delete_file(project_id, file))
+        finally:
+            self._invalidate(project_id, endpoints.path_of(file))
+
+    @overload
+    async def list_files(
+        self,
+        project_id: str,
+        include: Optional[list[str]] = ...,
+        exclude: Optional[list[str]] = ...,
+        format: Literal[model.ListFilesFormat.JSON] = ...,
+    ) -> list[model.FileInfo]: ...
+
+    @overload
+    async def list_files(
+        self,
+        project_id: str,
+        include: Optional[list[str]] = ...,
+        exclude: Optional[list[str]] = ...,
+        *,
+        format: Literal[model.ListFilesFormat.TREE],
+    ) -> str: ...
+
+    @overload
+    async def list_files(
+        self,
+        project_id: str,
+        include: Optional[list[str]] = ...,
+        exclude: Optional[list[str]] = ...,
+        format: model.ListFilesFormat = ...,
+    ) -> list[model.FileInfo] | str: ...
+
+    async def list_files(
+        self,
+        project_id: str,
+        include: Optional[list[str]] = None,
+        exclude: Optional[list[str]] = None,
+        format: model.ListFilesFormat = model.ListFilesFormat.JSON,
+    ) -> list[model.FileInfo] | str:
+        if format == model.ListFilesFormat.TREE:
+            return await self._call(
+                endpoints.list_file_tree(project_id, include, exclude)
+            )
+        return await self._call(endpoints.list_files(project_id, include, exclude))
+
+    async def search_files(
+        self,
+        project_id: str,
+        query: str,
+        search_mode: model.SearchMode = model.SearchMode.DEFAULT,
+        show_hidden: bool = False,
+        include: Optional[list[str]] = None,
+        exclude: Optional[list[str]] = None,
+        limit: Optional[int] = None,
+        offset: int = 0,
+        max_matches_per_file: Optional[int] = None,
+        context_lines: int = 0,
+    ) -> list[model.File]:
+        return await self._call(
+            endpoints.search_files(
+                project_id,
+                query,
+                search_mode,
+                show_hidden,
+                include,
+                exclude,
+                limit,
+                offset,
+                max_matches_per_file,
+                context_lines,
+            )
+        )
+
+    def iter_files(
+        self,
+        project_id: str,
+        include: Optional[list[str]] = None,
+        exclude: Optional[list[str]] = None,
+    ) -> AsyncGenerator[model.FileInfo, None]:
+        return self._iter_items(
+            endpoints.iter_files(project_id, include, exclude), endpoints.FILE_INFO
+        )
+
+    def iter_search_files(
+        self,
+        project_id: str,
+        query: str,
+        search_mode: model.SearchMode = model.SearchMode.DEFAULT,
+        show_hidden: bool = False,
+        include: Optional[list[str]] = None,
+        exclude: Optional[list[str]] = None,
+        max_matches_per_file: Optional[int] = None,
+        context_lines: int = 0,
+        page_size: Optional[int] = None,
+    ) -> AsyncGenerator[model.File, None]:
+        endpoints.check_page_size(page_size)
+        page = functools.partial(
+            endpoints.iter_search_files,
+            project_id,
+            query,
+            search_mode,
+            show_hidden,
+            include,
+            exclude,
+            max_matches_per_file=max_matches_per_file,
+            context_lines=context_lines,
+        )
+        return self._iter_pages(page, page_size, endpoints.FILE)
+
+    async def _iter_pages(
+        self,
+        page: Callable[..., endpoints.Endpoint[Any]],
+        page_size: Optional[int],
+        adapter: TypeAdapter[T],
+    ) -> AsyncGenerator[T, None]:
+        offset = 0
+        first: Optional[T] = None
+        while True:
+            count = 0
+            items = self._iter_items(page(limit=page_size, offset=offset), adapter)
+            try:
+                async for item in items:
+                    if count == 0:
+                        if offset and item == first:
+                            # The server ignored the offset and sent a page again.
+                            return
+                        first = item
+                    count += 1
+                    yield item
+            finally:
+                # Drop the rest of the response if the caller stops early.
+                await items.aclose()
+            if page_size is None or count != page_size:
+                # The last page, or a server that ignored the limit and sent it all.
+                return
+            offset += count
+
+    async def _iter_items(
+        self, endpoint: endpoints.Endpoint[Any], adapter: TypeAdapter[T]
+    ) -> AsyncGenerator[T, None]:
+        response = await self._request(endpoint, stream=True)
+        try:
+            if response.status_code >= 400:
+                await response.aread()
+            endpoint.parse(response, self.codec)
+
+            decoder = JsonArrayDecoder()
+            async for chunk in response.aiter_bytes(CHUNK_SIZE):
+                for item in decoder.feed(chunk):
+                    yield adapter.validate_python(item)
+            for item in decoder.close():
+                yield adapter.validate_python(item)
+        finally:
+            await response.aclose()
+
+    async def search_symbols(
+        self,
+        project_id: str,
+        query: str,
+        limit: Optional[int] = None,
+    ) -> list[model.Symbol]:
+        endpoint = endpoints.search_symbols(project_id, query, limit)
+        if self.symbol_cache is None:
+            return await self._call(endpoint)
+
+        limit = limit or None
+        symbols, version = self.symbol_cache.symbols(project_id, query, limit)
+        if symbols is None:
+            try:
+                symbols = await self._call(endpoint)
+            except BaseException:
+                self.symbol_cache.cancel(version)
+                raise
+            self.symbol_cache.store_symbols(project_id, query, limit, version, symbols)
+        return symbols
+
+    async def document_outline(
+        self, project_id: str, file: model.File | model.FileInfo | model.FilePath
+    ) -> model.DocumentOutline:
+        endpoint = endpoints.document_outline(project_id, file)
+        if self.symbol_cache is None:
+            return await self._call(endpoint)
+
+        path = endpoints.path_of(file)
+        outline, version = self.symbol_cache.outline(project_id, path)
+        if outline is None:
+            try:
+                outline = await self._call(endpoint)
+            except BaseException:
+                self.symbol_cache.cancel(version)
+                raise
+            self.symbol_cache.store_outline(project_id, path, version, outline)
+        return outline
@@ -0,0 +1,400 @@
+import threading
+from collections import Counter, OrderedDict
+from dataclasses import dataclass, replace
+from typing import Hashable, Optional
+
+from hide import model
+from hide.client.codec import DEFAULT_CODEC, JsonCodec
+from hide.client.endpoints import Endpoint, Response
+
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+CacheKey = tuple[str, model.FilePath, Optional[int], Optional[int]]
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+
+
+class _Changes:
+    """
+    When files or projects last changed, on a clock ticking at each change. A change
+    is only kept while a request sent before it may still store its response.
+    """
+
+    def __init__(self) -> None:
+        self.clock = 0
+        self._changed: dict[Hashable, int] = {}
+        # How many requests are in flight, by the version they were sent at.
+        self._in_flight: Counter[int] = Counter()
+
+    def __len__(self) -> int:
+        return len(self._changed)
+
+    def start(self) -> int:
+        """Returns the version of a request about to be sent."""
+        self._in_flight[self.clock] += 1
+        return self.clock
+
+    def finish(self, version: int, *keys: Hashable) -> bool:
+        """Ends the request sent at `version`; whether no key changed since."""
+        unchanged = all(self._changed.get(key, 0) <= version for key in keys)
+        self._in_flight[version] -= 1
+        if self._in_flight[version] <= 0:
+            del self._in_flight[version]
+            self._prune()
+        return unchanged
+
+    def change(self, *keys: Hashable) -> None:
+        self.clock += 1
+        for key in keys:
+            self._changed[key] = self.clock
+        self._prune()
+
+    def _prune(self) -> None:
+        oldest = min(self._in_flight, default=self.clock)
+        self._changed = {key: t for key, t in self._changed.items() if t > oldest}
+
+
+@dataclass(frozen=True)
+class _Entry:
+    file: model.File
+    etag: Optional[str]
+    size: int
+
+
+class FileCache:
+    """
+    LRU cache of files read by a client, keyed by project, path and line range, and
+    bounded by the total size of the cached responses.
+
+    Entries the server sent an `ETag` for are revalidated with a conditional request
+    and served from the cache on `304 Not Modified`. Entries without one are served
+    without a request until the client that owns the cache changes the file or runs
+    a task in the project. A response to a request sent before such a change is not
+    cached, so a concurrent edit never leaves a stale entry behind.
+    """
+
+    def __init__(self, max_bytes: int = DEFAULT_MAX_BYTES) -> None:
+        if max_bytes <= 0:
+            raise ValueError("max_bytes must be a positive integer")
+
+        self.max_bytes = max_bytes
+        self.stats = CacheStats()
+        self._entries: OrderedDict[CacheKey, _Entry] = OrderedDict()
+        self._size = 0
+        # Keyed by project and path for files, by project for whole projects.
+        self._changes = _Changes()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def size(self) -> int:
+        return self._size
+
+    def lookup(
+        self, key: CacheKey, endpoint: Endpoint[model.File]
+    ) -> tuple[Optional[model.File], Endpoint[model.File], int]:
+        """
+        Returns a cached file that can be used without asking the server, or the
+        endpoint to call, made conditional when a cached version can be revalidated,
+        and the version to pass to `store` with its response, or to `cancel` if the
+        request fails.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.etag is None:
+                self._entries.move_to_end(key)
+                self.stats.hits += 1
+                return entry.file.model_copy(deep=True), endpoint, self._changes.clock
+
+            version = self._changes.start()
+            if entry is None:
+                return None, endpoint, version
+            self._entries.move_to_end(key)
+
+        def parse(response: Response, codec: JsonCodec) -> model.File:
+            if response.status_code == 304:
+                return entry.file.model_copy(deep=True)
+            return endpoint.parse(response, codec)
+
+        headers = {**(endpoint.headers or {}), "If-None-Match": entry.etag}
+        return None, replace(endpoint, parse=parse, headers=headers), version
+
+    def store(
+        self,
+        key: CacheKey,
+        version: int,
+        endpoint: Endpoint[model.File],
+        response: Response,
+        codec: JsonCodec = DEFAULT_CODEC,
+    ) -> model.File:
+        """Parses the response to a (possibly conditional) request and caches it."""
+        try:
+            file = endpoint.parse(response, codec)
+        except BaseException:
+            self.cancel(version)
+            raise
+        if response.status_code == 304:
+            with self._lock:
+                self._changes.finish(version)
+                self.stats.hits += 1
+            return file
+
+        entry = _Entry(
+            file=file.model_copy(deep=True),
+            etag=response.headers.get("ETag"),
+            size=len(response.content),
+        )
+
+        with self._lock:
+            self.stats.misses += 1
+            if not self._changes.finish(version, key[:2], key[:1]):
+                return file
+
+            self._pop(key)
+            if entry.size > self.max_bytes:
+                return file
+
+            self._entries[key] = entry
+            self._size += entry.size
+            while self._size > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._size -= evicted.size
+                self.stats.evictions += 1
+
+        return file
+
+    def cancel(self, version: int) -> None:
+        """Ends a lookup whose request failed, so there is nothing to store."""
+        with self._lock:
+            self._changes.finish(version)
+
+    def invalidate(
+        self, project_id: str, path: Optional[model.FilePath] = None
+    ) -> None:
+        """Drops every cached range of `path`, or of every file in the project."""
+        with self._lock:
+            self._changes.change((project_id,) if path is None else (project_id, path))
+
+            for key in list(self._entries):
+                if key[0] == project_id and (path is None or key[1] == path):
+                    self._pop(key)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+    def _pop(self, key: CacheKey) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._size -= entry.size
+
+
+DEFAULT_MAX_SYMBOL_ENTRIES = 4096
+
+_OUTLINE = "outline"
+_SYMBOLS = "symbols"
+
+
+@dataclass(frozen=True)
+class _SymbolResults:
+    symbols: list[model.Symbol]
+    limit: Optional[int]
+
+    @property
+    def complete(self) -> bool:
+        # Without a limit, the server may still have capped the results.
+        return self.limit is not None and len(self.symbols) < self.limit
+
+    def answer(self, limit: Optional[int]) -> bool:
+        """Whether these are also the results of the query with `limit`."""
+        if limit == self.limit or self.complete:
+            return True
+        return limit is not None and limit <= len(self.symbols)
+
+
+def _fuzzy_match(query: str, name: str) -> bool:
+    """Whether the characters of `query` appear in order in `name`, ignoring case."""
+    chars = iter(name.lower())
+    return all(char in chars for char in query.lower())
+
+
+class SymbolCache:
+    """
+    LRU cache of the document outlines and symbol search results of a client,
+    bounded by the number of entries.
+
+    Outlines are dropped when the client changes their file; any change to a project
+    drops its symbol search results, since an edit can add a matching symbol to any
+    file. A response to a request sent before such a change is not cached, so a
+    concurrent edit never leaves a stale entry behind. Running a task drops the
+    whole project.
+
+    Symbol queries are answered from earlier results of the same query. With
+    `narrow_queries`, a query extending an earlier one whose results were complete
+    (fewer than its limit) is answered by filtering those results, which is only
+    right if the server matches names containing the query's characters in order,
+    as many language servers do.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = DEFAULT_MAX_SYMBOL_ENTRIES,
+        narrow_queries: bool = False,
+    ) -> None:
+        if max_entries <= 0:
+            raise ValueError("max_entries must be a positive integer")
+
+        self.max_entries = max_entries
+        self.narrow_queries = narrow_queries
+        self.stats = CacheStats()
+        # Keyed by project and path for outlines, project and query for symbols.
+        self._outlines: dict[tuple[str, str], model.DocumentOutline] = {}
+        self._queries: dict[tuple[str, str], _SymbolResults] = {}
+        # Keys of both, least recently used first.
+        self._lru: OrderedDict[tuple[str, str, str], None] = OrderedDict()
+        # Keyed by kind and project, and by path for the outline of a file.
+        self._changes = _Changes()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._outlines) + len(self._queries)
+
+    def outline(
+        self, project_id: str, path: model.FilePath
+    ) -> tuple[Optional[model.DocumentOutline], int]:
+        """
+        Returns the cached outline of `path`, if any, and the version to pass to
+        `store_outline` with the outline fetched otherwise, or to `cancel` if that
+        fails.
+        """
+        key = (project_id, path)
+        with self._lock:
+            outline = self._outlines.get(key)
+            if outline is None:
+                self.stats.misses += 1
+                return None, self._changes.start()
+
+            self.stats.hits += 1
+            self._lru.move_to_end((_OUTLINE, *key))
+            return outline.model_copy(deep=True), self._changes.clock
+
+    def store_outline(
+        self,
+        project_id: str,
+        path: model.FilePath,
+        version: int,
+        outline: model.DocumentOutline,
+    ) -> None:
+        with self._lock:
+            keys = ((_OUTLINE, project_id, path), (_OUTLINE, project_id))
+            if not self._changes.finish(version, *keys):
+                return
+            self._outlines[(project_id, path)] = outline.model_copy(deep=True)
+            self._touch((_OUTLINE, project_id, path))
+
+    def symbols(
+        self, project_id: str, query: str, limit: Optional[int] = None
+    ) -> tuple[Optional[list[model.Symbol]], int]:
+        """
+        Returns the cached results of the query, if they can be told without asking
+        the server, and the version to pass to `store_symbols` otherwise, or to
+        `cancel` if that fails.
+        """
+        with self._lock:
+            symbols = self._lookup_symbols(project_id, query, limit)
+            if symbols is None:
+                self.stats.misses += 1
+                return None, self._changes.start()
+
+            self.stats.hits += 1
+            symbols = [symbol.model_copy(deep=True) for symbol in symbols]
+            return symbols, self._changes.clock
+
+    def _lookup_symbols(
+        self, project_id: str, query: str, limit: Optional[int]
+    ) -> Optional[list[model.Symbol]]:
+        key = (project_id, query)
+        results = self._queries.get(key)
+        if results is not None and results.answer(limit):
+            self._lru.move_to_end((_SYMBOLS, *key))
+            return results.symbols[:limit]
+        if not self.narrow_queries:
+            return None
+
+        # Narrow the complete results of the longest cached prefix of the query.
+        for end in range(len(query) - 1, -1, -1):
+            key = (project_id, query[:end])
+            results = self._queries.get(key)
+            if results is not None and results.complete:
+                self._lru.move_to_end((_SYMBOLS, *key))
+                matches = [s for s in results.symbols if _fuzzy_match(query, s.name)]
+                return matches[:limit]
+        return None
+
+    def store_symbols(
+        self,
+        project_id: str,
+        query: str,
+        limit: Optional[int],
+        version: int,
+        symbols: list[model.Symbol],
+    ) -> None:
+        with self._lock:
+            if not self._changes.finish(version, (_SYMBOLS, project_id)):
+                return
+            self._queries[(project_id, query)] = _SymbolResults(
+                symbols=[symbol.model_copy(deep=True) for symbol in symbols],
+                limit=limit,
+            )
+            self._touch((_SYMBOLS, project_id, query))
+
+    def cancel(self, version: int) -> None:
+        """Ends a lookup whose request failed, so there is nothing to store."""
+        with self._lock:
+            self._changes.finish(version)
+
+    def invalidate(
+        self, project_id: str, path: Optional[model.FilePath] = None
+    ) -> None:
+        """
+        Drops the outline of `path`, or of every file in the project, and the symbol
+        search results of the project.
+        """
+        outlines = (
+            (_OUTLINE, project_id) if path is None else (_OUTLINE, project_id, path)
+        )
+        with self._lock:
+            self._changes.change((_SYMBOLS, project_id), outlines)
+
+            for kind, project, name in list(self._lru):
+                if project == project_id and (
+                    kind == _SYMBOLS or path is None or name == path
+                ):
+                    self._pop((kind, project, name))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._outlines.clear()
+            self._queries.clear()
+            self._lru.clear()
+
+    def _touch(self, key: tuple[str, str, str]) -> None:
+        self._lru[key] = None
+        self._lru.move_to_end(key)
+        while len(self._lru) > self.max_entries:
+            self._pop(next(iter(self._lru)))
+            self.stats.evictions += 1
+
+    def _pop(self, key: tuple[str, str, str]) -> None:
+        kind, project_id, name = key
+        del self._lru[key]
+        entries = self._outlines if kind == _OUTLINE else self._queries
+        entries.pop((project_id, name), None)
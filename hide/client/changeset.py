@@ -0,0 +1,46 @@
+from typing import Callable, Generic, TypeVar
+
+from hide import model
+
+T = TypeVar("T")
+
+
+class Changeset(Generic[T]):
+    """
+    Collects file changes to submit together, as returned by `HideClient.changeset`.
+    Changes are applied in the order they were added.
+    """
+
+    def __init__(self, submit: Callable[[list[model.FileChange]], T]) -> None:
+        self.changes: list[model.FileChange] = []
+        self._submit = submit
+
+    def create(self, path: model.FilePath, content: str) -> "Changeset[T]":
+        self.changes.append(
+            model.FileChange(
+                type=model.FileChangeType.CREATE, path=path, content=content
+            )
+        )
+        return self
+
+    def update(self, path: model.FilePath, update: model.FileUpdate) -> "Changeset[T]":
+        self.changes.append(
+            model.FileChange(type=model.FileChangeType.UPDATE, path=path, update=update)
+        )
+        return self
+
+    def delete(self, path: model.FilePath) -> "Changeset[T]":
+        self.changes.append(
+            model.FileChange(type=model.FileChangeType.DELETE, path=path)
+        )
+        return self
+
+    def submit(self) -> T:
+        return self._submit(self.changes)
+
+    def __len__(self) -> int:
+        return len(self.changes)
+
+
+def touched_paths(changes: list[model.FileChange]) -> list[model.FilePath]:
+    return list(dict.fromkeys(change.path for change in changes))
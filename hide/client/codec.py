@@ -0,0 +1,48 @@
+"""
+How responses are decoded and validated, and request bodies encoded.
+
+`JsonCodec`, the default, validates responses straight from their raw bytes with
+pydantic-core: the JSON is parsed once, without building intermediate dicts, which
+keeps peak memory low for large file lists and search results. `OrjsonCodec` parses
+with orjson first and validates the parsed objects, which takes about as much CPU time
+but several times the peak memory, and also encodes request bodies with orjson.
+"""
+
+from typing import Any, Optional, TypeVar
+
+from pydantic import TypeAdapter
+
+T = TypeVar("T")
+
+JSON_CONTENT = {"Content-Type": "application/json"}
+
+
+class JsonCodec:
+    def validate(self, adapter: TypeAdapter[T], content: bytes) -> T:
+        return adapter.validate_json(content)
+
+    def encode(self, payload: Any) -> Optional[bytes]:
+        """Returns the request body, or None to leave encoding to the HTTP library."""
+        return None
+
+
+class OrjsonCodec(JsonCodec):
+    """Requires the `orjson` package, e.g. `pip install hide-py[orjson]`."""
+
+    def __init__(self) -> None:
+        try:
+            import orjson
+        except ImportError as e:
+            raise ImportError(
+                "OrjsonCodec requires orjson. Install it with `pip install hide-py[orjson]`."
+            ) from e
+        self._orjson = orjson
+
+    def validate(self, adapter: TypeAdapter[T], content: bytes) -> T:
+        return adapter.validate_python(self._orjson.loads(content))
+
+    def encode(self, payload: Any) -> Optional[bytes]:
+        return self._orjson.dumps(payload)
+
+
+DEFAULT_CODEC = JsonCodec()
@@ -0,0 +1,617 @@
+"""
+Transport-agnostic description of the Hide API.
+
+Each function builds an `Endpoint` holding everything needed to send a request and
+parse its response. `HideClient` and `AsyncHideClient` only differ in how they send it.
+"""
+
+from dataclasses import dataclass
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Generic,
+    Mapping,
+    Optional,
+    Protocol,
+    Sequence,
+    TypeVar,
+    Union,
+)
+
+from pydantic import BaseModel, TypeAdapter
+
+from hide import model
+from hide.client.codec import JsonCodec
+from hide.client.errors import HideClientError
+
+if TYPE_CHECKING:
+    from hide.devcontainer.model import DevContainer
+
+DEFAULT_BASE_URL = "http://localhost:8080"
+
+T = TypeVar("T")
+
+
+class Response(Protocol):
+    """The subset of `requests.Response` and `httpx.Response` used for parsing."""
+
+    @property
+    def status_code(self) -> int: ...
+
+    @property
+    def text(self) -> str: ...
+
+    @property
+    def content(self) -> bytes: ...
+
+    @property
+    def headers(self) -> Mapping[str, str]: ...
+
+    def json(self) -> Any: ...
+
+
+@dataclass(frozen=True)
+class Endpoint(Generic[T]):
+    """
+    `wait` is how long the server may take to answer on top of the client's read
+    timeout, e.g. while a task runs; None if it may take any time. `name` is the
+    operation, e.g. "get_file", as reported to request hooks.
+    """
+
+    method: str
+    path: str
+    parse: Callable[[Response, JsonCodec], T]
+    params: Optional[dict[str, Any]] = None
+    json: Optional[Any] = None
+    headers: Optional[dict[str, str]] = None
+    wait: Optional[float] = 0.0
+    name: str = ""
+
+
+def check(response: Response) -> Response:
+    if response.status_code >= 400:
+        raise HideClientError(response.text, response.status_code)
+    return response
+
+
+def _parse_json(adapter: TypeAdapter[T]) -> Callable[[Response, JsonCodec], T]:
+    def parse(response: Response, codec: JsonCodec) -> T:
+        return codec.validate(adapter, check(response).content)
+
+    return parse
+
+
+class _FileResults(BaseModel):
+    files: list[model.FileResult]
+
+
+_parse_project = _parse_json(TypeAdapter(model.Project))
+_parse_projects = _parse_json(model.PROJECT_LIST)
+_parse_tasks = _parse_json(model.TASK_LIST)
+_parse_task_result = _parse_json(TypeAdapter(model.TaskResult))
+_parse_background_task = _parse_json(TypeAdapter(model.BackgroundTask))
+_parse_file = _parse_json(TypeAdapter(model.File))
+_parse_files = _parse_json(model.FILE_LIST)
+_parse_changeset_result = _parse_json(TypeAdapter(model.ChangesetResult))
+_parse_file_infos = _parse_json(model.FILE_INFO_LIST)
+_parse_symbols = _parse_json(model.SYMBOL_LIST)
+_parse_outline = _parse_json(TypeAdapter(model.DocumentOutline))
+_validate_file_results = _parse_json(TypeAdapter(_FileResults))
+
+# Items of the lists that can be iterated as they arrive.
+FILE_INFO = TypeAdapter(model.FileInfo)
+FILE = TypeAdapter(model.File)
+
+
+def _parse_file_results(response: Response, codec: JsonCodec) -> list[model.FileResult]:
+    return _validate_file_results(response, codec).files
+
+
+def _parse_tree(response: Response, codec: JsonCodec) -> str:
+    return check(response).content.decode("utf-8")
+
+
+def _parse_deleted(response: Response, codec: JsonCodec) -> bool:
+    return check(response).status_code == 204
+
+
+def _parse_stream(response: Response, codec: JsonCodec) -> Response:
+    return check(response)
+
+
+def get_project(project_id: str) -> Endpoint[model.Project]:
+    return Endpoint(
+        "GET", f"/projects/{project_id}", _parse_project, name="get_project"
+    )
+
+
+def get_projects() -> Endpoint[list[model.Project]]:
+    return Endpoint("GET", "/projects", _parse_projects, name="get_projects")
+
+
+def create_project(
+    repository: model.Repository,
+    devcontainer: Optional["DevContainer"] = None,
+    languages: Optional[list[model.Language]] = None,
+) -> Endpoint[model.Project]:
+    request = model.CreateProjectRequest(
+        repository=repository, devcontainer=devcontainer, languages=languages
+    )
+    return Endpoint(
+        "POST",
+        "/projects",
+        _parse_project,
+        json=request.model_dump(exclude_unset=True, exclude_none=True),
+        name="create_project",
+    )
+
+
+def delete_project(project: model.Project) -> Endpoint[bool]:
+    return Endpoint(
+        "DELETE", f"/projects/{project.id}", _parse_deleted, name="delete_project"
+    )
+
+
+def get_tasks(project_id: str) -> Endpoint[list[model.Task]]:
+    return Endpoint(
+        "GET", f"/projects/{project_id}/tasks", _parse_tasks, name="get_tasks"
+    )
+
+
+def _task_request(
+    command: Optional[str], alias: Optional[str], timeout: Optional[int]
+) -> tuple[dict[str, Any], Optional[dict[str, str]]]:
+    if not command and not alias:
+        raise HideClientError("Either 'command' or 'alias' must be provided")
+
+    if command and alias:
+        raise HideClientError("Cannot provide both 'command' and 'alias'")
+
+    if timeout and timeout <= 0:
+        raise HideClientError("Timeout must be a positive integer")
+
+    payload = {}
+    if command:
+        payload["command"] = command
+    if alias:
+        payload["alias"] = alias
+
+    headers = None
+    if timeout:
+        headers = {"X-Timeout-Seconds": str(timeout)}
+
+    return payload, headers
+
+
+def run_task(
+    project_id: str,
+    command: Optional[str] = None,
+    alias: Optional[str] = None,
+    timeout: Optional[int] = None,
+) -> Endpoint[model.TaskResult]:
+    payload, headers = _task_request(command, alias, timeout)
+    return Endpoint(
+        "POST",
+        f"/projects/{project_id}/tasks",
+        _parse_task_result,
+        json=payload,
+        headers=headers,
+        wait=timeout,
+        name="run_task",
+    )
+
+
+def stream_task(
+    project_id: str,
+    command: Optional[str] = None,
+    alias: Optional[str] = None,
+    timeout: Optional[int] = None,
+) -> Endpoint[Response]:
+    """
+    Like `run_task`, but asks for the output as an event stream. Parsing only checks
+    the status; the body is decoded by `streaming.TaskEventDecoder` as it arrives.
+    """
+    payload, headers = _task_request(command, alias, timeout)
+    return Endpoint(
+        "POST",
+        f"/projects/{project_id}/tasks",
+        _parse_stream,
+        json=payload,
+        headers={**(headers or {}), "Accept": "text/event-stream"},
+        wait=timeout,
+        name="stream_task",
+    )
+
+
+def start_task(
+    project_id: str,
+    command: Optional[str] = None,
+    alias: Optional[str] = None,
+    timeout: Optional[int] = None,
+) -> Endpoint[model.BackgroundTask]:
+    payload, headers = _task_request(command, alias, timeout)
+    return Endpoint(
+        "POST",
+        f"/projects/{project_id}/tasks",
+        _parse_background_task,
+        json={**payload, "background": True},
+        headers=headers,
+        name="start_task",
+    )
+
+
+def get_background_task(
+    project_id: str, task_id: str
+) -> Endpoint[model.BackgroundTask]:
+    return Endpoint(
+        "GET",
+        f"/projects/{project_id}/tasks/{task_id}",
+        _parse_background_task,
+        name="get_background_task",
+    )
+
+
+def cancel_task(project_id: str, task_id: str) -> Endpoint[model.BackgroundTask]:
+    return Endpoint(
+        "DELETE",
+        f"/projects/{project_id}/tasks/{task_id}",
+        _parse_background_task,
+        name="cancel_task",
+    )
+
+
+def create_file(
+    project_id: str, path: model.FilePath, content: str
+) -> Endpoint[model.File]:
+    return Endpoint(
+        "POST",
+        f"/projects/{project_id}/files",
+        _parse_file,
+        json={"path": path, "content": content},
+        name="create_file",
+    )
+
+
+def get_file(
+    project_id: str,
+    path: model.FilePath,
+    start_line: Optional[int] = None,
+    num_lines: Optional[int] = None,
+) -> Endpoint[model.File]:
+    params: dict[str, Any] = {}
+    if start_line is not None:
+        params["startLine"] = start_line
+    if num_lines is not None:
+        params["numLines"] = num_lines
+
+    return Endpoint(
+        "GET",
+        f"/projects/{project_id}/files/{path}",
+        _parse_file,
+        params=params,
+        name="get_file",
+    )
+
+
+FileRead = tuple[model.FilePath, Optional[int], Optional[int]]
+
+
+def file_reads(
+    paths: Sequence[model.FilePath],
+    ranges: Optional[Sequence[Optional[tuple[int, int]]]] = None,
+) -> list[FileRead]:
+    """Pairs each path with its `(start_line, num_lines)` range, if any."""
+    if ranges is None:
+        return [(path, None, None) for path in paths]
+    if len(ranges) != len(paths):
+        raise HideClientError("ranges must have one entry (or None) per path")
+    return [
+        (path, range[0], range[1]) if range else (path, None, None)
+        for path, range in zip(paths, ranges)
+    ]
+
+
+def get_files(
+    project_id: str, reads: Sequence[FileRead]
+) -> Endpoint[list[model.FileResult]]:
+    files = []
+    for path, start_line, num_lines in reads:
+        request: dict[str, Any] = {"path": path}
+        if start_line is not None:
+            request["startLine"] = start_line
+        if num_lines is not None:
+            request["numLines"] = num_lines
+        files.append(request)
+
+    return Endpoint(
+        "POST",
+        f"/projects/{project_id}/files/batch",
+        _parse_file_results,
+        json={"files": files},
+        name="get_files",
+    )
+
+
+# What the server answers for a path it has no route for, as opposed to a 404 for a
+# missing project or file.
+_NO_ROUTE = ("", "not found", "404 page not found")
+
+
+def is_unsupported(error: HideClientError) -> bool:
+    """Whether the server failed a request because it does not know the endpoint."""
+    if error.status_code in (405, 501):
+        return True
+    return error.status_code == 404 and error.message.strip().lower() in _NO_ROUTE
+
+
+def _update_payload(update: model.FileUpdate) -> dict[str, Any]:
+    match update:
+        case model.UdiffUpdate() as udiff:
+            return {
+                "type": model.FileUpdateType.UDIFF.value,
+                "udiff": udiff.model_dump(by_alias=True),
+            }
+        case model.LineDiffUpdate() as linediff:
+            return {
+                "type": model.FileUpdateType.LINEDIFF.value,
+                "linediff": linediff.model_dump(by_alias=True),
+            }
+        case model.OverwriteUpdate() as overwrite:
+            return {
+                "type": model.FileUpdateType.OVERWRITE.value,
+                "overwrite": overwrite.model_dump(by_alias=True),
+            }
+        case _:
+            raise ValueError(f"Invalid file update type: {type(update)}")
+
+
+def update_file(
+    project_id: str,
+    path: model.FilePath,
+    update: Union[model.UdiffUpdate, model.LineDiffUpdate, model.OverwriteUpdate],
+) -> Endpoint[model.File]:
+    return Endpoint(
+        "PUT",
+        f"/projects/{project_id}/files/{path}",
+        _parse_file,
+        json=_update_payload(update),
+        name="update_file",
+    )
+
+
+def apply_changeset(
+    project_id: str, changes: Sequence[model.FileChange]
+) -> Endpoint[model.ChangesetResult]:
+    payload = []
+    for change in changes:
+        item: dict[str, Any] = {"type": change.type.value, "path": change.path}
+        match change.type:
+            case model.FileChangeType.CREATE:
+                item["content"] = change.content
+            case model.FileChangeType.UPDATE:
+                if change.update is None:
+                    raise ValueError(f"Update of {change.path} has no update")
+                item["update"] = _update_payload(change.update)
+        payload.append(item)
+
+    return Endpoint(
+        "POST",
+        f"/projects/{project_id}/changesets",
+        _parse_changeset_result,
+        json={"changes": payload},
+        name="apply_changeset",
+    )
+
+
+def path_of(file: model.FilePath | model.File | model.FileInfo) -> model.FilePath:
+    if isinstance(file, (model.File, model.FileInfo)):
+        return file.path
+    return file
+
+
+def delete_file(
+    project_id: str, file: model.FilePath | model.File | model.FileInfo
+) -> Endpoint[bool]:
+    return Endpoint(
+        "DELETE",
+        f"/projects/{project_id}/files/{path_of(file)}",
+        _parse_deleted,
+        name="delete_file",
+    )
+
+
+def _list_files_params(
+    include: Optional[list[str]], exclude: Optional[list[str]]
+) -> dict[str, Any]:
+    params: dict[str, Any] = {}
+    if include:
+        params["include"] = include
+    if exclude:
+        params["exclude"] = exclude
+    return params
+
+
+def list_files(
+    project_id: str,
+    include: Optional[list[str]] = None,
+    exclude: Optional[list[str]] = None,
+) -> Endpoint[list[model.FileInfo]]:
+    return Endpoint(
+        "GET",
+        f"/projects/{project_id}/files",
+        _parse_file_infos,
+        params=_list_files_params(include, exclude),
+        headers={"Accept": "application/json"},
+        name="list_files",
+    )
+
+
+def list_file_tree(
+    project_id: str,
+    include: Optional[list[str]] = None,
+    exclude: Optional[list[str]] = None,
+) -> Endpoint[str]:
+    """`list_files`, formatted as a tree."""
+    return Endpoint(
+        "GET",
+        f"/projects/{project_id}/files",
+        _parse_tree,
+        params=_list_files_params(include, exclude),
+        headers={"Accept": "text/plain"},
+        name="list_files",
+    )
+
+
+def _search_files_params(
+    query: str,
+    search_mode: model.SearchMode,
+    show_hidden: bool,
+    include: Optional[list[str]],
+    exclude: Optional[list[str]],
+    limit: Optional[int],
+    offset: int,
+    max_matches_per_file: Optional[int],
+    context_lines: int,
+) -> dict[str, Any]:
+    params: dict[str, Any] = {"query": query, "type": "content"}
+
+    if search_mode == model.SearchMode.EXACT:
+        params["exact"] = ""
+    if search_mode == model.SearchMode.REGEX:
+        params["regex"] = ""
+    if show_hidden:
+        params["showHidden"] = ""
+    if include:
+        params["include"] = include
+    if exclude:
+        params["exclude"] = exclude
+    if limit:
+        params["limit"] = limit
+    if offset:
+        params["offset"] = offset
+    if max_matches_per_file:
+        params["maxMatchesPerFile"] = max_matches_per_file
+    if context_lines:
+        params["contextLines"] = context_lines
+
+    return params
+
+
+def search_files(
+    project_id: str,
+    query: str,
+    search_mode: model.SearchMode = model.SearchMode.DEFAULT,
+    show_hidden: bool = False,
+    include: Optional[list[str]] = None,
+    exclude: Optional[list[str]] = None,
+    limit: Optional[int] = None,
+    offset: int = 0,
+    max_matches_per_file: Optional[int] = None,
+    context_lines: int = 0,
+) -> Endpoint[list[model.File]]:
+    """
+    `limit` caps the number of files, starting from the `offset`th. Each file holds
+    at most `max_matches_per_file` matching lines, each with `context_lines` lines
+    before and after it.
+    """
+    return Endpoint(
+        "GET",
+        f"/projects/{project_id}/search",
+        _parse_files,
+        params=_search_files_params(
+            query,
+            search_mode,
+            show_hidden,
+            include,
+            exclude,
+            limit,
+            offset,
+            max_matches_per_file,
+            context_lines,
+        ),
+        name="search_files",
+    )
+
+
+def iter_files(
+    project_id: str,
+    include: Optional[list[str]] = None,
+    exclude: Optional[list[str]] = None,
+) -> Endpoint[Response]:
+    """`list_files`, with the response left to be read item by item as `FILE_INFO`."""
+    return Endpoint(
+        "GET",
+        f"/projects/{project_id}/files",
+        _parse_stream,
+        params=_list_files_params(include, exclude),
+        headers={"Accept": "application/json"},
+        name="iter_files",
+    )
+
+
+def iter_search_files(
+    project_id: str,
+    query: str,
+    search_mode: model.SearchMode = model.SearchMode.DEFAULT,
+    show_hidden: bool = False,
+    include: Optional[list[str]] = None,
+    exclude: Optional[list[str]] = None,
+    limit: Optional[int] = None,
+    offset: int = 0,
+    max_matches_per_file: Optional[int] = None,
+    context_lines: int = 0,
+) -> Endpoint[Response]:
+    """`search_files`, with the response left to be read item by item as `FILE`."""
+    return Endpoint(
+        "GET",
+        f"/projects/{project_id}/search",
+        _parse_stream,
+        params=_search_files_params(
+            query,
+            search_mode,
+            show_hidden,
+            include,
+            exclude,
+            limit,
+            offset,
+            max_matches_per_file,
+            context_lines,
+        ),
+        name="iter_search_files",
+    )
+
+
+def check_page_size(page_size: Optional[int]) -> None:
+    if page_size is not None and page_size < 1:
+        raise ValueError("page_size must be a positive integer")
+
+
+def search_symbols(
+    project_id: str,
+    query: str,
+    limit: Optional[int] = None,
+) -> Endpoint[list[model.Symbol]]:
+    params: dict[str, Any] = {"type": "symbol", "query": query}
+
+    if limit:
+        params["limit"] = limit
+
+    return Endpoint(
+        "GET",
+        f"/projects/{project_id}/search",
+        _parse_symbols,
+        params=params,
+        name="search_symbols",
+    )
+
+
+def document_outline(
+    project_id: str, file: model.File | model.FileInfo | model.FilePath
+) -> Endpoint[model.DocumentOutline]:
+    return Endpoint(
+        "GET",
+        f"/projects/{project_id}/outline/{path_of(file)}",
+        _parse_outline,
+        name="document_outline",
+    )
@@ -0,0 +1,13 @@
+from typing import Optional
+
+
+class HideClientError(Exception):
+    def __init__(self, message: str, status_code: Optional[int] = None) -> None:
+        super().__init__(message)
+        self.message = message
+        self.status_code = status_code
+
+
+class DeadlineExceeded(HideClientError):
+    def __init__(self) -> None:
+        super().__init__("Deadline exceeded")
@@ -1,57 +1,267 @@
-from typing import Any, Optional, Union
+import functools
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import AbstractContextManager, ExitStack, closing, nullcontext
+from contextvars import copy_context
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Generator,
+    Iterator,
+    Literal,
+    Optional,
+    Sequence,
+    TypeVar,
+    Union,
+    overload,
+)
 
 import requests
+from pydantic import TypeAdapter
 
 from hide import model
-from hide.devcontainer.model import DevContainer
-
-DEFAULT_BASE_URL = "http://localhost:8080"
+from hide.client import endpoints
+from hide.client.cache import FileCache, SymbolCache
+from hide.client.changeset import Changeset, touched_paths
+from hide.client.codec import DEFAULT_CODEC, JSON_CONTENT, JsonCodec
+from hide.client.errors import DeadlineExceeded, HideClientError
+from hide.client.instrumentation import (
+    Instrumentation,
+    RequestEvent,
+    RequestHook,
+    body_size,
+    content_length,
+)
+from hide.client.limits import RateLimiter, RateLimits, shared_limiter
+from hide.client.retry import RetryPolicy, RetryStats
+from hide.client.streaming import (
+    CHUNK_SIZE,
+    decode_json_array,
+    decode_task_events,
+)
+from hide.client.task_handle import TaskHandle
+from hide.client.timeouts import Timeout, allows, expired, task_timeout
+from hide.client.transport import (
+    DEFAULT_POOL_CONNECTIONS,
+    DEFAULT_POOL_MAXSIZE,
+    create_session,
+)
+
+if TYPE_CHECKING:
+    from hide.devcontainer.model import DevContainer
+
+DEFAULT_BASE_URL = endpoints.DEFAULT_BASE_URL
+
+T = TypeVar("T")
+
+
+def _hold_until_closed(response: requests.Response, limit: ExitStack) -> None:
+    """Keeps the rate limit slot of a streamed response until it is closed."""
+    close = response.close
+
+    def release() -> None:
+        try:
+            close()
+        finally:
+            limit.close()
+
+    response.close = release  # type: ignore[method-assign]
 
 
 class HideClient:
-    def __init__(self, base_url: str = DEFAULT_BASE_URL) -> None:
+    def __init__(
+        self,
+        base_url: str = DEFAULT_BASE_URL,
+        session: Optional[requests.Session] = None,
+        pool_connections: int = DEFAULT_POOL_CONNECTIONS,
+        pool_maxsize: int = DEFAULT_POOL_MAXSIZE,
+        pool_block: bool = False,
+        file_cache: Optional[FileCache] = None,
+        retry: RetryPolicy = RetryPolicy(),
+        rate_limits: Optional[RateLimits] = None,
+        timeout: Timeout = Timeout(),
+        hooks: Sequence[RequestHook] = (),
+        codec: JsonCodec = DEFAULT_CODEC,
+        symbol_cache: Optional[SymbolCache] = None,
+    ) -> None:
+        """
+        Connections to the Hide server are kept alive and reused between calls. Pass
+        `session` to use a preconfigured transport (e.g. with custom adapters mounted);
+        otherwise one is created with the given pool settings. Pass `file_cache` to
+        cache the files read by `get_file`, and `symbol_cache` to cache outlines
+        and symbol searches.
+
+        Requests that fail with a transient error are retried according to `retry`,
+        which by default only repeats GET and DELETE requests. The number of retries
+        is counted in `retry_stats`.
+
+        Pass `rate_limits` to limit the rate and concurrency of requests to tasks,
+        files and search. The limits are shared with every other client of the same
+        server using the same limits, and requests over them wait for their turn.
+
+        `timeout` bounds how long each request waits to connect and to read the
+        response. Calls made within a `deadline` block fail with `DeadlineExceeded`
+        once it passes, instead of waiting or retrying beyond it.
+
+        `hooks` are called before and after each request, e.g. `LatencyHistograms`
+        to keep latency histograms per method.
+
+        Responses are validated straight from their bytes by `codec`; pass an
+        `OrjsonCodec` to trade memory for speed.
+        """
         self.base_url = base_url
+        self.session = session or create_session(
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            pool_block=pool_block,
+        )
+        self.file_cache = file_cache
+        self.symbol_cache = symbol_cache
+        self.retry = retry
+        self.retry_stats = RetryStats()
+        self.rate_limiter: Optional[RateLimiter] = (
+            shared_limiter(base_url, rate_limits) if rate_limits else None
+        )
+        self.timeout = timeout
+        self.instrumentation = Instrumentation(hooks)
+        self.codec = codec
+        self.max_parallel_reads = pool_maxsize
+        # Unknown until the first batch read or changeset.
+        self._batch_reads: Optional[bool] = None
+        self._batch_changes: Optional[bool] = None
+
+    def close(self) -> None:
+        self.session.close()
+
+    def __enter__(self) -> "HideClient":
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.close()
+
+    def _call(self, endpoint: endpoints.Endpoint[T]) -> T:
+        return endpoint.parse(self._send(endpoint), self.codec)
+
+    def _send(self, endpoint: endpoints.Endpoint[Any]) -> requests.Response:
+        return self._request(endpoint)
+
+    def _open(self, endpoint: endpoints.Endpoint[Any]) -> requests.Response:
+        """Sends the request without reading the response body."""
+        return self._request(endpoint, stream=True)
+
+    def _request(
+        self, endpoint: endpoints.Endpoint[Any], **kwargs: Any
+    ) -> requests.Response:
+        event = self.instrumentation.start(endpoint)
+        try:
+            response = self._send_with_retries(endpoint, event, **kwargs)
+        except BaseException as e:
+            self.instrumentation.finish(event, error=e)
+            raise
+        if event is not None:
+            self.instrumentation.finish(
+                event,
+                response.status_code,
+                body_size(response.request.body),
+                (
+                    content_length(response.headers)
+                    if kwargs.get("stream")
+                    else len(response.content)
+                ),
+            )
+        return response
+
+    def _send_with_retries(
+        self,
+        endpoint: endpoints.Endpoint[Any],
+        event: Optional[RequestEvent],
+        **kwargs: Any,
+    ) -> requests.Response:
+        payload, headers = endpoint.json, endpoint.headers
+        body = None if payload is None else self.codec.encode(payload)
+        if body is not None:
+            payload, headers = None, {**(headers or {}), **JSON_CONTENT}
+            kwargs["data"] = body
+
+        attempt = 1
+        while True:
+            try:
+                with ExitStack() as limit:
+                    limit.enter_context(self._limit(endpoint.path))
+                    response = self.session.request(
+                        endpoint.method,
+                        f"{self.base_url}{endpoint.path}",
+                        params=endpoint.params,
+                        json=payload,
+                        headers=headers,
+                        timeout=self.timeout.limits(endpoint.wait),
+                        **kwargs,
+                    )
+                    if kwargs.get("stream"):
+                        _hold_until_closed(response, limit.pop_all())
+            except (requests.ConnectionError, requests.Timeout) as e:
+                if expired():
+                    raise DeadlineExceeded() from e
+                delay = self.retry.delay(endpoint.method, attempt)
+                if delay is None or not allows(delay):
+                    raise
+            else:
+                delay = self.retry.delay(
+                    endpoint.method, attempt, response.status_code, response.headers
+                )
+                if delay is None or not allows(delay):
+                    return response
+                response.close()
+
+            self.retry_stats.record_retry()
+            if event is not None:
+                event.retries += 1
+            time.sleep(delay)
+            attempt += 1
+
+    def span(self, name: str, **attributes: Any) -> AbstractContextManager[Any]:
+        """
+        Groups the requests made within the block under a span named `name`, which
+        is reported to the hooks along with them.
+        """
+        return self.instrumentation.span(name, **attributes)
+
+    def _limit(self, path: str) -> AbstractContextManager[None]:
+        if self.rate_limiter is None:
+            return nullcontext()
+        return self.rate_limiter.limit(path)
+
+    def _invalidate(
+        self, project_id: str, path: Optional[model.FilePath] = None
+    ) -> None:
+        if self.file_cache is not None:
+            self.file_cache.invalidate(project_id, path)
+        if self.symbol_cache is not None:
+            self.symbol_cache.invalidate(project_id, path)
 
     def get_project(self, project_id: str) -> model.Project:
-        response = requests.get(f"{self.base_url}/projects/{project_id}")
-        if not response.ok:
-            raise HideClientError(response.text)
-        return model.Project.model_validate(response.json())
+        return self._call(endpoints.get_project(project_id))
 
     def get_projects(self) -> list[model.Project]:
-        response = requests.get(f"{self.base_url}/projects")
-        if not response.ok:
-            raise HideClientError(response.text)
-        return [model.Project.model_validate(project) for project in response.json()]
+        return self._call(endpoints.get_projects())
 
     def create_project(
         self,
         repository: model.Repository,
-        devcontainer: Optional[DevContainer] = None,
+        devcontainer: Optional["DevContainer"] = None,
         languages: Optional[list[model.Language]] = None,
     ) -> model.Project:
-        request = model.CreateProjectRequest(
-            repository=repository, devcontainer=devcontainer, languages=languages
-        )
-        response = requests.post(
-            f"{self.base_url}/projects",
-            json=request.model_dump(exclude_unset=True, exclude_none=True),
-        )
-        if not response.ok:
-            raise HideClientError(response.text)
-        return model.Project.model_validate(response.json())
+        return self._call(endpoints.create_project(repository, devcontainer, languages))
 
     def delete_project(self, project: model.Project) -> bool:
-        response = requests.delete(f"{self.base_url}/projects/{project.id}")
-        if not response.ok:
-            raise HideClientError(response.text)
-        return response.status_code == 204
+        try:
+            return self._call(endpoints.delete_project(project))
+        finally:
+            self._invalidate(project.id)
 
     def get_tasks(self, project_id: str) -> list[model.Task]:
-        response = requests.get(f"{self.base_url}/projects/{project_id}/tasks")
-        if not response.ok:
-            raise HideClientError(response.text)
-        return [model.Task.model_validate(task) for task in response.json()]
+        return self._call(endpoints.get_tasks(project_id))
 
     def run_task(
         self,
@@ -60,44 +270,81 @@ class HideClient:
         alias: Optional[str] = None,
         timeout: Optional[int] = None,
     ) -> model.TaskResult:
-        if not command and not alias:
-            raise HideClientError("Either 'command' or 'alias' must be provided")
-
-        if command and alias:
-            raise HideClientError("Cannot provide both 'command' and 'alias'")
-
-        if timeout and timeout <= 0:
-            raise HideClientError("Timeout must be a positive integer")
-
-        payload = {}
-        if command:
-            payload["command"] = command
-        if alias:
-            payload["alias"] = alias
-
-        headers = None
-        if timeout:
-            headers = headers = {"X-Timeout-Seconds": str(timeout)}
-
-        response = requests.post(
-            f"{self.base_url}/projects/{project_id}/tasks",
-            json=payload,
-            headers=headers,
+        try:
+            return self._call(
+                endpoints.run_task(project_id, command, alias, task_timeout(timeout))
+            )
+        finally:
+            # Commands can change any file in the project.
+            self._invalidate(project_id)
+
+    def stream_task(
+        self,
+        project_id: str,
+        command: Optional[str] = None,
+        alias: Optional[str] = None,
+        timeout: Optional[int] = None,
+    ) -> Generator[model.TaskEvent, None, None]:
+        """
+        Runs a task like `run_task`, but yields its output as `TaskOutput` chunks
+        while the command runs, followed by its `TaskExit`. Nothing is buffered
+        beyond the current chunk; feed the events to a `TaskOutputBuffer` to collect
+        the (tail of the) output.
+        """
+        endpoint = endpoints.stream_task(
+            project_id, command, alias, task_timeout(timeout)
         )
-        if not response.ok:
-            raise HideClientError(response.text)
-        return model.TaskResult.model_validate(response.json())
+        return self._stream_task(project_id, endpoint)
+
+    def _stream_task(
+        self, project_id: str, endpoint: endpoints.Endpoint[Any]
+    ) -> Generator[model.TaskEvent, None, None]:
+        try:
+            with self._open(endpoint) as response:
+                endpoint.parse(response, self.codec)
+                yield from decode_task_events(response.iter_content(chunk_size=None))
+        finally:
+            self._invalidate(project_id)
+
+    def start_task(
+        self,
+        project_id: str,
+        command: Optional[str] = None,
+        alias: Optional[str] = None,
+        timeout: Optional[int] = None,
+    ) -> TaskHandle:
+        """
+        Starts a task like `run_task` without waiting for it to finish. The returned
+        handle polls for its status, waits for its result and cancels it.
+        """
+        try:
+            task = self._call(endpoints.start_task(project_id, command, alias, timeout))
+            return TaskHandle(self, project_id, task)
+        finally:
+            self._invalidate(project_id)
+
+    def get_background_task(
+        self, project_id: str, task_id: str
+    ) -> model.BackgroundTask:
+        try:
+            return self._call(endpoints.get_background_task(project_id, task_id))
+        finally:
+            # The task may have changed files since the last check.
+            self._invalidate(project_id)
+
+    def cancel_task(self, project_id: str, task_id: str) -> model.BackgroundTask:
+        try:
+            return self._call(endpoints.cancel_task(project_id, task_id))
+        finally:
+            self._invalidate(project_id)
 
     def create_file(
         self, project_id: str, path: model.FilePath, content: str
     ) -> model.File:
-        response = requests.post(
-            f"{self.base_url}/projects/{project_id}/files",
-            json={"path": path, "content": content},
-        )
-        if not response.ok:
-            raise HideClientError(response.text)
-        return model.File.model_validate(response.json())
+        try:
+            return self._call(endpoints.create_file(project_id, path, content))
+        finally:
+            self._invalidate(project_id, path)
 
     def get_file(
         self,
@@ -106,13 +353,76 @@ class HideClient:
         start_line: Optional[int] = None,
         num_lines: Optional[int] = None,
     ) -> model.File:
-        response = requests.get(
-            url=f"{self.base_url}/projects/{project_id}/files/{path}",
-            params={"startLine": start_line, "numLines": num_lines},
-        )
-        if not response.ok:
-            raise HideClientError(response.text)
-        return model.File.model_validate(response.json())
+        endpoint = endpoints.get_file(project_id, path, start_line, num_lines)
+        if self.file_cache is None:
+            return self._call(endpoint)
+
+        key = (project_id, path, start_line, num_lines)
+        file, endpoint, version = self.file_cache.lookup(key, endpoint)
+        if file is not None:
+            return file
+        try:
+            response = self._send(endpoint)
+        except BaseException:
+            self.file_cache.cancel(version)
+            raise
+        return self.file_cache.store(key, version, endpoint, response, self.codec)
+
+    def get_files(
+        self,
+        project_id: str,
+        paths: Sequence[model.FilePath],
+        ranges: Optional[Sequence[Optional[tuple[int, int]]]] = None,
+    ) -> Iterator[model.FileResult]:
+        """
+        Reads many files, or `(start_line, num_lines)` ranges of them, in one request.
+        If the server has no batch endpoint, the files are read in parallel instead
+        and yielded as they arrive. A file that cannot be read is reported in its
+        result's `error` rather than raised.
+        """
+        reads = endpoints.file_reads(paths, ranges)
+        return self._get_files(project_id, reads)
+
+    def _get_files(
+        self, project_id: str, reads: list[endpoints.FileRead]
+    ) -> Iterator[model.FileResult]:
+        if self._batch_reads is not False:
+            try:
+                results = self._call(endpoints.get_files(project_id, reads))
+                self._batch_reads = True
+                yield from results
+                return
+            except HideClientError as e:
+                if self._batch_reads or not endpoints.is_unsupported(e):
+                    raise
+                self._batch_reads = False
+
+        with ThreadPoolExecutor(max_workers=self.max_parallel_reads) as executor:
+            # Each read runs in a copy of this context, to keep the caller's deadline.
+            futures = [
+                executor.submit(copy_context().run, self._read_file, project_id, *read)
+                for read in reads
+            ]
+            try:
+                for future in as_completed(futures):
+                    yield future.result()
+            finally:
+                for future in futures:
+                    future.cancel()
+
+    def _read_file(
+        self,
+        project_id: str,
+        path: model.FilePath,
+        start_line: Optional[int],
+        num_lines: Optional[int],
+    ) -> model.FileResult:
+        result = model.FileResult(path=path, startLine=start_line, numLines=num_lines)
+        try:
+            result.file = self.get_file(project_id, path, start_line, num_lines)
+        except Exception as e:
+            result.error = str(e)
+        return result
 
     def update_file(
         self,
@@ -120,48 +430,163 @@ class HideClient:
         path: model.FilePath,
         update: Union[model.UdiffUpdate, model.LineDiffUpdate, model.OverwriteUpdate],
     ) -> model.File:
-        match update:
-            case model.UdiffUpdate() as udiff:
-                payload = {
-                    "type": model.FileUpdateType.UDIFF.value,
-                    "udiff": udiff.model_dump(by_alias=True),
-                }
-            case model.LineDiffUpdate() as linediff:
-                payload = {
-                    "type": model.FileUpdateType.LINEDIFF.value,
-                    "linediff": linediff.model_dump(by_alias=True),
-                }
-            case model.OverwriteUpdate() as overwrite:
-                payload = {
-                    "type": model.FileUpdateType.OVERWRITE.value,
-                    "overwrite": overwrite.model_dump(by_alias=True),
-                }
-            case _:
-                raise ValueError(f"Invalid file update type: {type}")
-
-        response = requests.put(
-            f"{self.base_url}/projects/{project_id}/files/{path}",
-            json=payload,
-        )
-        if not response.ok:
-            raise HideClientError(response.text)
-        return model.File.model_validate(response.json())
+        try:
+            return self._call(endpoints.update_file(project_id, path, update))
+        finally:
+            self._invalidate(project_id, path)
+
+    def changeset(self, project_id: str) -> Changeset[model.ChangesetResult]:
+        """
+        Starts collecting file changes to submit together, e.g.
+        `client.changeset(project_id).create(...).update(...).delete(...).submit()`.
+        """
+        return Changeset(lambda changes: self.apply_changeset(project_id, changes))
+
+    def apply_changeset(
+        self, project_id: str, changes: Sequence[model.FileChange]
+    ) -> model.ChangesetResult:
+        """
+        Submits all changes in one request, so the server applies them together and
+        runs diagnostics once. If the server has no changeset endpoint, the changes
+        are applied one by one, and the files are restored if one fails.
+        """
+        try:
+            if self._batch_changes is not False:
+                try:
+                    endpoint = endpoints.apply_changeset(project_id, changes)
+                    result = self._call(endpoint)
+                    self._batch_changes = True
+                    return result
+                except HideClientError as e:
+                    if self._batch_changes or not endpoints.is_unsupported(e):
+                        raise
+                    self._batch_changes = False
+
+            return self._apply_changes(project_id, list(changes))
+        finally:
+            for path in touched_paths(list(changes)):
+                self._invalidate(project_id, path)
+
+    def _read_originals(
+        self, project_id: str, paths: list[model.FilePath]
+    ) -> dict[model.FilePath, Optional[model.File]]:
+        """
+        Reads the files about to be changed, with None for those that do not exist.
+        Raises if another file cannot be read, so that nothing is changed that could
+        not be restored.
+        """
+        originals: dict[model.FilePath, Optional[model.File]] = {}
+        for result in self.get_files(project_id, paths):
+            if result.file is None:
+                # Only a missing file is absent; any other failure is raised.
+                try:
+                    result.file = self.get_file(project_id, result.path)
+                except HideClientError as e:
+                    if e.status_code != 404:
+                        raise
+            originals[result.path] = result.file
+        return originals
+
+    def _apply_changes(
+        self, project_id: str, changes: list[model.FileChange]
+    ) -> model.ChangesetResult:
+        originals = self._read_originals(project_id, touched_paths(changes))
+        result = model.ChangesetResult()
+        touched: list[model.FilePath] = []
+        for change in changes:
+            touched.append(change.path)
+            try:
+                match change.type:
+                    case model.FileChangeType.CREATE:
+                        file = self.create_file(
+                            project_id, change.path, change.content or ""
+                        )
+                        result.files.append(file)
+                    case model.FileChangeType.UPDATE:
+                        if change.update is None:
+                            raise ValueError(f"Update of {change.path} has no update")
+                        file = self.update_file(project_id, change.path, change.update)
+                        result.files.append(file)
+                    case model.FileChangeType.DELETE:
+                        self.delete_file(project_id, change.path)
+                        result.deleted.append(change.path)
+            except Exception as e:
+                failed = self._restore(
+                    project_id, {path: originals[path] for path in touched}
+                )
+                rollback = (
+                    f"could not restore {', '.join(failed)}"
+                    if failed
+                    else "changes were rolled back"
+                )
+                raise HideClientError(
+                    f"Failed to {change.type.value} {change.path}: {e}; {rollback}"
+                ) from e
+        return result
+
+    def _restore(
+        self, project_id: str, originals: dict[model.FilePath, Optional[model.File]]
+    ) -> list[model.FilePath]:
+        """Puts files back as they were. Returns the paths that could not be restored."""
+        failed = []
+        for path, original in originals.items():
+            try:
+                self._restore_file(project_id, path, original)
+            except Exception:
+                failed.append(path)
+        return failed
+
+    def _restore_file(
+        self, project_id: str, path: model.FilePath, original: Optional[model.File]
+    ) -> None:
+        try:
+            if original is None:
+                self.delete_file(project_id, path)
+            else:
+                update = model.OverwriteUpdate(content=original.content())
+                self.update_file(project_id, path, update)
+        except HideClientError as e:
+            if e.status_code != 404:
+                raise
+            if original is not None:
+                # The file was deleted before the failure.
+                self.create_file(project_id, path, original.content())
 
     def delete_file(
         self, project_id: str, file: model.FilePath | model.File | model.FileInfo
     ) -> bool:
-        if isinstance(file, model.FileInfo):
-            file = file.path
+        try:
+            return self._call(endpoints.delete_file(project_id, file))
+        finally:
+            self._invalidate(project_id, endpoints.path_of(file))
+
+    @overload
+    def list_files(
+        self,
+        project_id: str,
+        include: Optional[list[str]] = ...,
+        exclude: Optional[list[str]] = ...,
+        format: Literal[model.ListFilesFormat.JSON] = ...,
+    ) -> list[model.FileInfo]: ...
 
-        if isinstance(file, model.File):
-            file = file.path
+    @overload
+    def list_files(
+        self,
+        project_id: str,
+        include: Optional[list[str]] = ...,
+        exclude: Optional[list[str]] = ...,
+        *,
+        format: Literal[model.ListFilesFormat.TREE],
+    ) -> str: ...
 
-        response = requests.delete(
-            f"{self.base_url}/projects/{project_id}/files/{file}"
-        )
-        if not response.ok:
-            raise HideClientError(response.text)
-        return response.status_code == 204
+    @overload
+    def list_files(
+        self,
+        project_id: str,
+        include: Optional[list[str]] = ...,
+        exclude: Optional[list[str]] = ...,
+        format: model.ListFilesFormat = ...,
+    ) -> list[model.FileInfo] | str: ...
 
     def list_files(
         self,
@@ -170,32 +595,9 @@ class HideClient:
         exclude: Optional[list[str]] = None,
         format: model.ListFilesFormat = model.ListFilesFormat.JSON,
     ) -> list[model.FileInfo] | str:
-        headers: dict[str, Any] = {}
-        match format:
-            case model.ListFilesFormat.JSON:
-                headers["Accept"] = "application/json"
-            case model.ListFilesFormat.TREE:
-                headers["Accept"] = "text/plain"
-
-        params: dict[str, Any] = {}
-        if include:
-            params["include"] = include
-        if exclude:
-            params["exclude"] = exclude
-
-        response = requests.get(
-            url=f"{self.base_url}/projects/{project_id}/files",
-            params=params,
-            headers=headers,
-        )
-        if not response.ok:
-            raise HideClientError(response.text)
-
-        match format:
-            case model.ListFilesFormat.JSON:
-                return [model.FileInfo.model_validate(file) for file in response.json()]
-            case model.ListFilesFormat.TREE:
-                return response.content.decode("utf-8")
+        if format == model.ListFilesFormat.TREE:
+            return self._call(endpoints.list_file_tree(project_id, include, exclude))
+        return self._call(endpoints.list_files(project_id, include, exclude))
 
     def search_files(
         self,
@@ -205,27 +607,105 @@ class HideClient:
         show_hidden: bool = False,
         include: Optional[list[str]] = None,
         exclude: Optional[list[str]] = None,
+        limit: Optional[int] = None,
+        offset: int = 0,
+        max_matches_per_file: Optional[int] = None,
+        context_lines: int = 0,
     ) -> list[model.File]:
-        params: dict[str, Any] = {"query": query, "type": "content"}
-
-        if search_mode == model.SearchMode.EXACT:
-            params["exact"] = ""
-        if search_mode == model.SearchMode.REGEX:
-            params["regex"] = ""
-        if show_hidden:
-            params["showHidden"] = ""
-        if include:
-            params["include"] = include
-        if exclude:
-            params["exclude"] = exclude
-
-        response = requests.get(
-            f"{self.base_url}/projects/{project_id}/search", params=params
+        return self._call(
+            endpoints.search_files(
+                project_id,
+                query,
+                search_mode,
+                show_hidden,
+                include,
+                exclude,
+                limit,
+                offset,
+                max_matches_per_file,
+                context_lines,
+            )
+        )
+
+    def iter_files(
+        self,
+        project_id: str,
+        include: Optional[list[str]] = None,
+        exclude: Optional[list[str]] = None,
+    ) -> Generator[model.FileInfo, None, None]:
+        """
+        Like `list_files`, but yields each file as soon as it has been received.
+        Only the file being received is held in memory. Stop iterating early, or
+        close the iterator, to drop the rest of the response.
+        """
+        return self._iter_items(
+            endpoints.iter_files(project_id, include, exclude), endpoints.FILE_INFO
+        )
+
+    def iter_search_files(
+        self,
+        project_id: str,
+        query: str,
+        search_mode: model.SearchMode = model.SearchMode.DEFAULT,
+        show_hidden: bool = False,
+        include: Optional[list[str]] = None,
+        exclude: Optional[list[str]] = None,
+        max_matches_per_file: Optional[int] = None,
+        context_lines: int = 0,
+        page_size: Optional[int] = None,
+    ) -> Generator[model.File, None, None]:
+        """
+        Like `search_files`, but yields each file as `iter_files` does. With
+        `page_size`, files are requested that many at a time, and the next page only
+        once the previous one has been consumed, so a broad search costs only the
+        results actually used.
+        """
+        endpoints.check_page_size(page_size)
+        page = functools.partial(
+            endpoints.iter_search_files,
+            project_id,
+            query,
+            search_mode,
+            show_hidden,
+            include,
+            exclude,
+            max_matches_per_file=max_matches_per_file,
+            context_lines=context_lines,
         )
+        return self._iter_pages(page, page_size, endpoints.FILE)
 
-        if not response.ok:
-            raise HideClientError(response.text)
-        return [model.File.model_validate(file) for file in response.json()]
+    def _iter_pages(
+        self,
+        page: Callable[..., endpoints.Endpoint[Any]],
+        page_size: Optional[int],
+        adapter: TypeAdapter[T],
+    ) -> Generator[T, None, None]:
+        offset = 0
+        first: Optional[T] = None
+        while True:
+            count = 0
+            items = self._iter_items(page(limit=page_size, offset=offset), adapter)
+            with closing(items):
+                for item in items:
+                    if count == 0:
+                        if offset and item == first:
+                            # The server ignored the offset and sent a page again.
+                            return
+                        first = item
+                    count += 1
+                    yield item
+            if page_size is None or count != page_size:
+                # The last page, or a server that ignored the limit and sent it all.
+                return
+            offset += count
+
+    def _iter_items(
+        self, endpoint: endpoints.Endpoint[Any], adapter: TypeAdapter[T]
+    ) -> Generator[T, None, None]:
+        with self._open(endpoint) as response:
+            endpoint.parse(response, self.codec)
+            for item in decode_json_array(response.iter_content(CHUNK_SIZE)):
+                yield adapter.validate_python(item)
 
     def search_symbols(
         self,
@@ -233,37 +713,35 @@ class HideClient:
         query: str,
         limit: Optional[int] = None,
     ) -> list[model.Symbol]:
-        params: dict[str, Any] = {"query": query}
-
-        if limit:
-            params["limit"] = limit
-
-        response = requests.get(
-            f"{self.base_url}/projects/{project_id}/search?type=symbol", params=params
-        )
-
-        if not response.ok:
-            raise HideClientError(response.text)
-        return [model.Symbol.model_validate(symbol) for symbol in response.json()]
+        endpoint = endpoints.search_symbols(project_id, query, limit)
+        if self.symbol_cache is None:
+            return self._call(endpoint)
+
+        limit = limit or None
+        symbols, version = self.symbol_cache.symbols(project_id, query, limit)
+        if symbols is None:
+            try:
+                symbols = self._call(endpoint)
+            except BaseException:
+                self.symbol_cache.cancel(version)
+                raise
+            self.symbol_cache.store_symbols(project_id, query, limit, version, symbols)
+        return symbols
 
     def document_outline(
         self, project_id: str, file: model.File | model.FileInfo | model.FilePath
     ) -> model.DocumentOutline:
-        match file:
-            case model.FilePath():
-                path = file
-            case model.File():
-                path = file.path
-            case model.FileInfo():
-                path = file.path
-
-        response = requests.get(f"{self.base_url}/projects/{project_id}/outline/{path}")
-        if not response.ok:
-            raise HideClientError(response.text)
-        return model.DocumentOutline.model_validate(response.json())
-
-
-class HideClientError(Exception):
-    def __init__(self, message: str) -> None:
-        super().__init__(message)
-        self.message = message
+        endpoint = endpoints.document_outline(project_id, file)
+        if self.symbol_cache is None:
+            return self._call(endpoint)
+
+        path = endpoints.path_of(file)
+        outline, version = self.symbol_cache.outline(project_id, path)
+        if outline is None:
+            try:
+                outline = self._call(endpoint)
+            except BaseException:
+                self.symbol_cache.cancel(version)
+                raise
+            self.symbol_cache.store_outline(project_id, path, version, outline)
+        return outline
@@ -0,0 +1,264 @@
+"""
+Hooks called around every request a client sends, and spans grouping requests.
+
+A `RequestHook` sees a `RequestEvent` before each request and again once it is done,
+with its status, sizes, latency and retries filled in. Spans, e.g. one per toolkit
+tool call, are reported to the same hooks, and every request records the span it was
+made in. `LatencyHistograms` is a hook keeping latency histograms in memory.
+"""
+
+import bisect
+import math
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, Iterator, Mapping, Optional, Sequence
+
+from hide.client.endpoints import Endpoint
+
+
+@dataclass
+class Span:
+    name: str
+    parent: Optional["Span"] = None
+    attributes: dict[str, Any] = field(default_factory=dict)
+    start: float = field(default_factory=time.perf_counter)
+    duration: Optional[float] = None
+    error: Optional[BaseException] = None
+
+
+_current_span: ContextVar[Optional[Span]] = ContextVar("hide_span", default=None)
+
+
+def current_span() -> Optional[Span]:
+    return _current_span.get()
+
+
+@dataclass
+class RequestEvent:
+    """
+    A request to the Hide server. `name` is the client method, e.g. "get_file", and
+    `span` the span it was made in, if any. Sizes are in bytes; the size of a
+    streamed response is only known if the server sent its length. `latency` covers
+    all attempts and the waits between them, up to the start of a streamed response.
+    """
+
+    name: str
+    method: str
+    path: str
+    project_id: Optional[str]
+    span: Optional[Span]
+    start: float = field(default_factory=time.perf_counter)
+    request_bytes: Optional[int] = None
+    response_bytes: Optional[int] = None
+    status_code: Optional[int] = None
+    retries: int = 0
+    latency: Optional[float] = None
+    error: Optional[BaseException] = None
+
+
+class RequestHook:
+    """Base class for request hooks. Override the methods you need."""
+
+    def before_request(self, event: RequestEvent) -> None:
+        pass
+
+    def after_request(self, event: RequestEvent) -> None:
+        pass
+
+    def span_started(self, span: Span) -> None:
+        pass
+
+    def span_ended(self, span: Span) -> None:
+        pass
+
+
+def _project_id(path: str) -> Optional[str]:
+    parts = path.strip("/").split("/")
+    return parts[1] if len(parts) > 1 and parts[0] == "projects" else None
+
+
+class Instrumentation:
+    """Calls `hooks` for the requests of one client. Does nothing without hooks."""
+
+    def __init__(self, hooks: Sequence[RequestHook] = ()) -> None:
+        self.hooks = list(hooks)
+
+    def __bool__(self) -> bool:
+        return bool(self.hooks)
+
+    def start(self, endpoint: Endpoint[Any]) -> Optional[RequestEvent]:
+        if not self.hooks:
+            return None
+        event = RequestEvent(
+            name=endpoint.name,
+            method=endpoint.method,
+            path=endpoint.path,
+            project_id=_project_id(endpoint.path),
+            span=current_span(),
+        )
+        for hook in self.hooks:
+            hook.before_request(event)
+        return event
+
+    def finish(
+        self,
+        event: Optional[RequestEvent],
+        status_code: Optional[int] = None,
+        request_bytes: Optional[int] = None,
+        response_bytes: Optional[int] = None,
+        error: Optional[BaseException] = None,
+    ) -> None:
+        if event is None:
+            return
+        event.latency = time.perf_counter() - event.start
+        event.status_code = status_code
+        event.request_bytes = request_bytes
+        event.response_bytes = response_bytes
+        event.error = error
+        for hook in self.hooks:
+            hook.after_request(event)
+
+    @contextmanager
+    def span(self, name: str, **attributes: Any) -> Iterator[Optional[Span]]:
+        """Groups the requests made within the block, e.g. by a tool call."""
+        if not self.hooks:
+            yield None
+            return
+
+        span = Span(name, parent=current_span(), attributes=attributes)
+        token = _current_span.set(span)
+        for hook in self.hooks:
+            hook.span_started(span)
+        try:
+            yield span
+        except BaseException as e:
+            span.error = e
+            raise
+        finally:
+            span.duration = time.perf_counter() - span.start
+            _current_span.reset(token)
+            for hook in self.hooks:
+                hook.span_ended(span)
+
+
+def body_size(body: Any) -> Optional[int]:
+    if body is None:
+        return 0
+    if isinstance(body, (bytes, bytearray, str)):
+        return len(body)
+    return None
+
+
+def content_length(headers: Mapping[str, str]) -> Optional[int]:
+    length = headers.get("Content-Length")
+    return int(length) if length else None
+
+
+class Histogram:
+    """
+    Latencies in seconds, counted in buckets growing by `growth` from `lowest` up,
+    so that quantiles are accurate to within that factor.
+    """
+
+    def __init__(self, lowest: float = 1e-4, growth: float = 1.05) -> None:
+        self.lowest = lowest
+        self.growth = growth
+        self.counts: dict[int, int] = {}
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def _bucket(self, value: float) -> int:
+        if value <= self.lowest:
+            return 0
+        return math.ceil(math.log(value / self.lowest, self.growth))
+
+    def add(self, value: float) -> None:
+        bucket = self._bucket(value)
+        self.counts[bucket] = self.counts.get(bucket, 0) + 1
+        self.count += 1
+        self.total += value
+        self.max = max(self.max, value)
+
+    def quantile(self, q: float) -> float:
+        """Upper bound of the bucket holding the `q`th quantile, e.g. 0.99 for p99."""
+        if not self.count:
+            return 0.0
+        rank = max(1, math.ceil(q * self.count))
+        buckets = sorted(self.counts)
+        cumulative = []
+        seen = 0
+        for bucket in buckets:
+            seen += self.counts[bucket]
+            cumulative.append(seen)
+        bucket = buckets[bisect.bisect_left(cumulative, rank)]
+        return min(self.max, self.lowest * self.growth**bucket)
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+
+@dataclass
+class Summary:
+    count: int
+    errors: int
+    retries: int
+    mean: float
+    p50: float
+    p99: float
+    max: float
+
+
+class LatencyHistograms(RequestHook):
+    """
+    Keeps a latency histogram per request name (e.g. "get_file") and per span name
+    (e.g. "tool.run_task"). Requests answered with an error status or failing to
+    complete count as errors.
+    """
+
+    def __init__(self) -> None:
+        self.requests: dict[str, Histogram] = {}
+        self.spans: dict[str, Histogram] = {}
+        self._errors: dict[str, int] = {}
+        self._retries: dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def after_request(self, event: RequestEvent) -> None:
+        failed = event.error is not None or (event.status_code or 0) >= 400
+        with self._lock:
+            self.requests.setdefault(event.name, Histogram()).add(event.latency or 0)
+            self._errors[event.name] = self._errors.get(event.name, 0) + failed
+            self._retries[event.name] = self._retries.get(event.name, 0) + event.retries
+
+    def span_ended(self, span: Span) -> None:
+        with self._lock:
+            self.spans.setdefault(span.name, Histogram()).add(span.duration or 0)
+            failed = span.error is not None
+            self._errors[span.name] = self._errors.get(span.name, 0) + failed
+
+    def summary(self) -> dict[str, Summary]:
+        """Count, errors, retries and latencies per request and span name."""
+        with self._lock:
+            return {
+                name: Summary(
+                    count=histogram.count,
+                    errors=self._errors.get(name, 0),
+                    retries=self._retries.get(name, 0),
+                    mean=histogram.mean,
+                    p50=histogram.quantile(0.5),
+                    p99=histogram.quantile(0.99),
+                    max=histogram.max,
+                )
+                for name, histogram in {**self.requests, **self.spans}.items()
+            }
+
+    def reset(self) -> None:
+        with self._lock:
+            self.requests.clear()
+            self.spans.clear()
+            self._errors.clear()
+            self._retries.clear()
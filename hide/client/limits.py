@@ -0,0 +1,254 @@
+"""
+Client-side rate limits shared by every client talking to the same Hide server.
+
+Each class of endpoints (tasks, files, search and everything else) can be limited to a
+request rate, with bursts, and to a number of requests in flight. Calls over a limit
+wait for their turn in the order they arrived rather than fail, unless their turn
+would come after the current deadline.
+"""
+
+import asyncio
+import threading
+import time
+from collections import deque
+from contextlib import asynccontextmanager, contextmanager
+from dataclasses import dataclass, field
+from enum import Enum
+from typing import AsyncIterator, Callable, Iterator, Optional
+
+from hide.client.errors import DeadlineExceeded
+from hide.client.timeouts import remaining
+
+
+class EndpointClass(str, Enum):
+    TASKS = "tasks"
+    FILES = "files"
+    SEARCH = "search"
+    OTHER = "other"
+
+
+def endpoint_class(path: str) -> EndpointClass:
+    # Paths look like /projects/{project_id}/{resource}/...
+    parts = path.strip("/").split("/")
+    resource = parts[2] if len(parts) > 2 else None
+    match resource:
+        case "tasks":
+            return EndpointClass.TASKS
+        case "search":
+            return EndpointClass.SEARCH
+        case "files" | "outline" | "changesets":
+            return EndpointClass.FILES
+    return EndpointClass.OTHER
+
+
+@dataclass(frozen=True)
+class Limit:
+    """
+    At most `rate` requests per second on average, with bursts of up to `burst`
+    requests (default: one second worth), and at most `max_in_flight` requests at a
+    time. None means unlimited.
+    """
+
+    rate: Optional[float] = None
+    burst: Optional[int] = None
+    max_in_flight: Optional[int] = None
+
+    def __post_init__(self) -> None:
+        if self.rate is not None and self.rate <= 0:
+            raise ValueError("rate must be positive")
+        if self.burst is not None and self.burst < 1:
+            raise ValueError("burst must be at least 1")
+        if self.max_in_flight is not None and self.max_in_flight < 1:
+            raise ValueError("max_in_flight must be at least 1")
+
+
+@dataclass(frozen=True)
+class RateLimits:
+    tasks: Limit = field(default_factory=Limit)
+    files: Limit = field(default_factory=Limit)
+    search: Limit = field(default_factory=Limit)
+    other: Limit = field(default_factory=Limit)
+
+    def of(self, endpoint_class: EndpointClass) -> Limit:
+        return getattr(self, endpoint_class.value)
+
+
+class _TokenBucket:
+    """
+    Token bucket that hands out tokens in advance: a caller that finds the bucket
+    empty reserves the next token and is told how long to wait for it, so waiting
+    callers are served in order.
+    """
+
+    def __init__(self, rate: float, burst: int) -> None:
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self, max_delay: Optional[float] = None) -> Optional[float]:
+        """
+        Reserves a token and returns how long to wait for it, or None, without
+        reserving one, if that would be longer than `max_delay`.
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(
+                self.burst, self._tokens + (now - self._updated) * self.rate
+            )
+            self._updated = now
+            delay = max(0.0, (1 - self._tokens) / self.rate)
+            if max_delay is not None and delay > max_delay:
+                return None
+            self._tokens -= 1
+            return delay
+
+
+class _Slots:
+    """
+    First-in, first-out semaphore usable from threads and event loops alike. A
+    released slot is handed straight to the longest waiting caller.
+    """
+
+    def __init__(self, size: int) -> None:
+        self.size = size
+        self._used = 0
+        self._waiters: deque[Callable[[], None]] = deque()
+        self._lock = threading.Lock()
+
+    def _take_or_wait(self, wake: Callable[[], None]) -> bool:
+        with self._lock:
+            if self._used < self.size and not self._waiters:
+                self._used += 1
+                return True
+            self._waiters.append(wake)
+            return False
+
+    def acquire(self, timeout: Optional[float] = None) -> bool:
+        """Waits for a slot, for at most `timeout` seconds. False if none came."""
+        event = threading.Event()
+        if self._take_or_wait(event.set) or event.wait(timeout):
+            return True
+        # A slot handed over while giving up is kept.
+        return self._give_up(event.set)
+
+    async def acquire_async(self, timeout: Optional[float] = None) -> bool:
+        loop = asyncio.get_running_loop()
+        future: asyncio.Future[None] = loop.create_future()
+
+        def wake() -> None:
+            loop.call_soon_threadsafe(lambda: future.done() or future.set_result(None))
+
+        if self._take_or_wait(wake):
+            return True
+        try:
+            await asyncio.wait_for(future, timeout)
+        except asyncio.TimeoutError:
+            return self._give_up(wake)
+        except asyncio.CancelledError:
+            if self._give_up(wake):
+                self.release()
+            raise
+        return True
+
+    def _give_up(self, wake: Callable[[], None]) -> bool:
+        """Stops waiting. True if a slot was handed over to `wake` meanwhile."""
+        with self._lock:
+            if wake in self._waiters:
+                self._waiters.remove(wake)
+                return False
+            return True
+
+    def release(self) -> None:
+        with self._lock:
+            if not self._waiters:
+                self._used -= 1
+                return
+            wake = self._waiters.popleft()
+        wake()
+
+
+class _ClassLimiter:
+    def __init__(self, limit: Limit) -> None:
+        self.bucket = (
+            _TokenBucket(limit.rate, limit.burst or max(1, int(limit.rate)))
+            if limit.rate is not None
+            else None
+        )
+        self.slots = (
+            _Slots(limit.max_in_flight) if limit.max_in_flight is not None else None
+        )
+
+
+def _time_left() -> Optional[float]:
+    left = remaining()
+    if left is not None and left <= 0:
+        raise DeadlineExceeded()
+    return left
+
+
+def _reserve(bucket: _TokenBucket) -> float:
+    delay = bucket.reserve(_time_left())
+    if delay is None:
+        raise DeadlineExceeded()
+    return delay
+
+
+class RateLimiter:
+    def __init__(self, limits: RateLimits) -> None:
+        self.limits = limits
+        self._limiters = {c: _ClassLimiter(limits.of(c)) for c in EndpointClass}
+
+    @contextmanager
+    def limit(self, path: str) -> Iterator[None]:
+        """
+        Waits until a request to `path` may be sent, and holds its slot. Raises
+        `DeadlineExceeded` instead if the wait would outlast the current deadline.
+        """
+        limiter = self._limiters[endpoint_class(path)]
+        if limiter.bucket is not None:
+            delay = _reserve(limiter.bucket)
+            if delay:
+                time.sleep(delay)
+        if limiter.slots is None:
+            yield
+            return
+
+        if not limiter.slots.acquire(_time_left()):
+            raise DeadlineExceeded()
+        try:
+            yield
+        finally:
+            limiter.slots.release()
+
+    @asynccontextmanager
+    async def limit_async(self, path: str) -> AsyncIterator[None]:
+        limiter = self._limiters[endpoint_class(path)]
+        if limiter.bucket is not None:
+            delay = _reserve(limiter.bucket)
+            if delay:
+                await asyncio.sleep(delay)
+        if limiter.slots is None:
+            yield
+            return
+
+        if not await limiter.slots.acquire_async(_time_left()):
+            raise DeadlineExceeded()
+        try:
+            yield
+        finally:
+            limiter.slots.release()
+
+
+_shared: dict[tuple[str, RateLimits], RateLimiter] = {}
+_shared_lock = threading.Lock()
+
+
+def shared_limiter(base_url: str, limits: RateLimits) -> RateLimiter:
+    """Returns the limiter shared by every client of `base_url` with these limits."""
+    with _shared_lock:
+        key = (base_url.rstrip("/"), limits)
+        if key not in _shared:
+            _shared[key] = RateLimiter(limits)
+        return _shared[key]
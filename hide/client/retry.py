@@ -0,0 +1,93 @@
+import random
+import threading
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Mapping, Optional
+
+IDEMPOTENT_METHODS = frozenset({"GET", "DELETE"})
+RETRY_STATUSES = frozenset({429, 502, 503, 504})
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """
+    When and how long to wait before sending a failed request again.
+
+    Requests are retried when the server answers with one of `statuses` or the
+    connection fails, up to `max_attempts` attempts in total. The delay before
+    attempt n + 1 is drawn uniformly from [0, min(max_backoff, backoff * 2 ** (n - 1))]
+    ("full jitter"), unless the server sent a `Retry-After` header, which is used as
+    is. A `Retry-After` longer than `max_backoff` is not waited for.
+
+    Only `methods` are retried. By default these are GET and DELETE, which are safe
+    to repeat; add "POST" (e.g. to retry `run_task`) or "PUT" to opt in for requests
+    the server may have already acted on.
+    """
+
+    max_attempts: int = 3
+    backoff: float = 0.5
+    max_backoff: float = 30.0
+    statuses: frozenset[int] = RETRY_STATUSES
+    methods: frozenset[str] = IDEMPOTENT_METHODS
+
+    def __post_init__(self) -> None:
+        if self.max_attempts < 1:
+            raise ValueError("max_attempts must be at least 1")
+        if self.backoff < 0 or self.max_backoff < 0:
+            raise ValueError("backoff must not be negative")
+
+    def delay(
+        self,
+        method: str,
+        attempt: int,
+        status_code: Optional[int] = None,
+        headers: Optional[Mapping[str, str]] = None,
+    ) -> Optional[float]:
+        """
+        Returns how long to wait before retrying the `attempt`th attempt at a request,
+        which failed with `status_code` or, if None, a connection error. Returns None
+        if it should not be retried.
+        """
+        if attempt >= self.max_attempts or method.upper() not in self.methods:
+            return None
+        if status_code is not None and status_code not in self.statuses:
+            return None
+
+        retry_after = _retry_after(headers.get("Retry-After")) if headers else None
+        if retry_after is not None:
+            return retry_after if retry_after <= self.max_backoff else None
+        return random.uniform(
+            0, min(self.max_backoff, self.backoff * 2 ** (attempt - 1))
+        )
+
+
+NO_RETRY = RetryPolicy(max_attempts=1)
+
+
+def _retry_after(value: Optional[str]) -> Optional[float]:
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except (TypeError, ValueError):
+        pass
+    try:
+        date = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if date.tzinfo is None:
+        date = date.replace(tzinfo=timezone.utc)
+    return max(0.0, (date - datetime.now(timezone.utc)).total_seconds())
+
+
+@dataclass
+class RetryStats:
+    retries: int = 0
+    _lock: threading.Lock = field(
+        default_factory=threading.Lock, repr=False, compare=False
+    )
+
+    def record_retry(self) -> None:
+        with self._lock:
+            self.retries += 1
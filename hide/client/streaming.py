@@ -0,0 +1,243 @@
+"""
+Decoding of streamed responses.
+
+The server sends the output of a streamed task as server-sent events: `stdout` and
+`stderr` events carry output as it is written, and a final `exit` event carries the
+exit code as JSON. An `error` event carries a message if the task fails to run.
+
+Long lists, like the files of a project, are decoded item by item as they arrive by
+`JsonArrayDecoder`, so each item can be validated and used before the rest of the
+list has been received.
+"""
+
+import codecs
+import json
+import re
+from collections import deque
+from enum import Enum, auto
+from typing import Any, Iterable, Iterator, Optional
+
+from hide import model
+from hide.client.errors import HideClientError
+
+
+class TaskEventDecoder:
+    """Incrementally decodes task events from the bytes of an event stream."""
+
+    def __init__(self) -> None:
+        self._buffer = b""
+        self._event = ""
+        self._data: list[str] = []
+        self.exit: Optional[model.TaskExit] = None
+
+    def feed(self, chunk: bytes) -> list[model.TaskEvent]:
+        *lines, self._buffer = (self._buffer + chunk).split(b"\n")
+        events = []
+        for line in lines:
+            event = self._feed_line(line.removesuffix(b"\r").decode("utf-8"))
+            if event is not None:
+                events.append(event)
+        return events
+
+    def close(self) -> None:
+        """Checks that the stream ended with the exit code of the task."""
+        if self.exit is None:
+            raise HideClientError("Task output ended without an exit code")
+
+    def _feed_line(self, line: str) -> Optional[model.TaskEvent]:
+        if not line:
+            return self._dispatch()
+        if line.startswith(":"):
+            return None
+
+        name, _, value = line.partition(":")
+        value = value.removeprefix(" ")
+        if name == "event":
+            self._event = value
+        elif name == "data":
+            self._data.append(value)
+        return None
+
+    def _dispatch(self) -> Optional[model.TaskEvent]:
+        event, data = self._event, "\n".join(self._data)
+        self._event, self._data = "", []
+
+        match event:
+            case model.TaskStream.STDOUT.value | model.TaskStream.STDERR.value:
+                return model.TaskOutput(stream=model.TaskStream(event), data=data)
+            case "exit":
+                self.exit = model.TaskExit.model_validate(json.loads(data))
+                return self.exit
+            case "error":
+                raise HideClientError(data)
+        return None
+
+
+def decode_task_events(chunks: Iterable[bytes]) -> Iterator[model.TaskEvent]:
+    decoder = TaskEventDecoder()
+    for chunk in chunks:
+        yield from decoder.feed(chunk)
+    decoder.close()
+
+
+class TaskOutputBuffer:
+    """
+    Collects streamed task output into a `TaskResult`. With `max_chars` set, only
+    the last `max_chars` characters of each stream are kept.
+    """
+
+    def __init__(self, max_chars: Optional[int] = None) -> None:
+        if max_chars is not None and max_chars <= 0:
+            raise ValueError("max_chars must be a positive integer")
+
+        self.max_chars = max_chars
+        self.exit_code: Optional[int] = None
+        self._chunks = {stream: deque() for stream in model.TaskStream}
+        self._sizes = {stream: 0 for stream in model.TaskStream}
+
+    def add(self, event: model.TaskEvent) -> None:
+        if isinstance(event, model.TaskExit):
+            self.exit_code = event.exit_code
+            return
+
+        chunks = self._chunks[event.stream]
+        chunks.append(event.data)
+        self._sizes[event.stream] += len(event.data)
+        if self.max_chars is None:
+            return
+
+        excess = self._sizes[event.stream] - self.max_chars
+        while excess > 0:
+            if len(chunks[0]) <= excess:
+                dropped = chunks.popleft()
+            else:
+                dropped = chunks[0][:excess]
+                chunks[0] = chunks[0][excess:]
+            excess -= len(dropped)
+            self._sizes[event.stream] -= len(dropped)
+
+    def output(self, stream: model.TaskStream) -> str:
+        return "".join(self._chunks[stream])
+
+    def result(self) -> model.TaskResult:
+        if self.exit_code is None:
+            raise HideClientError("Task has not exited")
+
+        return model.TaskResult(
+            stdout=self.output(model.TaskStream.STDOUT),
+            stderr=self.output(model.TaskStream.STDERR),
+            exitCode=self.exit_code,
+        )
+
+
+# Bytes read from a response at a time. Reading it as it arrives instead could hand
+# the decoder the whole body at once.
+CHUNK_SIZE = 64 * 1024
+
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+_SEPARATOR = re.compile(r"[ \t\n\r]*,[ \t\n\r]*")
+_DELIMITERS = frozenset(", \t\n\r]")
+
+
+class _ArrayState(Enum):
+    BEFORE_ARRAY = auto()
+    FIRST_ITEM = auto()
+    ITEM = auto()
+    AFTER_ITEM = auto()
+    DONE = auto()
+
+
+class JsonArrayDecoder:
+    """
+    Incrementally decodes the items of a JSON array from the bytes of a response.
+    Only the item being received is buffered. An item is decoded once it is
+    complete; attempts at an incomplete item are spaced out so that a large item
+    is not decoded over and over as it trickles in.
+    """
+
+    def __init__(self) -> None:
+        self._chunks: list[str] = []
+        self._size = 0
+        self._retry_at = 0
+        self._utf8 = codecs.getincrementaldecoder("utf-8")()
+        self._json = json.JSONDecoder()
+        self._state = _ArrayState.BEFORE_ARRAY
+
+    def feed(self, chunk: bytes) -> list[Any]:
+        text = self._utf8.decode(chunk)
+        self._chunks.append(text)
+        self._size += len(text)
+        if self._size < self._retry_at:
+            return []
+        return self._decode_items()
+
+    def close(self) -> list[Any]:
+        """
+        Decodes the items left once the response has ended, and checks that the
+        whole array was received.
+        """
+        self._chunks.append(self._utf8.decode(b"", final=True))
+        items = self._decode_items()
+        if self._state != _ArrayState.DONE:
+            raise HideClientError("Invalid or incomplete JSON list")
+        return items
+
+    def _decode_items(self) -> list[Any]:
+        text = "".join(self._chunks)
+        items = []
+        pos = 0
+        while True:
+            pos = _WHITESPACE.match(text, pos).end()  # type: ignore[union-attr]
+            if pos == len(text):
+                break
+            char = text[pos]
+            match self._state, char:
+                case _ArrayState.BEFORE_ARRAY, "[":
+                    self._state = _ArrayState.FIRST_ITEM
+                case (_ArrayState.FIRST_ITEM | _ArrayState.AFTER_ITEM, "]"):
+                    self._state = _ArrayState.DONE
+                case _ArrayState.AFTER_ITEM, ",":
+                    self._state = _ArrayState.ITEM
+                case _ArrayState.FIRST_ITEM | _ArrayState.ITEM, _:
+                    pos = self._decode_run(text, pos, items)
+                    if self._state != _ArrayState.AFTER_ITEM:
+                        break
+                    continue
+                case _:
+                    raise HideClientError(f"Unexpected {char!r} in JSON list")
+            pos += 1
+
+        rest = text[pos:]
+        self._chunks = [rest] if rest else []
+        self._size = len(rest)
+        self._retry_at = 2 * len(rest)
+        return items
+
+    def _decode_run(self, text: str, pos: int, items: list[Any]) -> int:
+        """Decodes items from `pos` for as long as they are complete and separated
+        by commas. Returns where it stopped."""
+        raw_decode = self._json.raw_decode
+        separator = _SEPARATOR.match
+        while True:
+            try:
+                item, end = raw_decode(text, pos)
+            except json.JSONDecodeError:
+                # Incomplete, or invalid, which `close` reports once the response ends.
+                return pos
+            if text[pos] not in '{["' and text[end : end + 1] not in _DELIMITERS:
+                # A number may continue in the next chunk.
+                return pos
+            items.append(item)
+            self._state = _ArrayState.AFTER_ITEM
+            match = separator(text, end)
+            if match is None or match.end() == len(text):
+                return end
+            self._state = _ArrayState.ITEM
+            pos = match.end()
+
+
+def decode_json_array(chunks: Iterable[bytes]) -> Iterator[Any]:
+    decoder = JsonArrayDecoder()
+    for chunk in chunks:
+        yield from decoder.feed(chunk)
+    yield from decoder.close()
@@ -0,0 +1,123 @@
+import asyncio
+import time
+from typing import TYPE_CHECKING, Optional
+
+from hide import model
+from hide.client.errors import HideClientError
+from hide.client.timeouts import remaining
+
+if TYPE_CHECKING:
+    from hide.client.async_hide_client import AsyncHideClient
+    from hide.client.hide_client import HideClient
+
+DEFAULT_POLL_INTERVAL = 0.5
+
+
+def _result(task: model.BackgroundTask) -> model.TaskResult:
+    if task.result is None:
+        raise HideClientError(f"Task {task.id} is {task.status.value}, no result")
+    return task.result
+
+
+def _next_poll(poll_interval: float) -> float:
+    # Poll again no later than the deadline, so that waiting fails when it passes.
+    left = remaining()
+    return poll_interval if left is None else max(0.0, min(poll_interval, left))
+
+
+def _timed_out(task: model.BackgroundTask, timeout: Optional[float]) -> HideClientError:
+    return HideClientError(f"Task {task.id} did not finish within {timeout} seconds")
+
+
+class TaskHandle:
+    """
+    A task running in the background, as returned by `HideClient.start_task`. The
+    last known state is kept in `task`; `poll` refreshes it.
+    """
+
+    def __init__(
+        self, client: "HideClient", project_id: str, task: model.BackgroundTask
+    ) -> None:
+        self.client = client
+        self.project_id = project_id
+        self.task = task
+
+    @property
+    def id(self) -> str:
+        return self.task.id
+
+    @property
+    def done(self) -> bool:
+        return self.task.done
+
+    def poll(self) -> model.BackgroundTask:
+        self.task = self.client.get_background_task(self.project_id, self.id)
+        return self.task
+
+    def wait(
+        self,
+        timeout: Optional[float] = None,
+        poll_interval: float = DEFAULT_POLL_INTERVAL,
+    ) -> model.TaskResult:
+        """
+        Polls until the task finishes and returns its result. Raises
+        `HideClientError` if it is still running after `timeout` seconds, or was
+        cancelled.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while not self.done and not self.poll().done:
+            delay = _next_poll(poll_interval)
+            if deadline is not None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise _timed_out(self.task, timeout)
+                delay = min(delay, remaining)
+            time.sleep(delay)
+        return _result(self.task)
+
+    def cancel(self) -> bool:
+        """Stops the task. Returns False if it had already finished."""
+        self.task = self.client.cancel_task(self.project_id, self.id)
+        return self.task.status == model.TaskStatus.CANCELLED
+
+
+class AsyncTaskHandle:
+    """Coroutine counterpart of `TaskHandle`, returned by `AsyncHideClient.start_task`."""
+
+    def __init__(
+        self, client: "AsyncHideClient", project_id: str, task: model.BackgroundTask
+    ) -> None:
+        self.client = client
+        self.project_id = project_id
+        self.task = task
+
+    @property
+    def id(self) -> str:
+        return self.task.id
+
+    @property
+    def done(self) -> bool:
+        return self.task.done
+
+    async def poll(self) -> model.BackgroundTask:
+        self.task = await self.client.get_background_task(self.project_id, self.id)
+        return self.task
+
+    async def wait(
+        self,
+        timeout: Optional[float] = None,
+        poll_interval: float = DEFAULT_POLL_INTERVAL,
+    ) -> model.TaskResult:
+        async def poll_until_done() -> None:
+            while not self.done and not (await self.poll()).done:
+                await asyncio.sleep(_next_poll(poll_interval))
+
+        try:
+            await asyncio.wait_for(poll_until_done(), timeout)
+        except asyncio.TimeoutError:
+            raise _timed_out(self.task, timeout) from None
+        return _result(self.task)
+
+    async def cancel(self) -> bool:
+        self.task = await self.client.cancel_task(self.project_id, self.id)
+        return self.task.status == model.TaskStatus.CANCELLED
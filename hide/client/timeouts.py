@@ -0,0 +1,107 @@
+"""
+Client timeouts and per-call deadlines.
+
+`Timeout` bounds how long a single request waits on the network. `deadline` bounds a
+whole block of calls, retries and waits included: it is kept in a context variable, so
+it flows through toolkit tools and into the tasks of an event loop, and every request
+made within it fails with `DeadlineExceeded` once the time is up.
+"""
+
+import math
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Iterator, Optional
+
+from hide.client.errors import DeadlineExceeded
+
+DEFAULT_CONNECT_TIMEOUT = 10.0
+DEFAULT_READ_TIMEOUT = 60.0
+
+_deadline: ContextVar[Optional[float]] = ContextVar("hide_deadline", default=None)
+
+
+@contextmanager
+def deadline(seconds: Optional[float]) -> Iterator[None]:
+    """
+    Requests made within the block fail with `DeadlineExceeded` after `seconds`. A
+    nested deadline can only shorten the enclosing one; None keeps it as is.
+    """
+    if seconds is None:
+        yield
+        return
+
+    at = time.monotonic() + seconds
+    enclosing = _deadline.get()
+    token = _deadline.set(at if enclosing is None else min(at, enclosing))
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+def remaining() -> Optional[float]:
+    """Seconds left until the current deadline, or None if there is none."""
+    at = _deadline.get()
+    return None if at is None else at - time.monotonic()
+
+
+def expired() -> bool:
+    left = remaining()
+    return left is not None and left <= 0
+
+
+def allows(delay: float) -> bool:
+    """Whether waiting `delay` seconds still leaves time before the deadline."""
+    left = remaining()
+    return left is None or delay < left
+
+
+def task_timeout(timeout: Optional[int]) -> Optional[int]:
+    """Shortens the timeout of a task to the current deadline, in whole seconds."""
+    left = remaining()
+    if left is None:
+        return timeout
+    if left <= 0:
+        raise DeadlineExceeded()
+    capped = math.ceil(left)
+    return min(timeout, capped) if timeout else capped
+
+
+@dataclass(frozen=True)
+class Timeout:
+    """
+    How long to wait to connect to the Hide server, and then for each read of its
+    response, in seconds. None waits forever. Requests the server may legitimately
+    take long to answer, like `run_task`, wait for the task's own timeout on top of
+    `read`, or without one, until the task finishes.
+    """
+
+    connect: Optional[float] = DEFAULT_CONNECT_TIMEOUT
+    read: Optional[float] = DEFAULT_READ_TIMEOUT
+
+    def __post_init__(self) -> None:
+        if self.connect is not None and self.connect <= 0:
+            raise ValueError("connect timeout must be positive")
+        if self.read is not None and self.read <= 0:
+            raise ValueError("read timeout must be positive")
+
+    def limits(
+        self, wait: Optional[float] = 0.0
+    ) -> tuple[Optional[float], Optional[float]]:
+        """
+        Returns the connect and read timeouts for a request the server may take `wait`
+        more seconds to answer (None: any time), cut short by the current deadline.
+        """
+        connect = self.connect
+        read = None if self.read is None or wait is None else self.read + wait
+        left = remaining()
+        if left is None:
+            return connect, read
+        if left <= 0:
+            raise DeadlineExceeded()
+        return (
+            left if connect is None else min(connect, left),
+            left if read is None else min(read, left),
+        )
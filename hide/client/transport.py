@@ -0,0 +1,33 @@
+import requests
+from requests.adapters import HTTPAdapter
+
+DEFAULT_POOL_CONNECTIONS = 10
+DEFAULT_POOL_MAXSIZE = 10
+
+
+def create_session(
+    pool_connections: int = DEFAULT_POOL_CONNECTIONS,
+    pool_maxsize: int = DEFAULT_POOL_MAXSIZE,
+    pool_block: bool = False,
+) -> requests.Session:
+    """
+    Create a keep-alive HTTP session backed by a sized connection pool.
+
+    `pool_connections` is the number of per-host pools to keep, `pool_maxsize` is the
+    maximum number of connections kept open to a single host. With `pool_block` set,
+    callers wait for a free connection instead of opening one above the per-host limit.
+    """
+    if pool_connections <= 0:
+        raise ValueError("pool_connections must be a positive integer")
+    if pool_maxsize <= 0:
+        raise ValueError("pool_maxsize must be a positive integer")
+
+    adapter = HTTPAdapter(
+        pool_connections=pool_connections,
+        pool_maxsize=pool_maxsize,
+        pool_block=pool_block,
+    )
+    session = requests.Session()
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
@@ -12,3 +12,4 @@ from .model import (
     UserEnvProbe,
     WaitFor,
 )
+from .loader import load_devcontainer
@@ -0,0 +1,44 @@
+"""
+Loading of `devcontainer.json` files. These are JSON with comments, and often
+trailing commas, so they are parsed with pyjson5, a native JSON5 parser.
+"""
+
+import functools
+import os
+from pathlib import Path
+from typing import Union
+
+import pyjson5
+
+from hide.devcontainer.model import DevContainerRoot
+
+DEFAULT_CACHE_SIZE = 256
+
+_BOM = b"\xef\xbb\xbf"
+
+
+def load_devcontainer(
+    source: Union[str, os.PathLike, bytes, bytearray, memoryview],
+) -> DevContainerRoot:
+    """
+    Parses and validates a `devcontainer.json`, given its path or its content.
+
+    Configs are cached by content as plain JSON, so loading the same config again
+    skips the JSON5 parse. The cached JSON is still validated on every call, to
+    return a new config that the caller is free to modify.
+    """
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        content = bytes(source)
+    else:
+        content = Path(source).read_bytes()
+    return DevContainerRoot.model_validate_json(_load(content.removeprefix(_BOM)))
+
+
+@functools.lru_cache(maxsize=DEFAULT_CACHE_SIZE)
+def _load(content: bytes) -> str:
+    """The validated config as plain JSON, which cannot be modified once cached."""
+    try:
+        data = pyjson5.decode_buffer(content)
+    except pyjson5.Json5Exception as e:
+        raise ValueError(f"Invalid devcontainer.json: {e.message}") from e
+    return DevContainerRoot.model_validate(data).model_dump_json(exclude_unset=True)
@@ -1,6 +1,6 @@
 from enum import Enum
 from typing import Annotated, List, Union, Optional, Dict, Any, Mapping
-from pydantic import BaseModel, Field, RootModel
+from pydantic import BaseModel, Discriminator, Field, RootModel, Tag
 
 LifeCycleCommand = Union[str, List[str], Mapping[str, Union[str, List[str]]]]
 
@@ -287,7 +287,38 @@ class ImageDevContainer(ImageContainer, NonComposeBase, DevContainerCommon):
 class ComposeDevContainer(ComposeContainer, DevContainerCommon):
     pass
 
-DevContainer = Union[DockerfileDevContainer, ImageDevContainer, ComposeDevContainer]
+_KINDS = ("dockerComposeFile", "dockerfile", "image")
+
+
+def _devcontainer_kind(value: Any) -> Optional[str]:
+    """
+    Picks the kind of dev container from the field naming its source, so that only
+    that variant is validated. A compose file takes precedence, then a Dockerfile.
+    """
+    for key in _KINDS:
+        if isinstance(value, dict):
+            source = value.get(key)
+        else:
+            source = getattr(value, key, None)
+        if source is not None:
+            return key
+    return None
+
+
+DevContainer = Annotated[
+    Union[
+        Annotated[DockerfileDevContainer, Tag("dockerfile")],
+        Annotated[ImageDevContainer, Tag("image")],
+        Annotated[ComposeDevContainer, Tag("dockerComposeFile")],
+    ],
+    Discriminator(
+        _devcontainer_kind,
+        custom_error_type="devcontainer_kind",
+        custom_error_message=(
+            "A dev container needs a dockerfile, an image or a dockerComposeFile"
+        ),
+    ),
+]
 
 class DevContainerRoot(RootModel):
     root: DevContainer = Field(
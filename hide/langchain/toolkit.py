@@ -1,10 +1,15 @@
-from typing import Optional
+from typing import Optional, Union
 
-from langchain_community.agent_toolkits.base import BaseToolkit
-from langchain_core.pydantic_v1 import BaseModel, Field
-from langchain_core.tools import BaseTool, tool
+try:
+    from langchain_community.agent_toolkits.base import BaseToolkit
+    from langchain_core.pydantic_v1 import BaseModel, Field
+    from langchain_core.tools import BaseTool, tool
+except ImportError as e:
+    raise ImportError(
+        "The LangChain integration requires langchain. Install it with `pip install hide-py[langchain]`."
+    ) from e
 
-from hide.toolkit import Toolkit
+from hide.toolkit import AsyncToolkit, Toolkit
 
 
 class RunTaskArgs(BaseModel):
@@ -20,11 +25,16 @@ class FileArgs(BaseModel):
 
 
 class LangchainToolkit(BaseToolkit):
-    toolkit: Toolkit = Field(..., description="The Hide toolkit to use.")
+    toolkit: Union[Toolkit, AsyncToolkit] = Field(
+        ..., description="The Hide toolkit to use."
+    )
 
     class Config:
         arbitrary_types_allowed = True
 
     def get_tools(self) -> list[BaseTool]:
-        """Get the Langchain-compatible tools."""
+        """
+        Get the Langchain-compatible tools. Tools of an `AsyncToolkit` are coroutines
+        and should be called with `ainvoke`.
+        """
         return list(map(lambda _tool: tool(_tool), self.toolkit.get_tools()))
@@ -1,9 +1,48 @@
+from array import array
+from bisect import bisect_left, insort
 from enum import Enum, IntEnum
-from typing import List, Optional, Union
-
-from pydantic import AliasChoices, BaseModel, ConfigDict, Field
-
-from hide.devcontainer.model import DevContainer
+from itertools import accumulate, chain, count
+from operator import add
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Union,
+    overload,
+)
+
+from pydantic import (
+    AliasChoices,
+    BaseModel,
+    ConfigDict,
+    Field,
+    GetCoreSchemaHandler,
+    GetJsonSchemaHandler,
+    TypeAdapter,
+)
+from pydantic_core import core_schema
+
+if TYPE_CHECKING:
+    from hide.devcontainer.model import DevContainer
+else:
+
+    class DevContainer:
+        """
+        Stands in for `hide.devcontainer.model.DevContainer`, whose large schema is
+        only imported and built once a `CreateProjectRequest` is first used.
+        """
+
+        @classmethod
+        def __get_pydantic_core_schema__(
+            cls, source: Any, handler: GetCoreSchemaHandler
+        ) -> core_schema.CoreSchema:
+            from hide.devcontainer.model import DevContainer
+
+            return handler(DevContainer)
 
 UpperLeftCorner = "\u250C"
 UpperRightCorner = "\u2510"
@@ -89,119 +128,454 @@ class Line(BaseModel):
     content: str = Field(..., description="The content of the line.")
 
 
-class File(BaseModel):
-    path: FilePath = Field(..., description="The path of the file.")
-    lines: list[Line] = Field(default_factory=list)
-    diagnostics: List[Diagnostic] = Field(default_factory=list)
+class _LineView(Line):
+    """A line read from `Lines`, which cannot be changed in place."""
+
+    model_config = ConfigDict(frozen=True)
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, Line):
+            return self.number == other.number and self.content == other.content
+        return NotImplemented
+
+    def __hash__(self) -> int:
+        return hash((self.number, self.content))
+
+    def __repr_name__(self) -> str:
+        return "Line"
+
+
+class Lines(Sequence[Line]):
+    """
+    Immutable sequence of file lines stored as one text buffer plus an index of line
+    offsets. Line numbers are implicit while they are consecutive and only stored
+    per line otherwise (e.g. for search results). `Line` objects are created on
+    access and are frozen: changing them raises instead of changing the file.
+    """
+
+    __slots__ = ("_text", "_offsets", "_first", "_numbers")
+
+    def __init__(
+        self,
+        text: str = "",
+        offsets: Optional[array] = None,
+        first: int = 1,
+        numbers: Optional[array] = None,
+    ) -> None:
+        # `text` holds every line followed by "\n"; line i spans
+        # text[offsets[i]:offsets[i + 1] - 1].
+        self._text = text
+        self._offsets = offsets if offsets is not None else array("q", [0])
+        self._first = first
+        self._numbers = numbers
 
     @classmethod
-    def from_content(cls, path: str, content: str) -> "File":
-        return cls(
-            path=path,
-            lines=[
-                Line(number=idx + 1, content=line)
-                for idx, line in enumerate(content.splitlines())
-            ],
+    def from_contents(
+        cls, contents: Sequence[str], numbers: Optional[Iterable[int]] = None
+    ) -> "Lines":
+        """Numbers default to consecutive numbers starting at 1."""
+        text = "\n".join(contents) + "\n" if contents else ""
+        offsets = array(
+            "q", map(add, accumulate(map(len, contents), initial=0), count())
         )
+        if numbers is None:
+            return cls(text, offsets)
 
-    def content(self) -> str:
-        return "\n".join([line.content for line in self.lines]) + "\n"
+        numbers = array("q", numbers)
+        if len(numbers) != len(contents):
+            raise ValueError("Every line must have a number")
 
-    def insert_lines(self, start_line: int, content: str) -> "File":
-        new_lines = content.splitlines()
+        first = numbers[0] if numbers else 1
+        if numbers == array("q", range(first, first + len(numbers))):
+            return cls(text, offsets, first)
+        return cls(text, offsets, first, numbers)
 
-        for idx, line in enumerate(new_lines):
-            line_num = start_line + idx
-            line_idx = line_num - 1
-            self.lines.insert(line_idx, Line(number=line_num, content=line))
+    @classmethod
+    def from_text(cls, text: str) -> "Lines":
+        return cls.from_contents(text.splitlines())
+
+    @property
+    def text(self) -> str:
+        """The lines joined with and terminated by newlines."""
+        return self._text
+
+    def number(self, index: int) -> int:
+        if self._numbers is not None:
+            return self._numbers[index]
+        if index < 0:
+            index += len(self)
+        return self._first + index
+
+    def content(self, index: int) -> str:
+        if index < 0:
+            index += len(self)
+        return self._text[self._offsets[index] : self._offsets[index + 1] - 1]
+
+    def numbers(self) -> Iterable[int]:
+        if self._numbers is not None:
+            return self._numbers
+        return range(self._first, self._first + len(self))
+
+    def contents(self) -> list[str]:
+        contents = self._text.split("\n")[:-1] if self._text else []
+        if len(contents) != len(self):
+            # Some line contains a newline itself.
+            return [self.content(i) for i in range(len(self))]
+        return contents
+
+    def index_of(self, number: int) -> int:
+        """The position of the line numbered `number`, or where it would be inserted."""
+        if self._numbers is not None:
+            return bisect_left(self._numbers, number)
+        return min(max(number - self._first, 0), len(self))
+
+    def splice(self, edits: Iterable[tuple[int, int, Sequence[str]]]) -> "Lines":
+        """
+        Returns new lines where each `(start, end, contents)` edit replaces the lines
+        at positions [start, end) with `contents`. Edits must be sorted and must not
+        overlap. The buffer is copied once, however many edits there are.
+        """
+        text, offsets, numbers = self._text, self._offsets, self._numbers
+        size = len(self)
+        pieces: list[str] = []
+        new_offsets = array("q")
+        new_numbers = array("q")
+        position = delta = length = 0
+
+        # A final empty edit at the end copies the tail.
+        for start, end, contents in chain(edits, [(size, size, None)]):
+            if start < position or end < start or end > size:
+                raise ValueError("Edits must be sorted and must not overlap")
+
+            shift = length - offsets[position]
+            new_offsets.extend([offset + shift for offset in offsets[position:start]])
+            pieces.append(text[offsets[position] : offsets[start]])
+            length += offsets[start] - offsets[position]
+            if numbers is not None:
+                new_numbers.extend(
+                    [number + delta for number in numbers[position:start]]
+                )
+            if contents is None:
+                break
 
-        for line in self.lines[start_line + len(new_lines) - 1 :]:
-            line.number += len(new_lines)
+            new_offsets.extend(
+                accumulate((len(line) + 1 for line in contents[:-1]), initial=length)
+                if contents
+                else ()
+            )
+            chunk = "\n".join(contents) + "\n" if contents else ""
+            pieces.append(chunk)
+            length += len(chunk)
+            if numbers is not None:
+                first = (numbers[start] if start < size else numbers[-1] + 1) + delta
+                new_numbers.extend(range(first, first + len(contents)))
+            delta += len(contents) - (end - start)
+            position = end
+
+        new_offsets.append(length)
+        return Lines(
+            "".join(pieces),
+            new_offsets,
+            self._first,
+            None if numbers is None else new_numbers,
+        )
 
-        return self
+    def __len__(self) -> int:
+        return len(self._offsets) - 1
 
-    def replace_lines(self, start_line: int, end_line: int, content: str) -> "File":
-        assert start_line < end_line, "start_line must be less than end_line"
+    @overload
+    def __getitem__(self, index: int) -> Line: ...
 
-        result = []
-        new_lines = content.splitlines()
+    @overload
+    def __getitem__(self, index: slice) -> list[Line]: ...
 
-        result.extend(self.lines[: start_line - 1])
+    def __getitem__(self, index: Union[int, slice]) -> Union[Line, list[Line]]:
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if not -len(self) <= index < len(self):
+            raise IndexError("line index out of range")
+        if index < 0:
+            index += len(self)
+        return _LineView.model_construct(
+            number=self.number(index), content=self.content(index)
+        )
 
-        for idx, line in enumerate(new_lines):
-            line_num = start_line + idx
-            result.append(Line(number=line_num, content=line))
+    def __iter__(self) -> Iterator[Line]:
+        for number, content in zip(self.numbers(), self.contents()):
+            yield _LineView.model_construct(number=number, content=content)
 
-        result.extend(self.lines[end_line - 1 :])
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, Lines):
+            return self._text == other._text and list(self.numbers()) == list(
+                other.numbers()
+            )
+        if isinstance(other, list):
+            return list(self) == other
+        return NotImplemented
 
-        for line in result[start_line + len(new_lines) - 1 :]:
-            line.number += len(new_lines) - (end_line - start_line)
+    def __repr__(self) -> str:
+        return f"Lines({list(self)!r})"
 
-        self.lines = result
+    def __copy__(self) -> "Lines":
         return self
 
-    def append_lines(self, content: str) -> "File":
-        new_lines = content.splitlines()
-        last_line = self.lines[-1] if self.lines else Line(number=0, content="")
+    def __deepcopy__(self, memo: dict[int, Any]) -> "Lines":
+        return self
+
+    @classmethod
+    def _validate(cls, value: Any) -> "Lines":
+        if isinstance(value, Lines):
+            return value
+        if not isinstance(value, (list, tuple)):
+            raise ValueError("lines must be a list of lines")
+
+        numbers = array("q")
+        contents = []
+        for item in value:
+            if isinstance(item, Line):
+                number, content = item.number, item.content
+            elif isinstance(item, dict):
+                number, content = item.get("number"), item.get("content")
+            else:
+                number, content = None, None
+            if type(number) is not int or type(content) is not str:
+                # Slow path for anything that needs coercion, or fails validation.
+                line = Line.model_validate(item)
+                number, content = line.number, line.content
+            numbers.append(number)
+            contents.append(content)
+        return cls.from_contents(contents, numbers)
+
+    def _serialize(self) -> list[dict[str, Any]]:
+        return [
+            {"number": number, "content": content}
+            for number, content in zip(self.numbers(), self.contents())
+        ]
 
-        for idx, line in enumerate(new_lines):
-            line_num = last_line.number + idx + 1
-            line_idx = line_num - 1
-            self.lines.insert(line_idx, Line(number=line_num, content=line))
+    @classmethod
+    def __get_pydantic_core_schema__(
+        cls, source: Any, handler: Any
+    ) -> core_schema.CoreSchema:
+        return core_schema.no_info_plain_validator_function(
+            cls._validate,
+            serialization=core_schema.plain_serializer_function_ser_schema(
+                cls._serialize
+            ),
+        )
+
+    @classmethod
+    def __get_pydantic_json_schema__(
+        cls, schema: core_schema.CoreSchema, handler: GetJsonSchemaHandler
+    ) -> dict[str, Any]:
+        return handler(core_schema.list_schema(Line.__pydantic_core_schema__))
+
+
+class File(BaseModel):
+    """
+    A file and its lines. `lines` can be replaced, e.g. with a list of `Line`, but
+    not changed in place: `file.lines[i].content = ...` raises a `ValidationError`.
+    """
+
+    model_config = ConfigDict(validate_assignment=True)
+
+    path: FilePath = Field(..., description="The path of the file.")
+    lines: Lines = Field(default_factory=Lines)
+    diagnostics: List[Diagnostic] = Field(default_factory=list)
+
+    if TYPE_CHECKING:
+        # Lines are validated from a list of lines too.
+        def __init__(
+            self,
+            *,
+            path: FilePath,
+            lines: Union[Lines, Sequence[Union[Line, dict[str, Any]]]] = ...,
+            diagnostics: List[Diagnostic] = ...,
+        ) -> None: ...
+
+    @classmethod
+    def from_content(cls, path: str, content: str) -> "File":
+        return cls(path=path, lines=Lines.from_text(content))
+
+    def content(self) -> str:
+        return self.lines.text or "\n"
+
+    def insert_lines(self, start_line: int, content: str) -> "File":
+        return self.apply_edits(
+            [
+                LineDiffUpdate(
+                    start_line=start_line, end_line=start_line, content=content
+                )
+            ]
+        )
+
+    def replace_lines(self, start_line: int, end_line: int, content: str) -> "File":
+        assert start_line < end_line, "start_line must be less than end_line"
+
+        return self.apply_edits(
+            [LineDiffUpdate(start_line=start_line, end_line=end_line, content=content)]
+        )
+
+    def append_lines(self, content: str) -> "File":
+        end = len(self.lines)
+        self.lines = self.lines.splice([(end, end, content.splitlines())])
+        return self
 
+    def apply_edits(self, edits: Iterable["LineDiffUpdate"]) -> "File":
+        """
+        Applies many line edits in one pass over the file. Edits address lines by
+        their numbers before any edit is applied, end lines are exclusive, and
+        edits must not overlap. Insertions (`start_line == end_line`) at the same
+        line keep their order.
+        """
+        edits = sorted(edits, key=lambda edit: (edit.start_line, edit.end_line))
+        end_line = None
+        for edit in edits:
+            if edit.start_line > edit.end_line:
+                raise ValueError("start_line must not be greater than end_line")
+            if end_line is not None and edit.start_line < end_line:
+                raise ValueError("Edits must not overlap")
+            end_line = edit.end_line
+
+        self.lines = self.lines.splice(
+            (
+                self.lines.index_of(edit.start_line),
+                self.lines.index_of(edit.end_line),
+                edit.content.splitlines(),
+            )
+            for edit in edits
+        )
         return self
 
     def __str__(self) -> str:
+        return self.render()
+
+    def render(
+        self,
+        start_line: Optional[int] = None,
+        end_line: Optional[int] = None,
+        context: int = 0,
+    ) -> str:
+        """
+        Renders the file with line numbers and diagnostics. Pass `start_line` and
+        `end_line` (exclusive) to render only that range, widened by `context` lines
+        on each side. Skipped lines are marked with an ellipsis.
+        """
+        lines = self.lines
+        start = 0 if start_line is None else lines.index_of(start_line - context)
+        end = len(lines) if end_line is None else lines.index_of(end_line + context)
+        end = max(start, end)
+
         output = []
-        line_number_width = len(str(self.lines[-1].number))
+        line_number_width = len(str(lines.number(end - 1))) if end > start else 1
         prev_line = 0
+        diagnostics = _DiagnosticIndex(self.diagnostics)
 
         output.append(f"{' ' * line_number_width} {UpperLeftCorner} {self.path}")
 
-        for line in self.lines:
-            if line.number != prev_line + 1:
+        for index in range(start, end):
+            number, content = lines.number(index), lines.content(index)
+            if number != prev_line + 1:
                 output.append(
                     f"{' ' * (line_number_width - 1)}{HorizontalEllipsis} {VerticalLine} {HorizontalEllipsis}"
                 )
 
-            output.append(
-                f"{line.number:>{line_number_width}} {VerticalLine} {line.content}"
-            )
+            output.append(f"{number:>{line_number_width}} {VerticalLine} {content}")
+
+            line_index = number - 1
+            for diagnostic in diagnostics.covering(line_index):
+                # Add carets
+                start_character = (
+                    diagnostic.range.start.character
+                    if line_index == diagnostic.range.start.line
+                    else 0
+                )
+                end_character = (
+                    diagnostic.range.end.character
+                    if line_index == diagnostic.range.end.line
+                    else len(content)
+                )
 
-            for diagnostic in self.diagnostics:
-                line_index = line.number - 1
-                if (
-                    diagnostic.range.start.line
-                    <= line_index
-                    <= diagnostic.range.end.line
-                ):
-                    # Add carets
-                    start = (
-                        diagnostic.range.start.character
-                        if line_index == diagnostic.range.start.line
-                        else 0
-                    )
-                    end = (
-                        diagnostic.range.end.character
-                        if line_index == diagnostic.range.end.line
-                        else len(line.content)
-                    )
-
-                    # Add diagnostic message
-                    offset = " " * (start + line_number_width + 3)
-                    caret_line = offset + "^" * (end - start)
-
-                    severity = diagnostic.severity.name if diagnostic.severity else ""
-                    output.append(f"{caret_line} {severity}: {diagnostic.message}")
-                    output.append("")  # Add an empty line for readability
-
-            prev_line = line.number
+                # Add diagnostic message
+                offset = " " * (start_character + line_number_width + 3)
+                caret_line = offset + "^" * (end_character - start_character)
 
+                severity = diagnostic.severity.name if diagnostic.severity else ""
+                output.append(f"{caret_line} {severity}: {diagnostic.message}")
+                output.append("")  # Add an empty line for readability
+
+            prev_line = number
+
+        if end < len(lines):
+            output.append(
+                f"{' ' * (line_number_width - 1)}{HorizontalEllipsis} {VerticalLine} {HorizontalEllipsis}"
+            )
         output.append(f"{' ' * line_number_width} {LowerLeftCorner}")
 
         return "\n".join(output)
 
 
+class _DiagnosticIndex:
+    """
+    Finds the diagnostics covering a line, for lines queried in ascending order.
+    Diagnostics are sorted by their first line once and swept along with the
+    lines, so rendering a file is linear in its lines plus its diagnostics.
+    """
+
+    def __init__(self, diagnostics: list[Diagnostic]) -> None:
+        self._diagnostics = diagnostics
+        self._by_start = sorted(
+            range(len(diagnostics)),
+            key=lambda i: diagnostics[i].range.start.line,
+        )
+        self._rewind()
+
+    def _rewind(self) -> None:
+        self._next = 0
+        # Positions in `diagnostics` of those that started, in their original order.
+        self._active: list[int] = []
+        self._line = -1
+
+    def covering(self, line: int) -> list[Diagnostic]:
+        diagnostics = self._diagnostics
+        if line < self._line:
+            self._rewind()
+        self._line = line
+
+        by_start = self._by_start
+        while (
+            self._next < len(by_start)
+            and diagnostics[by_start[self._next]].range.start.line <= line
+        ):
+            insort(self._active, by_start[self._next])
+            self._next += 1
+
+        if not self._active:
+            return []
+
+        self._active = [
+            i for i in self._active if diagnostics[i].range.end.line >= line
+        ]
+        return [diagnostics[i] for i in self._active]
+
+
+class FileResult(BaseModel):
+    model_config = ConfigDict(populate_by_name=True)
+
+    path: FilePath = Field(..., description="The path of the file.")
+    start_line: Optional[int] = Field(
+        default=None, description="The first line requested.", alias="startLine"
+    )
+    num_lines: Optional[int] = Field(
+        default=None, description="The number of lines requested.", alias="numLines"
+    )
+    file: Optional[File] = Field(
+        default=None, description="The file, if it could be read."
+    )
+    error: Optional[str] = Field(
+        default=None, description="Why the file could not be read, if it could not."
+    )
+
+
 class Language(str, Enum):
     GO = "Go"
     JAVASCRIPT = "JavaScript"
@@ -210,6 +584,8 @@ class Language(str, Enum):
 
 
 class CreateProjectRequest(BaseModel):
+    model_config = ConfigDict(defer_build=True)
+
     repository: Repository = Field(
         ..., description="The repository to create the project from."
     )
@@ -238,6 +614,45 @@ class TaskResult(BaseModel):
     )
 
 
+class TaskStream(str, Enum):
+    STDOUT = "stdout"
+    STDERR = "stderr"
+
+
+class TaskOutput(BaseModel):
+    stream: TaskStream = Field(..., description="The stream the output was written to.")
+    data: str = Field(..., description="The output, as written by the command.")
+
+
+class TaskExit(BaseModel):
+    model_config = ConfigDict(populate_by_name=True)
+
+    exit_code: int = Field(
+        ..., description="The exit code of the command.", alias="exitCode"
+    )
+
+
+TaskEvent = Union[TaskOutput, TaskExit]
+
+
+class TaskStatus(str, Enum):
+    RUNNING = "running"
+    COMPLETED = "completed"
+    CANCELLED = "cancelled"
+
+
+class BackgroundTask(BaseModel):
+    id: str = Field(..., description="The ID of the task run.")
+    status: TaskStatus = Field(..., description="The status of the task run.")
+    result: Optional[TaskResult] = Field(
+        default=None, description="The result of the task, once it has completed."
+    )
+
+    @property
+    def done(self) -> bool:
+        return self.status != TaskStatus.RUNNING
+
+
 class Task(BaseModel):
     alias: str = Field(..., description="The alias of the task.")
     command: str = Field(..., description="The shell command to run the task.")
@@ -265,7 +680,7 @@ class LineDiffUpdate(BaseModel):
     )
     end_line: int = Field(
         ...,
-        description="The line number to end the diff at, inclusive.",
+        description="The line number to end the diff at, exclusive.",
         serialization_alias="endLine",
     )
     content: str = Field(..., description="The content of the diff.")
@@ -275,6 +690,38 @@ class OverwriteUpdate(BaseModel):
     content: str = Field(..., description="The new content of the file.")
 
 
+FileUpdate = Union[UdiffUpdate, LineDiffUpdate, OverwriteUpdate]
+
+
+class FileChangeType(str, Enum):
+    CREATE = "create"
+    UPDATE = "update"
+    DELETE = "delete"
+
+
+class FileChange(BaseModel):
+    type: FileChangeType = Field(..., description="The kind of change.")
+    path: FilePath = Field(..., description="The path of the file to change.")
+    content: Optional[str] = Field(
+        default=None, description="The content of a new file."
+    )
+    update: Optional[FileUpdate] = Field(
+        default=None, description="The update to apply to an existing file."
+    )
+
+
+class ChangesetResult(BaseModel):
+    files: list[File] = Field(
+        default_factory=list, description="The created and updated files."
+    )
+    deleted: list[FilePath] = Field(
+        default_factory=list, description="The paths of the deleted files."
+    )
+
+    def diagnostics(self) -> dict[FilePath, list[Diagnostic]]:
+        return {file.path: file.diagnostics for file in self.files}
+
+
 class Symbol(BaseModel):
     name: str
     kind: str
@@ -310,3 +757,12 @@ class DocumentOutline(BaseModel):
     document_symbols: list[DocumentSymbol] = Field(
         ..., description="The document symbols."
     )
+
+
+# Validators of whole list responses, built once and shared, e.g.
+# `FILE_INFO_LIST.validate_json(content)` instead of validating item by item.
+PROJECT_LIST = TypeAdapter(list[Project])
+TASK_LIST = TypeAdapter(list[Task])
+FILE_LIST = TypeAdapter(list[File])
+FILE_INFO_LIST = TypeAdapter(list[FileInfo])
+SYMBOL_LIST = TypeAdapter(list[Symbol])
@@ -1 +1,17 @@
-from .toolkit import Toolkit
+from typing import TYPE_CHECKING
+
+from hide._lazy import lazy_attributes
+
+if TYPE_CHECKING:
+    from .async_toolkit import AsyncToolkit
+    from .toolkit import Toolkit
+
+__all__ = ["AsyncToolkit", "Toolkit"]
+
+__getattr__, __dir__ = lazy_attributes(
+    __name__,
+    {
+        "AsyncToolkit": (".async_toolkit", "AsyncToolkit"),
+        "Toolkit": (".toolkit", "Toolkit"),
+    },
+)
@@ -0,0 +1,303 @@
+import functools
+import json
+from typing import TYPE_CHECKING, Any, Callable, Coroutine, Optional, TypeVar
+
+from hide.client.async_hide_client import AsyncHideClient
+from hide.client.task_handle import AsyncTaskHandle
+from hide.client.timeouts import deadline
+from hide.model import (
+    BackgroundTask,
+    FileResult,
+    LineDiffUpdate,
+    Project,
+    TaskResult,
+    TaskStatus,
+    UdiffUpdate,
+)
+
+if TYPE_CHECKING:
+    from hide.langchain.toolkit import LangchainToolkit
+
+Tool = TypeVar("Tool", bound=Callable[..., Coroutine[Any, Any, str]])
+
+
+def _tool(tool: Tool) -> Tool:
+    """Runs the tool within the toolkit's deadline, in a span named after it."""
+
+    @functools.wraps(tool)
+    async def wrapper(self: "AsyncToolkit", *args, **kwargs) -> str:
+        with deadline(self.deadline), self.client.span(
+            f"tool.{tool.__name__}", project_id=self.project.id
+        ):
+            return await tool(self, *args, **kwargs)
+
+    return wrapper  # type: ignore[return-value]
+
+
+class AsyncToolkit:
+    """
+    Coroutine counterpart of `Toolkit`. Tools have the same names, arguments and
+    descriptions, so agents see the same toolset whichever variant backs it.
+    """
+
+    def __init__(
+        self,
+        project: Project,
+        client: AsyncHideClient,
+        deadline: Optional[float] = None,
+    ) -> None:
+        self.project = project
+        self.client = client
+        self.deadline = deadline
+
+    @_tool
+    async def get_tasks(self) -> str:
+        """Get the available tasks and their aliases in the project."""
+        try:
+            tasks = await self.client.get_tasks(self.project.id)
+            return json.dumps([task.model_dump() for task in tasks])
+        except Exception as e:
+            return f"Failed to get tasks: {e}"
+
+    @_tool
+    async def run_task(
+        self,
+        command: Optional[str] = None,
+        alias: Optional[str] = None,
+        timeout: Optional[int] = None,
+    ) -> str:
+        """
+        Run a task in the project. Provide either command or alias. Set timeout in seconds. Command will be executed in the shell.
+        For the list of available tasks and their aliases, use the `get_tasks` tool.
+        """
+        try:
+            result = await self.client.run_task(
+                project_id=self.project.id,
+                command=command,
+                alias=alias,
+                timeout=timeout,
+            )
+            return _format_result(result)
+        except Exception as e:
+            return f"Failed to run task: {e}"
+
+    @_tool
+    async def start_task(
+        self,
+        command: Optional[str] = None,
+        alias: Optional[str] = None,
+        timeout: Optional[int] = None,
+    ) -> str:
+        """
+        Start a task in the background and return its ID without waiting for it to finish, e.g. to edit files while a build runs.
+        Provide either command or alias. Set timeout in seconds. Use `wait_for_task` to get the result.
+        """
+        try:
+            handle = await self.client.start_task(
+                project_id=self.project.id,
+                command=command,
+                alias=alias,
+                timeout=timeout,
+            )
+            return f"Task started: {handle.id}"
+        except Exception as e:
+            return f"Failed to start task: {e}"
+
+    @_tool
+    async def get_task_status(self, task_id: str) -> str:
+        """Get the status of a background task, and its result if it has finished."""
+        try:
+            task = await self.client.get_background_task(
+                project_id=self.project.id, task_id=task_id
+            )
+            if task.result is None:
+                return f"Task {task_id} is {task.status.value}"
+            return _format_result(task.result)
+        except Exception as e:
+            return f"Failed to get task status: {e}"
+
+    @_tool
+    async def wait_for_task(self, task_id: str, timeout: Optional[int] = None) -> str:
+        """
+        Wait for a background task to finish and get its result.
+        Set timeout in seconds to stop waiting; the task keeps running.
+        """
+        try:
+            handle = AsyncTaskHandle(
+                self.client,
+                self.project.id,
+                BackgroundTask(id=task_id, status=TaskStatus.RUNNING),
+            )
+            return _format_result(await handle.wait(timeout=timeout))
+        except Exception as e:
+            return f"Failed to wait for task: {e}"
+
+    @_tool
+    async def cancel_task(self, task_id: str) -> str:
+        """Cancel a background task."""
+        try:
+            task = await self.client.cancel_task(
+                project_id=self.project.id, task_id=task_id
+            )
+            if task.status == TaskStatus.CANCELLED:
+                return f"Task cancelled: {task_id}"
+            return f"Task {task_id} already finished"
+        except Exception as e:
+            return f"Failed to cancel task: {e}"
+
+    @_tool
+    async def create_file(self, path: str, content: str) -> str:
+        """Create a file in the project."""
+        try:
+            file = await self.client.create_file(
+                project_id=self.project.id, path=path, content=content
+            )
+            return f"File created:\n{file}"
+        except Exception as e:
+            return f"Failed to create file: {e}"
+
+    @_tool
+    async def apply_patch(self, path: str, patch: str) -> str:
+        """Apply a patch to a file in the project. Patch must be in the unified diff format."""
+        try:
+            file = await self.client.update_file(
+                project_id=self.project.id,
+                path=path,
+                update=UdiffUpdate(patch=patch),
+            )
+            return f"File updated:\n{file}"
+        except Exception as e:
+            return f"Failed to apply patch: {e}"
+
+    @_tool
+    async def insert_lines(self, path: str, start_line: int, content: str) -> str:
+        """Insert lines in a project file. Lines are 1-indexed."""
+        try:
+            file = await self.client.update_file(
+                project_id=self.project.id,
+                path=path,
+                update=LineDiffUpdate(
+                    start_line=start_line, end_line=start_line, content=content
+                ),
+            )
+            return f"File updated:\n{file}"
+        except Exception as e:
+            return f"Failed to insert lines: {e}"
+
+    @_tool
+    async def replace_lines(
+        self, path: str, start_line: int, end_line: int, content: str
+    ) -> str:
+        """
+        Replace lines in a project file. Lines are 1-indexed.
+        start_line is inclusive. end_line is exclusive.
+        """
+        try:
+            file = await self.client.update_file(
+                project_id=self.project.id,
+                path=path,
+                update=LineDiffUpdate(
+                    start_line=start_line, end_line=end_line, content=content
+                ),
+            )
+            return f"File updated:\n{file}"
+        except Exception as e:
+            return f"Failed to replace lines: {e}"
+
+    @_tool
+    async def append_lines(self, path: str, content: str) -> str:
+        """Append lines to a file in the project."""
+        try:
+            # The file length is needed to address the end of the file, but only the
+            # appended lines are sent back.
+            file = await self.client.get_file(project_id=self.project.id, path=path)
+            end_line = file.lines[-1].number + 1 if file.lines else 1
+            file = await self.client.update_file(
+                project_id=self.project.id,
+                path=path,
+                update=LineDiffUpdate(
+                    start_line=end_line, end_line=end_line, content=content
+                ),
+            )
+            return f"File updated:\n{file}"
+        except Exception as e:
+            return f"Failed to append lines: {e}"
+
+    @_tool
+    async def get_file(self, path: str) -> str:
+        """Get a file from the project."""
+        try:
+            file = await self.client.get_file(project_id=self.project.id, path=path)
+            return f"{file}"
+        except Exception as e:
+            return f"Failed to get file: {e}"
+
+    @_tool
+    async def get_files(self, paths: list[str]) -> str:
+        """Get several files from the project at once."""
+        try:
+            outputs = []
+            async for result in self.client.get_files(
+                project_id=self.project.id, paths=paths
+            ):
+                outputs.append(_format_file_result(result))
+            return "\n\n".join(outputs)
+        except Exception as e:
+            return f"Failed to get files: {e}"
+
+    @_tool
+    async def delete_file(self, path: str) -> str:
+        """Delete a file from the project."""
+        try:
+            deleted = await self.client.delete_file(
+                project_id=self.project.id, file=path
+            )
+            return (
+                f"File deleted: {path}" if deleted else f"Failed to delete file: {path}"
+            )
+        except Exception as e:
+            return f"Failed to delete file: {e}"
+
+    @_tool
+    async def list_files(self) -> str:
+        """List files in the project."""
+        try:
+            files = await self.client.list_files(project_id=self.project.id)
+            return "\n".join([file.path for file in files])
+        except Exception as e:
+            return f"Failed to list files: {e}"
+
+    def get_tools(self) -> list[Callable[..., Coroutine[Any, Any, str]]]:
+        return [
+            self.append_lines,
+            self.apply_patch,
+            self.cancel_task,
+            self.create_file,
+            self.delete_file,
+            self.get_file,
+            self.get_files,
+            self.get_task_status,
+            self.get_tasks,
+            self.insert_lines,
+            self.list_files,
+            self.replace_lines,
+            self.run_task,
+            self.start_task,
+            self.wait_for_task,
+        ]
+
+    def as_langchain(self) -> "LangchainToolkit":
+        """Requires the `langchain` extra, e.g. `pip install hide-py[langchain]`."""
+        from hide.langchain.toolkit import LangchainToolkit
+
+        return LangchainToolkit(toolkit=self)
+
+
+def _format_result(result: TaskResult) -> str:
+    return f"exit code: {result.exit_code}\nstdout: {result.stdout}\nstderr: {result.stderr}"
+
+
+def _format_file_result(result: FileResult) -> str:
+    if result.file is None:
+        return f"Failed to get file {result.path}: {result.error}"
+    return f"{result.file}"
@@ -1,15 +1,53 @@
+import functools
 import json
-from typing import Callable, Optional
+from typing import TYPE_CHECKING, Callable, Optional, TypeVar
 
 from hide.client.hide_client import HideClient
-from hide.model import OverwriteUpdate, Project, UdiffUpdate
+from hide.client.task_handle import TaskHandle
+from hide.client.timeouts import deadline
+from hide.model import (
+    BackgroundTask,
+    FileResult,
+    LineDiffUpdate,
+    Project,
+    TaskResult,
+    TaskStatus,
+    UdiffUpdate,
+)
+
+if TYPE_CHECKING:
+    from hide.langchain.toolkit import LangchainToolkit
+
+Tool = TypeVar("Tool", bound=Callable[..., str])
+
+
+def _tool(tool: Tool) -> Tool:
+    """Runs the tool within the toolkit's deadline, in a span named after it."""
+
+    @functools.wraps(tool)
+    def wrapper(self: "Toolkit", *args, **kwargs) -> str:
+        with deadline(self.deadline), self.client.span(
+            f"tool.{tool.__name__}", project_id=self.project.id
+        ):
+            return tool(self, *args, **kwargs)
+
+    return wrapper  # type: ignore[return-value]
 
 
 class Toolkit:
-    def __init__(self, project: Project, client: HideClient) -> None:
+    def __init__(
+        self, project: Project, client: HideClient, deadline: Optional[float] = None
+    ) -> None:
+        """
+        Each tool call fails once it has taken `deadline` seconds, or when the
+        deadline of the caller passes, whichever comes first. Tool calls are reported
+        to the hooks of the client as spans named "tool.<name>".
+        """
         self.project = project
         self.client = client
+        self.deadline = deadline
 
+    @_tool
     def get_tasks(self) -> str:
         """Get the available tasks and their aliases in the project."""
         try:
@@ -18,6 +56,7 @@ class Toolkit:
         except Exception as e:
             return f"Failed to get tasks: {e}"
 
+    @_tool
     def run_task(
         self,
         command: Optional[str] = None,
@@ -32,10 +71,73 @@ class Toolkit:
             result = self.client.run_task(
                 project_id=self.project.id, command=command, alias=alias, timeout=timeout
             )
-            return f"exit code: {result.exit_code}\nstdout: {result.stdout}\nstderr: {result.stderr}"
+            return _format_result(result)
         except Exception as e:
             return f"Failed to run task: {e}"
 
+    @_tool
+    def start_task(
+        self,
+        command: Optional[str] = None,
+        alias: Optional[str] = None,
+        timeout: Optional[int] = None,
+    ) -> str:
+        """
+        Start a task in the background and return its ID without waiting for it to finish, e.g. to edit files while a build runs.
+        Provide either command or alias. Set timeout in seconds. Use `wait_for_task` to get the result.
+        """
+        try:
+            handle = self.client.start_task(
+                project_id=self.project.id,
+                command=command,
+                alias=alias,
+                timeout=timeout,
+            )
+            return f"Task started: {handle.id}"
+        except Exception as e:
+            return f"Failed to start task: {e}"
+
+    @_tool
+    def get_task_status(self, task_id: str) -> str:
+        """Get the status of a background task, and its result if it has finished."""
+        try:
+            task = self.client.get_background_task(
+                project_id=self.project.id, task_id=task_id
+            )
+            if task.result is None:
+                return f"Task {task_id} is {task.status.value}"
+            return _format_result(task.result)
+        except Exception as e:
+            return f"Failed to get task status: {e}"
+
+    @_tool
+    def wait_for_task(self, task_id: str, timeout: Optional[int] = None) -> str:
+        """
+        Wait for a background task to finish and get its result.
+        Set timeout in seconds to stop waiting; the task keeps running.
+        """
+        try:
+            handle = TaskHandle(
+                self.client,
+                self.project.id,
+                BackgroundTask(id=task_id, status=TaskStatus.RUNNING),
+            )
+            return _format_result(handle.wait(timeout=timeout))
+        except Exception as e:
+            return f"Failed to wait for task: {e}"
+
+    @_tool
+    def cancel_task(self, task_id: str) -> str:
+        """Cancel a background task."""
+        try:
+            task = self.client.cancel_task(project_id=self.project.id, task_id=task_id)
+            if task.status == TaskStatus.CANCELLED:
+                return f"Task cancelled: {task_id}"
+            return f"Task {task_id} already finished"
+        except Exception as e:
+            return f"Failed to cancel task: {e}"
+
+    @_tool
     def create_file(self, path: str, content: str) -> str:
         """Create a file in the project."""
         try:
@@ -46,6 +148,7 @@ class Toolkit:
         except Exception as e:
             return f"Failed to create file: {e}"
 
+    @_tool
     def apply_patch(self, path: str, patch: str) -> str:
         """Apply a patch to a file in the project. Patch must be in the unified diff format."""
         try:
@@ -58,20 +161,22 @@ class Toolkit:
         except Exception as e:
             return f"Failed to apply patch: {e}"
 
+    @_tool
     def insert_lines(self, path: str, start_line: int, content: str) -> str:
         """Insert lines in a project file. Lines are 1-indexed."""
         try:
-            file = self.client.get_file(project_id=self.project.id, path=path)
-            file = file.insert_lines(start_line, content)
             file = self.client.update_file(
                 project_id=self.project.id,
-                path=file.path,
-                update=OverwriteUpdate(content=file.content()),
+                path=path,
+                update=LineDiffUpdate(
+                    start_line=start_line, end_line=start_line, content=content
+                ),
             )
             return f"File updated:\n{file}"
         except Exception as e:
             return f"Failed to insert lines: {e}"
 
+    @_tool
     def replace_lines(
         self, path: str, start_line: int, end_line: int, content: str
     ) -> str:
@@ -80,31 +185,37 @@ class Toolkit:
         start_line is inclusive. end_line is exclusive.
         """
         try:
-            file = self.client.get_file(project_id=self.project.id, path=path)
-            file = file.replace_lines(start_line, end_line, content)
             file = self.client.update_file(
                 project_id=self.project.id,
-                path=file.path,
-                update=OverwriteUpdate(content=file.content()),
+                path=path,
+                update=LineDiffUpdate(
+                    start_line=start_line, end_line=end_line, content=content
+                ),
             )
             return f"File updated:\n{file}"
         except Exception as e:
             return f"Failed to replace lines: {e}"
 
+    @_tool
     def append_lines(self, path: str, content: str) -> str:
         """Append lines to a file in the project."""
         try:
+            # The file length is needed to address the end of the file, but only the
+            # appended lines are sent back.
             file = self.client.get_file(project_id=self.project.id, path=path)
-            file = file.append_lines(content)
+            end_line = file.lines[-1].number + 1 if file.lines else 1
             file = self.client.update_file(
                 project_id=self.project.id,
-                path=file.path,
-                update=OverwriteUpdate(content=file.content()),
+                path=path,
+                update=LineDiffUpdate(
+                    start_line=end_line, end_line=end_line, content=content
+                ),
             )
             return f"File updated:\n{file}"
         except Exception as e:
             return f"Failed to append lines: {e}"
 
+    @_tool
     def get_file(self, path: str) -> str:
         """Get a file from the project."""
         try:
@@ -113,6 +224,16 @@ class Toolkit:
         except Exception as e:
             return f"Failed to get file: {e}"
 
+    @_tool
+    def get_files(self, paths: list[str]) -> str:
+        """Get several files from the project at once."""
+        try:
+            results = self.client.get_files(project_id=self.project.id, paths=paths)
+            return "\n\n".join(_format_file_result(result) for result in results)
+        except Exception as e:
+            return f"Failed to get files: {e}"
+
+    @_tool
     def delete_file(self, path: str) -> str:
         """Delete a file from the project."""
         try:
@@ -123,6 +244,7 @@ class Toolkit:
         except Exception as e:
             return f"Failed to delete file: {e}"
 
+    @_tool
     def list_files(self) -> str:
         """List files in the project."""
         try:
@@ -135,17 +257,33 @@ class Toolkit:
         return [
             self.append_lines,
             self.apply_patch,
+            self.cancel_task,
             self.create_file,
             self.delete_file,
             self.get_file,
+            self.get_files,
+            self.get_task_status,
             self.get_tasks,
             self.insert_lines,
             self.list_files,
             self.replace_lines,
             self.run_task,
+            self.start_task,
+            self.wait_for_task,
         ]
 
     def as_langchain(self) -> "LangchainToolkit":
+        """Requires the `langchain` extra, e.g. `pip install hide-py[langchain]`."""
         from hide.langchain.toolkit import LangchainToolkit
 
         return LangchainToolkit(toolkit=self)
+
+
+def _format_result(result: TaskResult) -> str:
+    return f"exit code: {result.exit_code}\nstdout: {result.stdout}\nstderr: {result.stderr}"
+
+
+def _format_file_result(result: FileResult) -> str:
+    if result.file is None:
+        return f"Failed to get file {result.path}: {result.error}"
+    return f"{result.file}"
@@ -0,0 +1,9 @@
+import pytest
+
+from tests.fake_server import FakeHideServer
+
+
+@pytest.fixture
+def fake_server():
+    with FakeHideServer() as server:
+        yield server
@@ -0,0 +1,475 @@
+import hashlib
+import json
+import socket
+import threading
+import time
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Optional
+from urllib.parse import parse_qs, unquote, urlparse
+
+
+@dataclass
+class FakeProject:
+    id: str
+    repository: dict[str, Any]
+    tasks: list[dict[str, str]] = field(default_factory=list)
+    files: dict[str, str] = field(default_factory=dict)
+    symbols: list[dict[str, Any]] = field(default_factory=list)
+    outlines: dict[str, list[dict[str, Any]]] = field(default_factory=dict)
+    background_tasks: dict[str, dict[str, Any]] = field(default_factory=dict)
+
+
+class FakeHideServer:
+    """
+    In-memory stand-in for the Hide server, listening on a local port.
+
+    Tasks are not executed: running a task echoes the command (or the command behind
+    the alias) to stdout with exit code 0. Streamed tasks send each line of the
+    command as a separate `stdout` event. Background tasks complete when their status
+    is first checked, except for `sleep` commands, which run until cancelled. Without
+    `batch_reads` or `changesets`, the batch file or changeset endpoint is missing,
+    like on older servers. With `etags` set, successful GET responses
+    carry an `ETag` and are answered with `304 Not Modified` when it still matches.
+    Every request takes at least `latency` seconds; the most requests handled at once
+    is kept in `max_in_flight`.
+    """
+
+    def __init__(
+        self,
+        etags: bool = False,
+        batch_reads: bool = True,
+        changesets: bool = True,
+        latency: float = 0.0,
+    ) -> None:
+        self.etags = etags
+        self.batch_reads = batch_reads
+        self.changesets = changesets
+        self.latency = latency
+        self.projects: dict[str, FakeProject] = {}
+        self.requests: list[tuple[str, str]] = []
+        self.connections = 0
+        self.bytes_received = 0
+        self.bytes_sent = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._failures: list[tuple[Optional[int], dict[str, str]]] = []
+        self._lock = threading.Lock()
+        self._next_id = 1
+        self._httpd = ThreadingHTTPServer(("127.0.0.1", 0), _handler(self))
+        self._httpd.daemon_threads = True
+        self._thread = threading.Thread(
+            target=self._httpd.serve_forever,
+            kwargs={"poll_interval": 0.05},
+            daemon=True,
+        )
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "FakeHideServer":
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def __enter__(self) -> "FakeHideServer":
+        return self.start()
+
+    def __exit__(self, *args: Any) -> None:
+        self.stop()
+
+    def fail_next(
+        self,
+        times: int = 1,
+        status: Optional[int] = 503,
+        headers: Optional[dict[str, str]] = None,
+    ) -> None:
+        """
+        Answers the next `times` requests with `status`, or drops their connection
+        if `status` is None.
+        """
+        with self._lock:
+            self._failures.extend([(status, headers or {})] * times)
+
+    def add_project(self, repository: Optional[dict[str, Any]] = None) -> FakeProject:
+        with self._lock:
+            project_id = str(self._next_id)
+            self._next_id += 1
+        project = FakeProject(
+            id=project_id,
+            repository=repository or {"url": "http://example.com/repo.git"},
+        )
+        self.projects[project_id] = project
+        return project
+
+    def handle(
+        self,
+        method: str,
+        path: str,
+        query: dict[str, list[str]],
+        body: Any,
+        headers: Any,
+    ) -> tuple[int, Any, str]:
+        """Returns a status code, a body and its content type."""
+        parts = [unquote(part) for part in path.strip("/").split("/")]
+
+        if parts == ["projects"]:
+            if method == "GET":
+                return 200, [_project_json(p) for p in self.projects.values()], "json"
+            if method == "POST":
+                return 201, _project_json(self.add_project(body["repository"])), "json"
+
+        if len(parts) < 2 or parts[0] != "projects" or parts[1] not in self.projects:
+            return 404, "project not found", "text"
+
+        project = self.projects[parts[1]]
+        resource = parts[2] if len(parts) > 2 else None
+        rest = "/".join(parts[3:])
+
+        match (method, resource):
+            case ("GET", None):
+                return 200, _project_json(project), "json"
+            case ("DELETE", None):
+                del self.projects[project.id]
+                return 204, None, "text"
+            case ("GET", "tasks") if not rest:
+                return 200, project.tasks, "json"
+            case ("GET", "tasks") | ("DELETE", "tasks"):
+                return self._check_background_task(project, rest, method == "DELETE")
+            case ("POST", "tasks"):
+                status, result, content_type = self._run_task(project, body)
+                if status == 200 and body.get("background"):
+                    return self._start_background_task(project, body, result)
+                if status != 200 or headers.get("Accept") != "text/event-stream":
+                    return status, result, content_type
+                events = [
+                    ("stdout", line) for line in result["stdout"].splitlines(True)
+                ]
+                exit = ("exit", json.dumps({"exitCode": result["exitCode"]}))
+                return 200, events + [exit], "sse"
+            case ("POST", "files") if rest == "batch":
+                if not self.batch_reads:
+                    return 404, "not found", "text"
+                return (
+                    200,
+                    {"files": [_read(project, r) for r in body["files"]]},
+                    "json",
+                )
+            case ("POST", "changesets") if self.changesets:
+                return self._apply_changeset(project, body["changes"])
+            case ("POST", "files"):
+                project.files[body["path"]] = body["content"]
+                return 201, _file_json(body["path"], body["content"]), "json"
+            case ("GET", "files") if not rest:
+                if headers.get("Accept") == "text/plain":
+                    return 200, "\n".join(sorted(project.files)), "text"
+                return 200, [{"path": path} for path in sorted(project.files)], "json"
+            case ("GET", "files"):
+                if rest not in project.files:
+                    return 404, "file not found", "text"
+                start_line = int(query.get("startLine", ["1"])[0])
+                num_lines = query.get("numLines")
+                return (
+                    200,
+                    _file_json(
+                        rest,
+                        project.files[rest],
+                        start_line,
+                        int(num_lines[0]) if num_lines else None,
+                    ),
+                    "json",
+                )
+            case ("PUT", "files"):
+                if rest not in project.files:
+                    return 404, "file not found", "text"
+                project.files[rest] = _apply_update(project.files[rest], body)
+                return 200, _file_json(rest, project.files[rest]), "json"
+            case ("DELETE", "files"):
+                if project.files.pop(rest, None) is None:
+                    return 404, "file not found", "text"
+                return 204, None, "text"
+            case ("GET", "search"):
+                return self._search(project, query)
+            case ("GET", "outline"):
+                return (
+                    200,
+                    {"path": rest, "document_symbols": project.outlines.get(rest, [])},
+                    "json",
+                )
+
+        return 404, "not found", "text"
+
+    def _run_task(
+        self, project: FakeProject, body: dict[str, Any]
+    ) -> tuple[int, Any, str]:
+        command = body.get("command")
+        if "alias" in body:
+            task = next((t for t in project.tasks if t["alias"] == body["alias"]), None)
+            if task is None:
+                return 404, "task not found", "text"
+            command = task["command"]
+        return 200, {"stdout": f"{command}\n", "stderr": "", "exitCode": 0}, "json"
+
+    def _start_background_task(
+        self, project: FakeProject, body: dict[str, Any], result: dict[str, Any]
+    ) -> tuple[int, Any, str]:
+        with self._lock:
+            task_id = f"task-{self._next_id}"
+            self._next_id += 1
+        project.background_tasks[task_id] = {
+            "id": task_id,
+            "status": "running",
+            "command": body.get("command") or body.get("alias"),
+            "result": result,
+        }
+        return 202, {"id": task_id, "status": "running"}, "json"
+
+    def _check_background_task(
+        self, project: FakeProject, task_id: str, cancel: bool
+    ) -> tuple[int, Any, str]:
+        task = project.background_tasks.get(task_id)
+        if task is None:
+            return 404, "task not found", "text"
+        if task["status"] == "running":
+            if cancel:
+                task["status"] = "cancelled"
+            elif not task["command"].startswith("sleep"):
+                task["status"] = "completed"
+        response = {"id": task["id"], "status": task["status"]}
+        if task["status"] == "completed":
+            response["result"] = task["result"]
+        return 200, response, "json"
+
+    def _apply_changeset(
+        self, project: FakeProject, changes: list[dict[str, Any]]
+    ) -> tuple[int, Any, str]:
+        files = dict(project.files)
+        result: dict[str, list[Any]] = {"files": [], "deleted": []}
+        for change in changes:
+            path = change["path"]
+            if change["type"] == "create":
+                files[path] = change["content"]
+            elif path not in files:
+                return 404, f"file not found: {path}", "text"
+            elif change["type"] == "update":
+                files[path] = _apply_update(files[path], change["update"])
+            else:
+                del files[path]
+                result["deleted"].append(path)
+                continue
+            result["files"].append(_file_json(path, files[path]))
+        project.files = files
+        return 200, result, "json"
+
+    def _search(
+        self, project: FakeProject, query: dict[str, list[str]]
+    ) -> tuple[int, Any, str]:
+        needle = query["query"][0]
+        if query.get("type") == ["symbol"]:
+            # Fuzzy, like language servers: the query's characters in order.
+            matches = [s for s in project.symbols if _fuzzy(needle, s["name"])]
+            limit = int(query.get("limit", ["0"])[0]) or len(matches)
+            return 200, matches[:limit], "json"
+
+        max_matches = int(query.get("maxMatchesPerFile", ["0"])[0])
+        context = int(query.get("contextLines", ["0"])[0])
+        results = []
+        for path, content in sorted(project.files.items()):
+            lines = content.splitlines()
+            matches = [idx for idx, line in enumerate(lines) if needle in line]
+            if max_matches:
+                matches = matches[:max_matches]
+            shown = sorted(
+                {
+                    idx
+                    for match in matches
+                    for idx in range(match - context, match + context + 1)
+                    if 0 <= idx < len(lines)
+                }
+            )
+            if shown:
+                results.append(
+                    {
+                        "path": path,
+                        "lines": [
+                            {"number": idx + 1, "content": lines[idx]} for idx in shown
+                        ],
+                        "diagnostics": [],
+                    }
+                )
+        offset = int(query.get("offset", ["0"])[0])
+        limit = int(query.get("limit", ["0"])[0]) or len(results)
+        return 200, results[offset : offset + limit], "json"
+
+
+def _handler(server: FakeHideServer) -> type[BaseHTTPRequestHandler]:
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        disable_nagle_algorithm = True
+
+        def setup(self) -> None:
+            super().setup()
+            with server._lock:
+                server.connections += 1
+
+        def log_message(self, format: str, *args: Any) -> None:
+            pass
+
+        def _dispatch(self, method: str) -> None:
+            with server._lock:
+                server.in_flight += 1
+                server.max_in_flight = max(server.max_in_flight, server.in_flight)
+            try:
+                time.sleep(server.latency)
+                self._respond(method)
+            finally:
+                with server._lock:
+                    server.in_flight -= 1
+
+        def _respond(self, method: str) -> None:
+            url = urlparse(self.path)
+            length = int(self.headers.get("Content-Length") or 0)
+            raw = self.rfile.read(length) if length else b""
+            body = json.loads(raw) if raw else None
+            with server._lock:
+                server.requests.append((method, url.path))
+                server.bytes_received += len(raw)
+                failure = server._failures.pop(0) if server._failures else None
+            if failure is not None:
+                self._fail(*failure)
+                return
+            status, payload, content_type = server.handle(
+                method,
+                url.path,
+                parse_qs(url.query, keep_blank_values=True),
+                body,
+                self.headers,
+            )
+            if content_type == "sse":
+                self._stream_events(payload)
+                return
+            if payload is None:
+                data = b""
+            elif content_type == "json":
+                data = json.dumps(payload).encode()
+            else:
+                data = str(payload).encode()
+            etag = None
+            if server.etags and method == "GET" and status == 200:
+                etag = f'"{hashlib.sha1(data).hexdigest()}"'
+                if self.headers.get("If-None-Match") == etag:
+                    status, data = 304, b""
+            self.send_response(status)
+            self.send_header(
+                "Content-Type",
+                "application/json" if content_type == "json" else "text/plain",
+            )
+            if etag:
+                self.send_header("ETag", etag)
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            try:
+                self.wfile.write(data)
+            except (BrokenPipeError, ConnectionResetError):
+                # The client stopped reading and dropped the rest of the response.
+                return
+            with server._lock:
+                server.bytes_sent += len(data)
+
+        def _fail(self, status: Optional[int], headers: dict[str, str]) -> None:
+            if status is None:
+                self.close_connection = True
+                self.connection.shutdown(socket.SHUT_RDWR)
+                return
+            self.send_response(status)
+            for name, value in headers.items():
+                self.send_header(name, value)
+            self.send_header("Content-Length", "11")
+            self.end_headers()
+            self.wfile.write(b"unavailable")
+
+        def _stream_events(self, events: list[tuple[str, str]]) -> None:
+            self.send_response(200)
+            self.send_header("Content-Type", "text/event-stream")
+            self.send_header("Transfer-Encoding", "chunked")
+            self.end_headers()
+            for event, data in events:
+                lines = [f"event: {event}"] + [f"data: {d}" for d in data.split("\n")]
+                chunk = ("\n".join(lines) + "\n\n").encode()
+                self.wfile.write(b"%x\r\n%s\r\n" % (len(chunk), chunk))
+                self.wfile.flush()
+                with server._lock:
+                    server.bytes_sent += len(chunk)
+            self.wfile.write(b"0\r\n\r\n")
+
+        def do_GET(self) -> None:
+            self._dispatch("GET")
+
+        def do_POST(self) -> None:
+            self._dispatch("POST")
+
+        def do_PUT(self) -> None:
+            self._dispatch("PUT")
+
+        def do_DELETE(self) -> None:
+            self._dispatch("DELETE")
+
+    return Handler
+
+
+def _fuzzy(query: str, name: str) -> bool:
+    chars = iter(name.lower())
+    return all(char in chars for char in query.lower())
+
+
+def _project_json(project: FakeProject) -> dict[str, Any]:
+    return {"id": project.id, "repository": project.repository}
+
+
+def _file_json(
+    path: str, content: str, start_line: int = 1, num_lines: Optional[int] = None
+) -> dict[str, Any]:
+    lines = content.splitlines()
+    end = len(lines) if num_lines is None else start_line - 1 + num_lines
+    return {
+        "path": path,
+        "lines": [
+            {"number": idx + 1, "content": lines[idx]}
+            for idx in range(start_line - 1, min(end, len(lines)))
+        ],
+        "diagnostics": [],
+    }
+
+
+def _read(project: FakeProject, request: dict[str, Any]) -> dict[str, Any]:
+    path = request["path"]
+    if path not in project.files:
+        return {**request, "error": "file not found"}
+    return {
+        **request,
+        "file": _file_json(
+            path,
+            project.files[path],
+            request.get("startLine", 1),
+            request.get("numLines"),
+        ),
+    }
+
+
+def _apply_update(content: str, body: dict[str, Any]) -> str:
+    match body["type"]:
+        case "overwrite":
+            return body["overwrite"]["content"]
+        case "linediff":
+            diff = body["linediff"]
+            lines = content.splitlines()
+            start, end = diff["startLine"], diff["endLine"]
+            lines[start - 1 : end - 1] = diff["content"].splitlines()
+            return "\n".join(lines) + "\n"
+        case _:
+            raise ValueError(f"unsupported update type: {body['type']}")
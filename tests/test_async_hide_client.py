@@ -0,0 +1,164 @@
+import asyncio
+
+import httpx
+import pytest
+
+import hide
+from hide import model
+from hide.client import HideClientError
+from tests.fake_server import FakeHideServer
+
+PATH = "file.txt"
+CONTENT = "Hello World\n"
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+@pytest.fixture
+def project(fake_server: FakeHideServer):
+    project = fake_server.add_project()
+    project.tasks.append({"alias": "build", "command": "make build"})
+    project.files[PATH] = CONTENT
+    return project
+
+
+async def call(fake_server: FakeHideServer, method: str, *args, **kwargs):
+    async with hide.AsyncClient(base_url=fake_server.base_url) as client:
+        return await getattr(client, method)(*args, **kwargs)
+
+
+def test_create_and_get_project(fake_server: FakeHideServer):
+    repository = model.Repository(url="http://example.com/repo.git")
+
+    async def scenario():
+        async with hide.AsyncClient(base_url=fake_server.base_url) as client:
+            created = await client.create_project(repository=repository)
+            return created, await client.get_project(created.id)
+
+    created, fetched = run(scenario())
+    assert created == fetched == model.Project(id=created.id, repository=repository)
+
+
+def test_get_projects(fake_server: FakeHideServer, project):
+    projects = run(call(fake_server, "get_projects"))
+    assert [p.id for p in projects] == [project.id]
+
+
+def test_delete_project(fake_server: FakeHideServer, project):
+    deleted = run(
+        call(
+            fake_server,
+            "delete_project",
+            model.Project(id=project.id, repository=model.Repository(url="u")),
+        )
+    )
+    assert deleted
+    assert fake_server.projects == {}
+
+
+def test_get_tasks(fake_server: FakeHideServer, project):
+    tasks = run(call(fake_server, "get_tasks", project.id))
+    assert tasks == [model.Task(alias="build", command="make build")]
+
+
+def test_run_task_alias(fake_server: FakeHideServer, project):
+    result = run(call(fake_server, "run_task", project.id, alias="build"))
+    assert result == model.TaskResult(stdout="make build\n", stderr="", exit_code=0)
+
+
+def test_run_task_validates_arguments(fake_server: FakeHideServer, project):
+    with pytest.raises(HideClientError, match="Cannot provide both"):
+        run(call(fake_server, "run_task", project.id, command="ls", alias="build"))
+
+
+def test_create_file(fake_server: FakeHideServer, project):
+    file = run(call(fake_server, "create_file", project.id, "new.txt", "New"))
+    assert file == model.File.from_content(path="new.txt", content="New")
+    assert project.files["new.txt"] == "New"
+
+
+def test_get_file(fake_server: FakeHideServer, project):
+    file = run(call(fake_server, "get_file", project.id, PATH))
+    assert file == model.File.from_content(path=PATH, content=CONTENT)
+
+
+def test_get_file_failure(fake_server: FakeHideServer, project):
+    with pytest.raises(HideClientError, match="file not found"):
+        run(call(fake_server, "get_file", project.id, "missing.txt"))
+
+
+def test_update_file(fake_server: FakeHideServer, project):
+    file = run(
+        call(
+            fake_server,
+            "update_file",
+            project.id,
+            PATH,
+            model.OverwriteUpdate(content="Bye\n"),
+        )
+    )
+    assert file == model.File.from_content(path=PATH, content="Bye")
+
+
+def test_delete_file(fake_server: FakeHideServer, project):
+    assert run(call(fake_server, "delete_file", project.id, model.FileInfo(path=PATH)))
+    assert project.files == {}
+
+
+def test_list_files(fake_server: FakeHideServer, project):
+    files = run(call(fake_server, "list_files", project.id))
+    assert files == [model.FileInfo(path=PATH)]
+
+
+def test_list_files_tree(fake_server: FakeHideServer, project):
+    tree = run(
+        call(fake_server, "list_files", project.id, format=model.ListFilesFormat.TREE)
+    )
+    assert tree == PATH
+
+
+def test_search_files(fake_server: FakeHideServer, project):
+    files = run(call(fake_server, "search_files", project.id, query="Hello"))
+    assert files == [model.File.from_content(path=PATH, content="Hello World")]
+
+
+def test_search_symbols(fake_server: FakeHideServer, project):
+    symbol = {
+        "name": "main",
+        "kind": "Function",
+        "location": {
+            "path": PATH,
+            "range": {
+                "start": {"line": 0, "character": 0},
+                "end": {"line": 0, "character": 4},
+            },
+        },
+    }
+    project.symbols.append(symbol)
+    symbols = run(call(fake_server, "search_symbols", project.id, query="ma"))
+    assert symbols == [model.Symbol.model_validate(symbol)]
+    assert fake_server.requests[-1] == ("GET", f"/projects/{project.id}/search")
+
+
+def test_document_outline(fake_server: FakeHideServer, project):
+    outline = run(call(fake_server, "document_outline", project.id, PATH))
+    assert outline == model.DocumentOutline(path=PATH, document_symbols=[])
+
+
+def test_concurrent_calls_share_connections(fake_server: FakeHideServer, project):
+    limits = httpx.Limits(max_connections=10)
+
+    async def scenario():
+        async with hide.AsyncClient(
+            base_url=fake_server.base_url, limits=limits
+        ) as client:
+            return await asyncio.gather(
+                *(client.get_file(project.id, PATH) for _ in range(100))
+            )
+
+    files = run(scenario())
+    assert len(files) == 100
+    assert all(file.path == PATH for file in files)
+    assert fake_server.connections <= 10
@@ -0,0 +1,148 @@
+import asyncio
+import inspect
+from unittest.mock import create_autospec
+
+import pytest
+
+from hide.client.async_hide_client import AsyncHideClient
+from hide.model import (
+    File,
+    FileInfo,
+    Line,
+    LineDiffUpdate,
+    Project,
+    Repository,
+    Task,
+    TaskResult,
+)
+from hide.toolkit import AsyncToolkit, Toolkit
+
+PROJECT_ID = "123"
+PATH = "file.txt"
+CONTENT = "Hello World"
+
+
+@pytest.fixture
+def hide_client():
+    return create_autospec(AsyncHideClient)
+
+
+@pytest.fixture
+def toolkit(hide_client: AsyncHideClient) -> AsyncToolkit:
+    repository = Repository(url="http://example.com/repo.git")
+    project = Project(id=PROJECT_ID, repository=repository)
+    return AsyncToolkit(project=project, client=hide_client)
+
+
+def test_tools_mirror_sync_toolkit(toolkit: AsyncToolkit):
+    sync_toolkit = Toolkit(project=toolkit.project, client=None)  # type: ignore
+    sync_tools = sync_toolkit.get_tools()
+    async_tools = toolkit.get_tools()
+
+    assert [t.__name__ for t in async_tools] == [t.__name__ for t in sync_tools]
+    for async_tool, sync_tool in zip(async_tools, sync_tools):
+        assert inspect.iscoroutinefunction(async_tool)
+        assert async_tool.__doc__ == sync_tool.__doc__
+        assert inspect.signature(async_tool).parameters == (
+            inspect.signature(sync_tool).parameters
+        )
+
+
+def test_get_tasks_success(toolkit: AsyncToolkit, hide_client):
+    hide_client.get_tasks.return_value = [Task(alias="build", command="make build")]
+    tasks = asyncio.run(toolkit.get_tasks())
+    assert tasks == '[{"alias": "build", "command": "make build"}]'
+
+
+def test_run_task_success(toolkit: AsyncToolkit, hide_client):
+    hide_client.run_task.return_value = TaskResult(
+        stdout="output", stderr="", exit_code=0
+    )
+    result = asyncio.run(toolkit.run_task(command="echo Hello"))
+    assert result == "exit code: 0\nstdout: output\nstderr: "
+
+
+def test_run_task_failure(toolkit: AsyncToolkit, hide_client):
+    hide_client.run_task.side_effect = Exception("Error")
+    result = asyncio.run(toolkit.run_task(command="echo Hello"))
+    assert result == "Failed to run task: Error"
+
+
+def test_insert_lines_success(toolkit: AsyncToolkit, hide_client):
+    expected = File(
+        path=PATH,
+        lines=[Line(number=1, content="New line"), Line(number=2, content=CONTENT)],
+    )
+    hide_client.update_file.return_value = expected
+    file = asyncio.run(toolkit.insert_lines(PATH, 1, "New line"))
+    assert file == f"File updated:\n{expected}"
+    hide_client.update_file.assert_called_once_with(
+        project_id=PROJECT_ID,
+        path=PATH,
+        update=LineDiffUpdate(start_line=1, end_line=1, content="New line"),
+    )
+
+
+def test_append_lines_success(toolkit: AsyncToolkit, hide_client):
+    hide_client.get_file.return_value = File(
+        path=PATH, lines=[Line(number=1, content=CONTENT)]
+    )
+    expected = File(
+        path=PATH,
+        lines=[Line(number=1, content=CONTENT), Line(number=2, content="New line")],
+    )
+    hide_client.update_file.return_value = expected
+    file = asyncio.run(toolkit.append_lines(PATH, "New line"))
+    assert file == f"File updated:\n{expected}"
+    hide_client.update_file.assert_called_once_with(
+        project_id=PROJECT_ID,
+        path=PATH,
+        update=LineDiffUpdate(start_line=2, end_line=2, content="New line"),
+    )
+
+
+def test_get_file_success(toolkit: AsyncToolkit, hide_client):
+    expected = File(path=PATH, lines=[Line(number=1, content=CONTENT)])
+    hide_client.get_file.return_value = expected
+    file = asyncio.run(toolkit.get_file(PATH))
+    assert file == f"{expected}"
+
+
+def test_get_file_failure(toolkit: AsyncToolkit, hide_client):
+    hide_client.get_file.side_effect = Exception("Error")
+    file = asyncio.run(toolkit.get_file(PATH))
+    assert file == "Failed to get file: Error"
+
+
+def test_delete_file_success(toolkit: AsyncToolkit, hide_client):
+    hide_client.delete_file.return_value = True
+    result = asyncio.run(toolkit.delete_file(PATH))
+    assert result == f"File deleted: {PATH}"
+
+
+def test_list_files_success(toolkit: AsyncToolkit, hide_client):
+    hide_client.list_files.return_value = [FileInfo(path="README.md")]
+    files = asyncio.run(toolkit.list_files())
+    assert files == "README.md"
+
+
+def test_tools_run_concurrently(toolkit: AsyncToolkit, hide_client):
+    in_flight = 0
+    peak = 0
+
+    async def get_file(project_id, path):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return File(path=path, lines=[Line(number=1, content=CONTENT)])
+
+    hide_client.get_file.side_effect = get_file
+
+    async def scenario():
+        return await asyncio.gather(*(toolkit.get_file(f"{i}.txt") for i in range(10)))
+
+    results = asyncio.run(scenario())
+    assert len(results) == 10
+    assert peak == 10
@@ -0,0 +1,409 @@
+import asyncio
+import json
+from unittest.mock import Mock
+
+import pytest
+
+import hide
+from hide import model
+from hide.client import endpoints
+from hide.client.cache import FileCache, SymbolCache
+from tests.fake_server import FakeHideServer
+
+PROJECT_ID = "123"
+PATH = "file.txt"
+CONTENT = "Hello World\n"
+
+
+FILE_JSON = json.dumps(
+    {"path": PATH, "lines": [{"number": 1, "content": "Hello"}]}
+).encode()
+
+
+def response(size: int = 0, etag=None, status_code=200):
+    return Mock(
+        status_code=status_code,
+        content=FILE_JSON.ljust(size),
+        headers={"ETag": etag} if etag else {},
+    )
+
+
+def store(cache: FileCache, path: str, size: int, etag=None) -> model.File:
+    key = (PROJECT_ID, path, None, None)
+    endpoint = endpoints.get_file(PROJECT_ID, path)
+    return cache.store(key, 0, endpoint, response(size, etag))
+
+
+def test_lookup_serves_unvalidated_entry_without_request():
+    cache = FileCache()
+    stored = store(cache, PATH, 100)
+
+    file, _, _ = cache.lookup(
+        (PROJECT_ID, PATH, None, None), endpoints.get_file(PROJECT_ID, PATH)
+    )
+
+    assert file == stored
+    assert file is not stored
+    assert cache.stats.hits == 1
+    assert cache.stats.misses == 1
+
+
+def test_lookup_makes_request_conditional_when_etag_is_cached():
+    cache = FileCache()
+    stored = store(cache, PATH, 100, etag='"v1"')
+    key = (PROJECT_ID, PATH, None, None)
+
+    file, endpoint, version = cache.lookup(key, endpoints.get_file(PROJECT_ID, PATH))
+
+    assert file is None
+    assert endpoint.headers == {"If-None-Match": '"v1"'}
+    assert cache.store(key, version, endpoint, response(status_code=304)) == stored
+    assert cache.stats.hits == 1
+
+
+def test_entries_are_evicted_in_lru_order_by_size():
+    cache = FileCache(max_bytes=250)
+    store(cache, "a.txt", 100)
+    store(cache, "b.txt", 100)
+    cache.lookup(
+        (PROJECT_ID, "a.txt", None, None), endpoints.get_file(PROJECT_ID, "a.txt")
+    )
+    store(cache, "c.txt", 100)
+
+    assert [key[1] for key in cache._entries] == ["a.txt", "c.txt"]
+    assert cache.size == 200
+    assert cache.stats.evictions == 1
+
+
+def test_entries_larger_than_cache_are_not_stored():
+    cache = FileCache(max_bytes=50)
+    store(cache, PATH, 100)
+    assert len(cache) == 0
+    assert cache.size == 0
+
+
+def test_invalidate_drops_every_range_of_a_path():
+    cache = FileCache()
+    endpoint = endpoints.get_file(PROJECT_ID, PATH)
+    cache.store((PROJECT_ID, PATH, None, None), 0, endpoint, response())
+    cache.store((PROJECT_ID, PATH, 10, 5), 0, endpoint, response())
+    cache.store((PROJECT_ID, "other.txt", None, None), 0, endpoint, response())
+    cache.store(("456", PATH, None, None), 0, endpoint, response())
+
+    cache.invalidate(PROJECT_ID, PATH)
+    assert len(cache) == 2
+
+    cache.invalidate(PROJECT_ID)
+    assert list(cache._entries) == [("456", PATH, None, None)]
+
+
+@pytest.mark.parametrize("path", [PATH, None])
+def test_response_read_before_invalidation_is_not_stored(path):
+    cache = FileCache()
+    key = (PROJECT_ID, PATH, None, None)
+    endpoint = endpoints.get_file(PROJECT_ID, PATH)
+    _, endpoint, version = cache.lookup(key, endpoint)
+
+    cache.invalidate(PROJECT_ID, path)
+    stale = cache.store(key, version, endpoint, response())
+
+    assert stale.path == PATH
+    assert len(cache) == 0
+    _, _, version = cache.lookup(key, endpoint)
+    cache.store(key, version, endpoint, response())
+    assert len(cache) == 1
+
+
+def test_changes_are_kept_only_while_earlier_requests_are_in_flight():
+    cache = FileCache()
+    key = (PROJECT_ID, PATH, None, None)
+    endpoint = endpoints.get_file(PROJECT_ID, PATH)
+    for i in range(100):
+        cache.invalidate(PROJECT_ID, f"{i}.txt")
+    assert len(cache._changes) == 0
+
+    _, _, version = cache.lookup(key, endpoint)
+    _, _, failed = cache.lookup(key, endpoint)
+    cache.invalidate(PROJECT_ID, PATH)
+    cache.invalidate(PROJECT_ID, "other.txt")
+    cache.store(key, version, endpoint, response())
+    assert len(cache._changes) == 2
+    cache.cancel(failed)
+    assert len(cache._changes) == 0
+
+
+def test_client_forgets_failed_reads(fake_server: FakeHideServer):
+    project = fake_server.add_project()
+    cache = FileCache()
+    client = hide.Client(base_url=fake_server.base_url, file_cache=cache)
+
+    with pytest.raises(hide.client.HideClientError, match="file not found"):
+        client.get_file(project.id, PATH)
+    client.create_file(project.id, PATH, CONTENT)
+
+    assert len(cache._changes) == 0
+
+
+def test_rejects_non_positive_size():
+    with pytest.raises(ValueError):
+        FileCache(max_bytes=0)
+
+
+@pytest.mark.parametrize("etags", [False, True])
+def test_client_serves_repeated_reads_from_cache(etags: bool):
+    with FakeHideServer(etags=etags) as server:
+        project = server.add_project()
+        project.files[PATH] = CONTENT
+        cache = FileCache()
+        client = hide.Client(base_url=server.base_url, file_cache=cache)
+
+        first = client.get_file(project.id, PATH)
+        second = client.get_file(project.id, PATH)
+
+        assert first == second == model.File.from_content(path=PATH, content=CONTENT)
+        assert cache.stats.hits == 1
+        assert cache.stats.misses == 1
+        assert len(server.requests) == (2 if etags else 1)
+
+
+def test_client_revalidates_changed_file(fake_server: FakeHideServer):
+    fake_server.etags = True
+    project = fake_server.add_project()
+    project.files[PATH] = CONTENT
+    cache = FileCache()
+    client = hide.Client(base_url=fake_server.base_url, file_cache=cache)
+
+    client.get_file(project.id, PATH)
+    project.files[PATH] = "Changed\n"
+    file = client.get_file(project.id, PATH)
+
+    assert file == model.File.from_content(path=PATH, content="Changed")
+    assert cache.stats.misses == 2
+
+
+@pytest.mark.parametrize(
+    "write",
+    [
+        lambda c, p: c.update_file(p, PATH, model.OverwriteUpdate(content="New\n")),
+        lambda c, p: c.create_file(p, PATH, "New\n"),
+        lambda c, p: c.run_task(p, command="echo New > file.txt"),
+    ],
+)
+def test_client_writes_invalidate_cache(fake_server: FakeHideServer, write):
+    project = fake_server.add_project()
+    project.files[PATH] = CONTENT
+    cache = FileCache()
+    client = hide.Client(base_url=fake_server.base_url, file_cache=cache)
+
+    client.get_file(project.id, PATH)
+    write(client, project.id)
+    project.files[PATH] = "New\n"
+
+    assert client.get_file(project.id, PATH) == model.File.from_content(
+        path=PATH, content="New"
+    )
+    assert cache.stats.hits == 0
+
+
+def test_client_delete_invalidates_cache(fake_server: FakeHideServer):
+    project = fake_server.add_project()
+    project.files[PATH] = CONTENT
+    cache = FileCache()
+    client = hide.Client(base_url=fake_server.base_url, file_cache=cache)
+
+    client.get_file(project.id, PATH)
+    client.delete_file(project.id, model.FileInfo(path=PATH))
+
+    assert len(cache) == 0
+
+
+def test_async_client_uses_cache(fake_server: FakeHideServer):
+    fake_server.etags = True
+    project = fake_server.add_project()
+    project.files[PATH] = CONTENT
+    cache = FileCache()
+
+    async def scenario():
+        async with hide.AsyncClient(
+            base_url=fake_server.base_url, file_cache=cache
+        ) as client:
+            await client.get_file(project.id, PATH)
+            return await client.get_file(project.id, PATH)
+
+    assert asyncio.run(scenario()) == model.File.from_content(
+        path=PATH, content=CONTENT
+    )
+    assert cache.stats.hits == 1
+
+
+def symbol(name: str, path: str = PATH) -> dict:
+    position = {"line": 0, "character": 0}
+    return {
+        "name": name,
+        "kind": "Function",
+        "location": {"path": path, "range": {"start": position, "end": position}},
+    }
+
+
+def outline(path: str, *names: str) -> model.DocumentOutline:
+    position = {"line": 0, "character": 0}
+    return model.DocumentOutline.model_validate(
+        {
+            "path": path,
+            "document_symbols": [
+                {
+                    "name": name,
+                    "detail": "",
+                    "kind": "Function",
+                    "range": {"start": position, "end": position},
+                }
+                for name in names
+            ],
+        }
+    )
+
+
+def symbols(*names: str) -> list[model.Symbol]:
+    return [model.Symbol.model_validate(symbol(name)) for name in names]
+
+
+def test_symbol_queries_are_narrowed_from_complete_results():
+    cache = SymbolCache(narrow_queries=True)
+    _, version = cache.symbols(PROJECT_ID, "get", limit=10)
+    cache.store_symbols(
+        PROJECT_ID, "get", 10, version, symbols("get_file", "GetTask", "target")
+    )
+
+    assert cache.symbols(PROJECT_ID, "get", limit=10)[0] == symbols(
+        "get_file", "GetTask", "target"
+    )
+    assert cache.symbols(PROJECT_ID, "getf")[0] == symbols("get_file")
+    assert cache.symbols(PROJECT_ID, "gett", limit=1)[0] == symbols("GetTask")
+    assert cache.symbols(PROJECT_ID, "ge")[0] is None
+    assert cache.symbols("other", "get")[0] is None
+
+
+def test_symbol_queries_are_only_narrowed_on_request():
+    cache = SymbolCache()
+    cache.store_symbols(PROJECT_ID, "get", 10, 0, symbols("get_file", "get_task"))
+
+    assert cache.symbols(PROJECT_ID, "get", limit=10)[0] == symbols(
+        "get_file", "get_task"
+    )
+    assert cache.symbols(PROJECT_ID, "getf", limit=10)[0] is None
+
+
+def test_truncated_symbol_results_only_serve_smaller_limits():
+    cache = SymbolCache(narrow_queries=True)
+    cache.store_symbols(PROJECT_ID, "get", 2, 0, symbols("get_a", "get_b"))
+
+    assert cache.symbols(PROJECT_ID, "get", limit=1)[0] == symbols("get_a")
+    assert cache.symbols(PROJECT_ID, "get", limit=3)[0] is None
+    assert cache.symbols(PROJECT_ID, "get_a")[0] is None
+
+
+def test_unlimited_symbol_results_may_be_capped_by_the_server():
+    cache = SymbolCache(narrow_queries=True)
+    cache.store_symbols(PROJECT_ID, "get", None, 0, symbols("get_a", "get_b"))
+
+    assert cache.symbols(PROJECT_ID, "get")[0] == symbols("get_a", "get_b")
+    assert cache.symbols(PROJECT_ID, "get", limit=2)[0] == symbols("get_a", "get_b")
+    assert cache.symbols(PROJECT_ID, "get", limit=3)[0] is None
+    assert cache.symbols(PROJECT_ID, "get_a")[0] is None
+
+
+def test_edits_drop_outline_of_file_and_symbols_of_project():
+    cache = SymbolCache()
+    cache.store_outline(PROJECT_ID, "a.py", 0, outline("a.py", "a"))
+    cache.store_outline(PROJECT_ID, "b.py", 0, outline("b.py", "b"))
+    cache.store_symbols(PROJECT_ID, "a", None, 0, symbols("a"))
+
+    cache.invalidate(PROJECT_ID, "a.py")
+
+    assert cache.outline(PROJECT_ID, "a.py")[0] is None
+    assert cache.outline(PROJECT_ID, "b.py")[0] == outline("b.py", "b")
+    assert cache.symbols(PROJECT_ID, "a")[0] is None
+    cache.invalidate(PROJECT_ID)
+    assert len(cache) == 0
+
+
+def test_results_of_requests_sent_before_an_edit_are_not_cached():
+    cache = SymbolCache()
+    _, outline_version = cache.outline(PROJECT_ID, "a.py")
+    _, symbols_version = cache.symbols(PROJECT_ID, "a")
+    cache.invalidate(PROJECT_ID, "a.py")
+    cache.store_outline(PROJECT_ID, "a.py", outline_version, outline("a.py", "old"))
+    cache.store_symbols(PROJECT_ID, "a", None, symbols_version, symbols("old"))
+
+    assert len(cache) == 0
+    cache.store_outline(PROJECT_ID, "b.py", outline_version, outline("b.py"))
+    assert len(cache) == 1
+
+
+def test_symbol_cache_keeps_changes_only_while_earlier_requests_are_in_flight():
+    cache = SymbolCache()
+    _, version = cache.symbols(PROJECT_ID, "a")
+    cache.invalidate(PROJECT_ID, "a.py")
+    cache.invalidate(PROJECT_ID)
+    assert len(cache._changes) == 3
+
+    cache.cancel(version)
+    assert len(cache._changes) == 0
+    cache.invalidate(PROJECT_ID, "b.py")
+    assert len(cache._changes) == 0
+
+
+def test_symbol_cache_evicts_least_recently_used():
+    cache = SymbolCache(max_entries=2)
+    cache.store_outline(PROJECT_ID, "a.py", 0, outline("a.py"))
+    cache.store_symbols(PROJECT_ID, "a", None, 0, symbols("a"))
+    cache.outline(PROJECT_ID, "a.py")
+    cache.store_outline(PROJECT_ID, "b.py", 0, outline("b.py"))
+
+    assert cache.symbols(PROJECT_ID, "a")[0] is None
+    assert cache.outline(PROJECT_ID, "a.py")[0] == outline("a.py")
+    assert cache.stats.evictions == 1
+    with pytest.raises(ValueError):
+        SymbolCache(max_entries=0)
+
+
+def test_client_serves_repeated_symbol_lookups_from_cache(fake_server: FakeHideServer):
+    project = fake_server.add_project()
+    project.files[PATH] = CONTENT
+    project.symbols.extend([symbol("get_file"), symbol("get_task")])
+    project.outlines[PATH] = [
+        outline(PATH, "get_file").model_dump()["document_symbols"][0]
+    ]
+    cache = SymbolCache()
+    client = hide.Client(base_url=fake_server.base_url, symbol_cache=cache)
+
+    assert client.search_symbols(project.id, "get") == symbols("get_file", "get_task")
+    assert client.search_symbols(project.id, "get") == symbols("get_file", "get_task")
+    assert client.document_outline(project.id, PATH) == outline(PATH, "get_file")
+    assert client.document_outline(project.id, PATH) == outline(PATH, "get_file")
+    assert len(fake_server.requests) == 2
+    assert cache.stats.hits == 2
+
+    client.update_file(project.id, PATH, model.OverwriteUpdate(content="New\n"))
+    project.symbols.append(symbol("get_time"))
+    assert client.search_symbols(project.id, "get_t") == symbols("get_task", "get_time")
+    client.document_outline(project.id, PATH)
+    assert len(fake_server.requests) == 5
+
+
+def test_async_client_uses_symbol_cache(fake_server: FakeHideServer):
+    project = fake_server.add_project()
+    project.symbols.append(symbol("main"))
+    cache = SymbolCache()
+
+    async def scenario():
+        async with hide.AsyncClient(
+            base_url=fake_server.base_url, symbol_cache=cache
+        ) as client:
+            await client.search_symbols(project.id, "ma")
+            await client.document_outline(project.id, PATH)
+            await client.document_outline(project.id, PATH)
+            return await client.search_symbols(project.id, "ma")
+
+    assert asyncio.run(scenario()) == symbols("main")
+    assert len(fake_server.requests) == 2
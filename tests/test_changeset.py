@@ -0,0 +1,154 @@
+import asyncio
+
+import pytest
+
+import hide
+from hide import model
+from hide.client import HideClientError, endpoints
+from hide.client.retry import NO_RETRY
+from tests.fake_server import FakeHideServer
+
+FILES = {"a.txt": "A\n", "b.txt": "B 1\nB 2\n", "c.txt": "C\n"}
+
+
+def build(changeset):
+    return (
+        changeset.create("new.txt", "New\n")
+        .update("a.txt", model.OverwriteUpdate(content="A 2\n"))
+        .update(
+            "b.txt", model.LineDiffUpdate(start_line=2, end_line=3, content="Edited")
+        )
+        .delete("c.txt")
+    )
+
+
+EXPECTED = model.ChangesetResult(
+    files=[
+        model.File.from_content("new.txt", "New"),
+        model.File.from_content("a.txt", "A 2"),
+        model.File.from_content("b.txt", "B 1\nEdited"),
+    ],
+    deleted=["c.txt"],
+)
+
+
+def test_changeset_payload():
+    changes = build(hide.client.Changeset(lambda changes: None)).changes
+    endpoint = endpoints.apply_changeset("123", changes)
+
+    assert endpoint.path == "/projects/123/changesets"
+    assert endpoint.json["changes"][0] == {
+        "type": "create",
+        "path": "new.txt",
+        "content": "New\n",
+    }
+    assert endpoint.json["changes"][2]["update"] == {
+        "type": "linediff",
+        "linediff": {"startLine": 2, "endLine": 3, "content": "Edited"},
+    }
+    assert endpoint.json["changes"][3] == {"type": "delete", "path": "c.txt"}
+
+
+@pytest.mark.parametrize("changesets", [True, False])
+def test_submit_changeset(changesets: bool):
+    with FakeHideServer(changesets=changesets) as server:
+        project = server.add_project()
+        project.files.update(FILES)
+        client = hide.Client(base_url=server.base_url)
+
+        result = build(client.changeset(project.id)).submit()
+
+        assert result == EXPECTED
+        assert project.files == {
+            "a.txt": "A 2\n",
+            "b.txt": "B 1\nEdited\n",
+            "new.txt": "New\n",
+        }
+        if changesets:
+            assert server.requests == [("POST", f"/projects/{project.id}/changesets")]
+
+
+@pytest.mark.parametrize("changesets", [True, False])
+def test_failed_changeset_leaves_files_unchanged(changesets: bool):
+    with FakeHideServer(changesets=changesets) as server:
+        project = server.add_project()
+        project.files.update(FILES)
+        client = hide.Client(base_url=server.base_url)
+
+        changeset = build(client.changeset(project.id)).update(
+            "missing.txt", model.OverwriteUpdate(content="Missing\n")
+        )
+        with pytest.raises(HideClientError, match="file not found"):
+            changeset.submit()
+
+        assert project.files == FILES
+
+
+def test_missing_file_does_not_disable_changesets():
+    with FakeHideServer() as server:
+        project = server.add_project()
+        project.files.update(FILES)
+        client = hide.Client(base_url=server.base_url)
+
+        with pytest.raises(HideClientError, match="file not found"):
+            client.changeset(project.id).update(
+                "missing.txt", model.OverwriteUpdate(content="Missing\n")
+            ).submit()
+        server.requests.clear()
+        build(client.changeset(project.id)).submit()
+
+        assert server.requests == [("POST", f"/projects/{project.id}/changesets")]
+
+
+def test_async_changeset_fallback():
+    with FakeHideServer(changesets=False) as server:
+        project = server.add_project()
+        project.files.update(FILES)
+
+        async def scenario():
+            async with hide.AsyncClient(base_url=server.base_url) as client:
+                return await build(client.changeset(project.id)).submit()
+
+        assert asyncio.run(scenario()) == EXPECTED
+
+
+def test_changeset_fallback_needs_every_original():
+    with FakeHideServer(batch_reads=False, changesets=False) as server:
+        project = server.add_project()
+        project.files.update(FILES)
+        client = hide.Client(base_url=server.base_url, retry=NO_RETRY)
+        client.changeset(project.id).create("new.txt", "New\n").submit()
+        changeset = (
+            client.changeset(project.id)
+            .update("a.txt", model.OverwriteUpdate(content="A 2\n"))
+            .update("missing.txt", model.OverwriteUpdate(content="Missing\n"))
+        )
+
+        # Both reads of the originals, then the second read of the first to fail.
+        server.fail_next(3, status=503)
+        with pytest.raises(HideClientError, match="unavailable"):
+            changeset.submit()
+
+        assert project.files == {**FILES, "new.txt": "New\n"}
+
+
+def test_async_changeset_fallback_needs_every_original():
+    with FakeHideServer(batch_reads=False, changesets=False) as server:
+        project = server.add_project()
+        project.files.update(FILES)
+
+        async def scenario():
+            async with hide.AsyncClient(
+                base_url=server.base_url, retry=NO_RETRY
+            ) as client:
+                await client.changeset(project.id).create("new.txt", "New\n").submit()
+                server.fail_next(2, status=503)
+                await (
+                    client.changeset(project.id)
+                    .update("a.txt", model.OverwriteUpdate(content="A 2\n"))
+                    .submit()
+                )
+
+        with pytest.raises(HideClientError, match="unavailable"):
+            asyncio.run(scenario())
+        assert project.files == {**FILES, "new.txt": "New\n"}
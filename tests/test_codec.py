@@ -0,0 +1,80 @@
+import asyncio
+import json
+import sys
+
+import pytest
+from pydantic import TypeAdapter
+
+import hide
+from hide import model
+from hide.client.codec import JsonCodec, OrjsonCodec
+from tests.fake_server import FakeHideServer
+
+FILES = [
+    {"path": "a.py", "lines": [{"number": 1, "content": "a = 1"}]},
+    {
+        "path": "b.py",
+        "lines": [
+            {"number": 3, "content": "b = 2"},
+            {"number": 4, "content": "c = 3"},
+        ],
+    },
+]
+
+
+def test_codecs_validate_the_same():
+    orjson = pytest.importorskip("orjson")
+    adapter = TypeAdapter(list[model.File])
+    raw = orjson.dumps(FILES)
+    expected = [model.File.model_validate(file) for file in FILES]
+    assert JsonCodec().validate(adapter, raw) == expected
+    assert OrjsonCodec().validate(adapter, raw) == expected
+
+
+def test_json_codec_leaves_encoding_to_http_library():
+    assert JsonCodec().encode({"path": "a.py"}) is None
+
+
+def test_orjson_codec_requires_orjson(monkeypatch):
+    monkeypatch.setitem(sys.modules, "orjson", None)
+    with pytest.raises(ImportError, match="hide-py\\[orjson\\]"):
+        OrjsonCodec()
+
+
+@pytest.mark.parametrize("codec", [JsonCodec, OrjsonCodec])
+def test_client_round_trip(fake_server: FakeHideServer, codec):
+    if codec is OrjsonCodec:
+        pytest.importorskip("orjson")
+    project = fake_server.add_project()
+    with hide.Client(base_url=fake_server.base_url, codec=codec()) as client:
+        created = client.create_file(project.id, "a.py", "a = 1\n")
+        assert client.get_file(project.id, "a.py") == created
+        assert client.list_files(project.id) == [model.FileInfo(path="a.py")]
+        result = client.changeset(project.id).create("b.py", "b\n").submit()
+        assert [file.path for file in result.files] == ["b.py"]
+        assert [r.file for r in client.get_files(project.id, ["a.py"])] == [created]
+
+
+def test_async_client_with_orjson():
+    pytest.importorskip("orjson")
+
+    async def main(base_url: str, project_id: str) -> model.File:
+        async with hide.AsyncClient(base_url=base_url, codec=OrjsonCodec()) as client:
+            await client.create_file(project_id, "a.py", "a = 1\n")
+            return await client.get_file(project_id, "a.py")
+
+    with FakeHideServer() as server:
+        project = server.add_project()
+        file = asyncio.run(main(server.base_url, project.id))
+    assert file == model.File.from_content("a.py", "a = 1\n")
+
+
+def test_shared_list_adapters():
+    raw = b'[{"path": "a.py"}, {"path": "b.py"}]'
+    assert model.FILE_INFO_LIST.validate_json(raw) == [
+        model.FileInfo(path="a.py"),
+        model.FileInfo(path="b.py"),
+    ]
+    assert JsonCodec().validate(model.FILE_LIST, json.dumps(FILES).encode()) == [
+        model.File.model_validate(file) for file in FILES
+    ]
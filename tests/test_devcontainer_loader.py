@@ -0,0 +1,64 @@
+from pathlib import Path
+
+import pytest
+from pydantic import ValidationError
+
+from hide.devcontainer import load_devcontainer
+from hide.devcontainer.loader import _load
+from hide.devcontainer.model import ComposeDevContainer, ImageDevContainer
+
+DEVCONTAINER_JSON = b"""
+// Created by the dev container CLI.
+{
+    "name": "Python 3",
+    /* The image to use. */
+    "image": "mcr.microsoft.com/devcontainers/python:3.12",
+    "forwardPorts": [8000,],
+    "postCreateCommand": "pip install -r requirements.txt", // Trailing comma
+}
+"""
+
+
+def test_load_jsonc():
+    root = load_devcontainer(DEVCONTAINER_JSON)
+    assert isinstance(root.root, ImageDevContainer)
+    assert root.root.image == "mcr.microsoft.com/devcontainers/python:3.12"
+    assert root.root.postCreateCommand == "pip install -r requirements.txt"
+
+
+def test_load_from_path(tmp_path: Path):
+    path = tmp_path / "devcontainer.json"
+    path.write_bytes(
+        b'\xef\xbb\xbf{"dockerComposeFile": "compose.yml", "service": "app",'
+        b' "workspaceFolder": "/workspace"}'
+    )
+    assert isinstance(load_devcontainer(path).root, ComposeDevContainer)
+    assert load_devcontainer(str(path)) == load_devcontainer(path)
+
+
+def test_load_caches_by_content():
+    _load.cache_clear()
+    first = load_devcontainer(DEVCONTAINER_JSON)
+    second = load_devcontainer(bytearray(DEVCONTAINER_JSON))
+    assert _load.cache_info().hits == 1
+    assert second == first
+    assert second.root.model_fields_set == first.root.model_fields_set
+
+
+def test_loaded_configs_are_not_shared():
+    first = load_devcontainer(DEVCONTAINER_JSON)
+    first.root.image = "other"
+    first.root.forwardPorts.append(9000)
+    second = load_devcontainer(DEVCONTAINER_JSON)
+    assert second.root.image == "mcr.microsoft.com/devcontainers/python:3.12"
+    assert len(second.root.forwardPorts) == 1
+
+
+def test_load_invalid_json():
+    with pytest.raises(ValueError, match="Invalid devcontainer.json"):
+        load_devcontainer(b'{"image": }')
+
+
+def test_load_invalid_config():
+    with pytest.raises(ValidationError):
+        load_devcontainer(b'{"name": "no image"}')
@@ -206,3 +206,28 @@ def test_dev_container_root_missing_field():
     '''
     with pytest.raises(ValidationError):
         DevContainerRoot.model_validate(json.loads(json_data))
+
+def test_dev_container_root_picks_variant_by_source():
+    root = DevContainerRoot.model_validate({"image": "myimage", "dockerfile": "Dockerfile"})
+    assert isinstance(root.root, DockerfileDevContainer)
+    root = DevContainerRoot.model_validate({
+        "image": "myimage",
+        "dockerComposeFile": "docker-compose.yml",
+        "service": "web",
+        "workspaceFolder": "/workspace"
+    })
+    assert isinstance(root.root, ComposeDevContainer)
+
+def test_dev_container_root_reports_only_its_variant():
+    with pytest.raises(ValidationError) as e:
+        DevContainerRoot.model_validate({"dockerComposeFile": "docker-compose.yml", "service": "web"})
+    assert [error["loc"] for error in e.value.errors()] == [("dockerComposeFile", "workspaceFolder")]
+
+def test_dev_container_root_without_source():
+    with pytest.raises(ValidationError) as e:
+        DevContainerRoot.model_validate({"name": "no source"})
+    assert [error["type"] for error in e.value.errors()] == ["devcontainer_kind"]
+
+def test_dev_container_root_ignores_null_sources():
+    root = DevContainerRoot.model_validate({"image": "myimage", "dockerfile": None})
+    assert isinstance(root.root, ImageDevContainer)
@@ -455,3 +455,158 @@ def test_append_lines_with_empty_file():
 """
 
     assert str(file) == expected_output
+
+
+def test_lines_are_built_lazily_from_content():
+    file = model.File.from_content(path="file.txt", content="Line 1\nLine 2\n")
+
+    assert len(file.lines) == 2
+    assert file.lines[-1] == model.Line(number=2, content="Line 2")
+    assert file.lines[:1] == [model.Line(number=1, content="Line 1")]
+    assert file.content() == "Line 1\nLine 2\n"
+
+
+def test_lines_keep_non_consecutive_numbers():
+    lines = [
+        model.Line(number=3, content="Line 3"),
+        model.Line(number=7, content="Line 7"),
+    ]
+    file = model.File(path="file.txt", lines=lines)
+
+    assert file.lines == lines
+    assert file.model_dump()["lines"] == [line.model_dump() for line in lines]
+    assert model.File.model_validate_json(file.model_dump_json()) == file
+
+
+def test_lines_reject_invalid_items():
+    with pytest.raises(ValueError):
+        model.File(path="file.txt", lines=[{"number": "one", "content": "Line 1"}])
+
+
+def test_assigned_lines_are_validated():
+    file = model.File.from_content(path="file.txt", content="Line 1")
+    file.lines = [model.Line(number=1, content="New line")]
+
+    assert isinstance(file.lines, model.Lines)
+    assert file.content() == "New line\n"
+    with pytest.raises(ValueError):
+        file.lines = [{"number": "one", "content": "Line 1"}]
+
+
+def test_lines_cannot_be_changed_in_place():
+    file = model.File.from_content(path="file.txt", content="Line 1\nLine 2")
+
+    with pytest.raises(ValueError, match="frozen"):
+        file.lines[0].content = "New line"
+    for line in file.lines:
+        with pytest.raises(ValueError, match="frozen"):
+            line.number = 3
+    assert file.lines[0] == model.Line(number=1, content="Line 1")
+    assert file.content() == "Line 1\nLine 2\n"
+
+
+def test_copies_share_lines():
+    file = model.File.from_content(path="file.txt", content="Line 1")
+    copy = file.model_copy(deep=True)
+
+    assert copy.lines is file.lines
+    copy.append_lines("Line 2")
+    assert len(file.lines) == 1
+
+
+def test_apply_edits():
+    file = model.File.from_content(
+        path="file.txt", content="Line 1\nLine 2\nLine 3\nLine 4\n"
+    )
+
+    file = file.apply_edits(
+        [
+            model.LineDiffUpdate(start_line=4, end_line=5, content="Line 6"),
+            model.LineDiffUpdate(start_line=1, end_line=1, content="Line 0"),
+            model.LineDiffUpdate(start_line=2, end_line=4, content=""),
+            model.LineDiffUpdate(start_line=5, end_line=5, content="Line 7"),
+        ]
+    )
+
+    expected_output = """\
+  ┌ file.txt
+1 │ Line 0
+2 │ Line 1
+3 │ Line 6
+4 │ Line 7
+  └\
+"""
+
+    assert str(file) == expected_output
+
+
+def test_apply_edits_keeps_order_of_insertions_at_same_line():
+    file = model.File.from_content(path="file.txt", content="Line 1")
+
+    file = file.apply_edits(
+        [
+            model.LineDiffUpdate(start_line=1, end_line=1, content="First"),
+            model.LineDiffUpdate(start_line=1, end_line=2, content="Replaced"),
+            model.LineDiffUpdate(start_line=1, end_line=1, content="Second"),
+        ]
+    )
+
+    assert file.content() == "First\nSecond\nReplaced\n"
+
+
+def test_apply_edits_rejects_overlapping_edits():
+    file = model.File.from_content(path="file.txt", content="Line 1\nLine 2\n")
+
+    with pytest.raises(ValueError):
+        file.apply_edits(
+            [
+                model.LineDiffUpdate(start_line=1, end_line=3, content=""),
+                model.LineDiffUpdate(start_line=2, end_line=3, content=""),
+            ]
+        )
+
+
+def test_file_render_window_with_context():
+    file = model.File.from_content(
+        path="README.md", content="".join(f"Line {i}\n" for i in range(1, 21))
+    )
+    file.diagnostics = [
+        model.Diagnostic(
+            range=model.Range(
+                start=model.Position(line=8, character=0),
+                end=model.Position(line=10, character=4),
+            ),
+            severity=model.DiagnosticSeverity.Error,
+            message="This is an error",
+        ),
+        model.Diagnostic(
+            range=model.Range(
+                start=model.Position(line=15, character=0),
+                end=model.Position(line=15, character=4),
+            ),
+            severity=model.DiagnosticSeverity.Warning,
+            message="This is a warning",
+        ),
+    ]
+
+    expected_output = """\
+   ┌ README.md
+ … │ …
+10 │ Line 10
+     ^^^^^^^ Error: This is an error
+
+11 │ Line 11
+     ^^^^ Error: This is an error
+
+12 │ Line 12
+ … │ …
+   └\
+"""
+
+    assert file.render(start_line=11, end_line=12, context=1) == expected_output
+
+
+def test_file_str_empty_file():
+    file = model.File(path="empty.txt")
+
+    assert str(file) == "  ┌ empty.txt\n  └"
@@ -0,0 +1,110 @@
+import asyncio
+
+import pytest
+
+import hide
+from hide import model
+from hide.client import HideClientError
+from tests.fake_server import FakeHideServer
+
+FILES = {"a.txt": "A 1\nA 2\n", "b.txt": "B 1\nB 2\nB 3\n"}
+
+
+def expected() -> list[model.FileResult]:
+    return [
+        model.FileResult(
+            path="a.txt", file=model.File.from_content("a.txt", FILES["a.txt"])
+        ),
+        model.FileResult(
+            path="b.txt",
+            start_line=2,
+            num_lines=1,
+            file=model.File(path="b.txt", lines=[model.Line(number=2, content="B 2")]),
+        ),
+        model.FileResult(path="missing.txt", error="file not found"),
+    ]
+
+
+def by_path(results) -> list[model.FileResult]:
+    return sorted(results, key=lambda result: result.path)
+
+
+@pytest.mark.parametrize("batch_reads", [True, False])
+def test_get_files(batch_reads: bool):
+    with FakeHideServer(batch_reads=batch_reads) as server:
+        project = server.add_project()
+        project.files.update(FILES)
+        client = hide.Client(base_url=server.base_url)
+
+        paths = ["a.txt", "b.txt", "missing.txt"]
+        results = client.get_files(project.id, paths, ranges=[None, (2, 1), None])
+
+        assert by_path(results) == expected()
+        requests = [path for _, path in server.requests]
+        if batch_reads:
+            assert requests == [f"/projects/{project.id}/files/batch"]
+        else:
+            assert len(requests) == 4
+
+
+def test_get_files_remembers_missing_batch_endpoint():
+    with FakeHideServer(batch_reads=False) as server:
+        project = server.add_project()
+        project.files.update(FILES)
+        client = hide.Client(base_url=server.base_url)
+
+        list(client.get_files(project.id, ["a.txt"]))
+        list(client.get_files(project.id, ["b.txt"]))
+
+        batch = f"/projects/{project.id}/files/batch"
+        assert [path for _, path in server.requests].count(batch) == 1
+
+
+def test_get_files_of_missing_project_raises():
+    with FakeHideServer() as server:
+        project = server.add_project()
+        project.files.update(FILES)
+        client = hide.Client(base_url=server.base_url)
+
+        with pytest.raises(HideClientError, match="project not found"):
+            list(client.get_files("missing", ["a.txt"]))
+        server.requests.clear()
+        list(client.get_files(project.id, ["a.txt", "b.txt"]))
+
+        assert server.requests == [("POST", f"/projects/{project.id}/files/batch")]
+
+
+def test_get_files_validates_ranges(fake_server: FakeHideServer):
+    client = hide.Client(base_url=fake_server.base_url)
+    with pytest.raises(HideClientError, match="one entry"):
+        client.get_files("1", ["a.txt", "b.txt"], ranges=[(1, 2)])
+
+
+@pytest.mark.parametrize("batch_reads", [True, False])
+def test_async_get_files(batch_reads: bool):
+    with FakeHideServer(batch_reads=batch_reads) as server:
+        project = server.add_project()
+        project.files.update(FILES)
+
+        async def scenario():
+            async with hide.AsyncClient(base_url=server.base_url) as client:
+                paths = ["a.txt", "b.txt", "missing.txt"]
+                ranges = [None, (2, 1), None]
+                return [r async for r in client.get_files(project.id, paths, ranges)]
+
+        assert by_path(asyncio.run(scenario())) == expected()
+
+
+def test_async_get_files_bounds_parallel_reads():
+    with FakeHideServer(batch_reads=False, latency=0.05) as server:
+        project = server.add_project()
+        project.files.update({f"{i}.txt": f"{i}\n" for i in range(6)})
+
+        async def scenario():
+            async with hide.AsyncClient(base_url=server.base_url) as client:
+                client.max_parallel_reads = 2
+                paths = [f"{i}.txt" for i in range(6)]
+                return [r async for r in client.get_files(project.id, paths)]
+
+        assert len(asyncio.run(scenario())) == 6
+        assert server.max_in_flight == 2
@@ -1,3 +1,4 @@
+import json
 from unittest.mock import Mock, patch
 
 import pytest
@@ -5,6 +6,7 @@ import pytest
 import hide
 from hide import model
 from hide.client import HideClientError
+from hide.client.timeouts import DEFAULT_CONNECT_TIMEOUT, DEFAULT_READ_TIMEOUT
 from hide.devcontainer.model import ImageDevContainer
 
 PROJECT_ID = "123"
@@ -18,16 +20,36 @@ def client() -> hide.Client:
     return hide.Client(base_url="http://localhost")
 
 
+def json_response(data) -> Mock:
+    return Mock(status_code=200, content=json.dumps(data).encode())
+
+
+def assert_requested(
+    mock_request: Mock,
+    method: str,
+    url: str,
+    params=None,
+    json=None,
+    headers=None,
+    timeout=(DEFAULT_CONNECT_TIMEOUT, DEFAULT_READ_TIMEOUT),
+):
+    mock_request.assert_called_once_with(
+        method, url, params=params, json=json, headers=headers, timeout=timeout
+    )
+
+
 def test_create_project_success(client: hide.Client):
     repository = model.Repository(url="http://example.com/repo.git")
     request_data = model.CreateProjectRequest(repository=repository)
     response_data = {"id": "123", "repository": repository.model_dump()}
 
-    with patch("requests.post") as mock_post:
-        mock_post.return_value = Mock(ok=True, json=lambda: response_data)
+    with patch.object(client.session, "request") as mock_request:
+        mock_request.return_value = json_response(response_data)
         project = client.create_project(repository=repository)
         assert project == model.Project(id="123", repository=repository)
-        mock_post.assert_called_once_with(
+        assert_requested(
+            mock_request,
+            "POST",
             "http://localhost/projects",
             json=request_data.model_dump(exclude_unset=True),
         )
@@ -43,13 +65,15 @@ def test_create_project_with_devcontainer(client: hide.Client):
     )
     response_data = {"id": "123", "repository": repository.model_dump()}
 
-    with patch("requests.post") as mock_post:
-        mock_post.return_value = Mock(ok=True, json=lambda: response_data)
+    with patch.object(client.session, "request") as mock_request:
+        mock_request.return_value = json_response(response_data)
         project = client.create_project(
             repository=repository, devcontainer=devcontainer
         )
         assert project == model.Project(id="123", repository=repository)
-        mock_post.assert_called_once_with(
+        assert_requested(
+            mock_request,
+            "POST",
             "http://localhost/projects",
             json=request_data.model_dump(exclude_unset=True),
         )
@@ -63,11 +87,13 @@ def test_create_project_with_languages(client: hide.Client):
     )
     response_data = {"id": "123", "repository": repository.model_dump()}
 
-    with patch("requests.post") as mock_post:
-        mock_post.return_value = Mock(ok=True, json=lambda: response_data)
+    with patch.object(client.session, "request") as mock_request:
+        mock_request.return_value = json_response(response_data)
         project = client.create_project(repository=repository, languages=languages)
         assert project == model.Project(id="123", repository=repository)
-        mock_post.assert_called_once_with(
+        assert_requested(
+            mock_request,
+            "POST",
             "http://localhost/projects",
             json=request_data.model_dump(exclude_unset=True),
         )
@@ -76,58 +102,64 @@ def test_create_project_with_languages(client: hide.Client):
 def test_create_project_failure(client: hide.Client):
     repository = model.Repository(url="http://example.com/repo.git")
 
-    with patch("requests.post") as mock_post:
-        mock_post.return_value = Mock(ok=False, text="Error")
+    with patch.object(client.session, "request") as mock_request:
+        mock_request.return_value = Mock(status_code=500, text="Error")
         with pytest.raises(HideClientError, match="Error"):
             client.create_project(repository=repository)
 
 
 def test_get_tasks_success(client):
     response_data = [{"alias": "build", "command": "make build"}]
-    with patch("requests.get") as mock_get:
-        mock_get.return_value = Mock(ok=True, json=lambda: response_data)
+    with patch.object(client.session, "request") as mock_request:
+        mock_request.return_value = json_response(response_data)
         tasks = client.get_tasks(PROJECT_ID)
         assert len(tasks) == 1
         assert tasks[0] == model.Task(alias="build", command="make build")
-        mock_get.assert_called_once_with("http://localhost/projects/123/tasks")
+        assert_requested(mock_request, "GET", "http://localhost/projects/123/tasks")
 
 
 def test_get_tasks_failure(client):
-    with patch("requests.get") as mock_get:
-        mock_get.return_value = Mock(ok=False, text="Error")
+    with patch.object(client.session, "request") as mock_request:
+        mock_request.return_value = Mock(status_code=500, text="Error")
         with pytest.raises(HideClientError, match="Error"):
             client.get_tasks(PROJECT_ID)
 
 
 def test_run_task_command_success(client):
     response_data = {"stdout": "output", "stderr": "", "exitCode": 0}
-    with patch("requests.post") as mock_post:
-        mock_post.return_value = Mock(ok=True, json=lambda: response_data)
+    with patch.object(client.session, "request") as mock_request:
+        mock_request.return_value = json_response(response_data)
         result = client.run_task(PROJECT_ID, command="echo Hello")
         assert result == model.TaskResult(stdout="output", stderr="", exit_code=0)
-        mock_post.assert_called_once_with(
+        assert_requested(
+            mock_request,
+            "POST",
             "http://localhost/projects/123/tasks",
             json={"command": "echo Hello"},
             headers=None,
+            timeout=(DEFAULT_CONNECT_TIMEOUT, None),
         )
 
 
 def test_run_task_alias_success(client):
     response_data = {"stdout": "output", "stderr": "", "exitCode": 0}
-    with patch("requests.post") as mock_post:
-        mock_post.return_value = Mock(ok=True, json=lambda: response_data)
+    with patch.object(client.session, "request") as mock_request:
+        mock_request.return_value = json_response(response_data)
         result = client.run_task(PROJECT_ID, alias="build")
         assert result == model.TaskResult(stdout="output", stderr="", exit_code=0)
-        mock_post.assert_called_once_with(
+        assert_requested(
+            mock_request,
+            "POST",
             "http://localhost/projects/123/tasks",
             json={"alias": "build"},
             headers=None,
+            timeout=(DEFAULT_CONNECT_TIMEOUT, None),
         )
 
 
 def test_run_task_failure(client):
-    with patch("requests.post") as mock_post:
-        mock_post.return_value = Mock(ok=False, text="Error")
+    with patch.object(client.session, "request") as mock_request:
+        mock_request.return_value = Mock(status_code=500, text="Error")
         with pytest.raises(HideClientError, match="Error"):
             client.run_task(PROJECT_ID, command="echo Hello")
 
@@ -152,86 +184,98 @@ def test_run_task_negative_timeout(client):
 
 
 def test_create_file_success(client):
-    with patch("requests.post") as mock_post:
-        mock_post.return_value = Mock(ok=True, json=lambda: FILE)
+    with patch.object(client.session, "request") as mock_request:
+        mock_request.return_value = json_response(FILE)
         file = client.create_file(PROJECT_ID, PATH, CONTENT)
         assert file == model.File.from_content(path=PATH, content=CONTENT)
-        mock_post.assert_called_once_with(
+        assert_requested(
+            mock_request,
+            "POST",
             "http://localhost/projects/123/files",
             json={"path": PATH, "content": CONTENT},
         )
 
 
 def test_create_file_failure(client):
-    with patch("requests.post") as mock_post:
-        mock_post.return_value = Mock(ok=False, text="Error")
+    with patch.object(client.session, "request") as mock_request:
+        mock_request.return_value = Mock(status_code=500, text="Error")
         with pytest.raises(HideClientError, match="Error"):
             client.create_file(PROJECT_ID, PATH, CONTENT)
 
 
 def test_get_file(client):
-    with patch("requests.get") as mock_get:
-        mock_get.return_value = Mock(ok=True, json=lambda: FILE)
+    with patch.object(client.session, "request") as mock_request:
+        mock_request.return_value = json_response(FILE)
         file = client.get_file(PROJECT_ID, PATH)
         assert file == model.File.from_content(path=PATH, content=CONTENT)
-        mock_get.assert_called_once_with(
-            url=f"http://localhost/projects/123/files/{PATH}",
-            params={"startLine": None, "numLines": None},
+        assert_requested(
+            mock_request,
+            "GET",
+            f"http://localhost/projects/123/files/{PATH}",
+            params={},
         )
 
 
 def test_get_file_with_start_line(client):
-    with patch("requests.get") as mock_get:
-        mock_get.return_value = Mock(ok=True, json=lambda: FILE)
+    with patch.object(client.session, "request") as mock_request:
+        mock_request.return_value = json_response(FILE)
         file = client.get_file(PROJECT_ID, PATH, start_line=10)
         assert file == model.File.from_content(path=PATH, content="Hello World")
-        mock_get.assert_called_once_with(
-            url=f"http://localhost/projects/123/files/{PATH}",
-            params={"startLine": 10, "numLines": None},
+        assert_requested(
+            mock_request,
+            "GET",
+            f"http://localhost/projects/123/files/{PATH}",
+            params={"startLine": 10},
         )
 
 
 def test_get_file_with_num_lines(client):
-    with patch("requests.get") as mock_get:
-        mock_get.return_value = Mock(ok=True, json=lambda: FILE)
+    with patch.object(client.session, "request") as mock_request:
+        mock_request.return_value = json_response(FILE)
         file = client.get_file(PROJECT_ID, PATH, num_lines=10)
         assert file == model.File.from_content(path=PATH, content="Hello World")
-        mock_get.assert_called_once_with(
-            url=f"http://localhost/projects/123/files/{PATH}",
-            params={"startLine": None, "numLines": 10},
+        assert_requested(
+            mock_request,
+            "GET",
+            f"http://localhost/projects/123/files/{PATH}",
+            params={"numLines": 10},
         )
 
 
 def test_get_file_failure(client):
-    with patch("requests.get") as mock_get:
-        mock_get.return_value = Mock(ok=False, text="Error")
+    with patch.object(client.session, "request") as mock_request:
+        mock_request.return_value = Mock(status_code=500, text="Error")
         with pytest.raises(HideClientError, match="Error"):
             client.get_file(PROJECT_ID, PATH)
 
 
 def test_update_file_with_udiff_succeeds(client):
-    with patch("requests.put") as mock_put:
-        mock_put.return_value = Mock(ok=True, json=lambda: FILE)
+    with patch.object(client.session, "request") as mock_request:
+        mock_request.return_value = json_response(FILE)
         file = client.update_file(
             PROJECT_ID, PATH, model.UdiffUpdate(patch="test-patch")
         )
         assert file == model.File.from_content(path=PATH, content=CONTENT)
-        mock_put.assert_called_once_with(
+        assert_requested(
+            mock_request,
+            "PUT",
             f"http://localhost/projects/123/files/{PATH}",
             json={"type": "udiff", "udiff": {"patch": "test-patch"}},
         )
 
 
 def test_update_file_with_linediff_succeeds(client):
-    with patch("requests.put") as mock_put:
-        mock_put.return_value = Mock(ok=True, json=lambda: FILE)
+    with patch.object(client.session, "request") as mock_request:
+        mock_request.return_value = json_response(FILE)
         file = client.update_file(
             PROJECT_ID,
             PATH,
             model.LineDiffUpdate(start_line=1, end_line=10, content="test-content"),
         )
         assert file == model.File.from_content(path=PATH, content=CONTENT)
-        mock_put.assert_called_once_with(
+        assert_requested(
+            mock_request,
+            "PUT",
             f"http://localhost/projects/123/files/{PATH}",
             json={
                 "type": "linediff",
@@ -241,67 +285,71 @@ def test_update_file_with_linediff_succeeds(client):
 
 
 def test_update_file_with_overwrite_succeeds(client):
-    with patch("requests.put") as mock_put:
-        mock_put.return_value = Mock(ok=True, json=lambda: FILE)
+    with patch.object(client.session, "request") as mock_request:
+        mock_request.return_value = json_response(FILE)
         file = client.update_file(
             PROJECT_ID, PATH, model.OverwriteUpdate(content=CONTENT)
         )
         assert file == model.File.from_content(path=PATH, content=CONTENT)
-        mock_put.assert_called_once_with(
+        assert_requested(
+            mock_request,
+            "PUT",
             f"http://localhost/projects/123/files/{PATH}",
             json={"type": "overwrite", "overwrite": {"content": CONTENT}},
         )
 
 
 def test_update_file_failure(client):
-    with patch("requests.put") as mock_put:
-        mock_put.return_value = Mock(ok=False, text="Error")
+    with patch.object(client.session, "request") as mock_request:
+        mock_request.return_value = Mock(status_code=500, text="Error")
         with pytest.raises(HideClientError, match="Error"):
             client.update_file(PROJECT_ID, PATH, model.UdiffUpdate(patch="test-patch"))
 
 
 def test_delete_file_success(client):
-    with patch("requests.delete") as mock_delete:
-        mock_delete.return_value = Mock(ok=True, status_code=204)
+    with patch.object(client.session, "request") as mock_request:
+        mock_request.return_value = Mock(status_code=204)
         assert client.delete_file(PROJECT_ID, PATH)
-        mock_delete.assert_called_once_with(
-            f"http://localhost/projects/123/files/{PATH}"
+        assert_requested(
+            mock_request, "DELETE", f"http://localhost/projects/123/files/{PATH}"
         )
 
 
 def test_delete_file_with_file(client):
-    with patch("requests.delete") as mock_delete:
-        mock_delete.return_value = Mock(ok=True, status_code=204)
+    with patch.object(client.session, "request") as mock_request:
+        mock_request.return_value = Mock(status_code=204)
         assert client.delete_file(PROJECT_ID, model.File(path=PATH))
-        mock_delete.assert_called_once_with(
-            f"http://localhost/projects/123/files/{PATH}"
+        assert_requested(
+            mock_request, "DELETE", f"http://localhost/projects/123/files/{PATH}"
         )
 
 
 def test_delete_file_with_file_info(client):
-    with patch("requests.delete") as mock_delete:
-        mock_delete.return_value = Mock(ok=True, status_code=204)
+    with patch.object(client.session, "request") as mock_request:
+        mock_request.return_value = Mock(status_code=204)
         assert client.delete_file(PROJECT_ID, model.FileInfo(path=PATH))
-        mock_delete.assert_called_once_with(
-            f"http://localhost/projects/123/files/{PATH}"
+        assert_requested(
+            mock_request, "DELETE", f"http://localhost/projects/123/files/{PATH}"
         )
 
 
 def test_delete_file_failure(client):
-    with patch("requests.delete") as mock_delete:
-        mock_delete.return_value = Mock(ok=False, text="Error")
+    with patch.object(client.session, "request") as mock_request:
+        mock_request.return_value = Mock(status_code=500, text="Error")
         with pytest.raises(HideClientError, match="Error"):
             client.delete_file(PROJECT_ID, PATH)
 
 
 def test_list_files_json(client):
     response_data = [{"path": "README.md", "content": "Hello World"}]
-    with patch("requests.get") as mock_get:
-        mock_get.return_value = Mock(ok=True, json=lambda: response_data)
+    with patch.object(client.session, "request") as mock_request:
+        mock_request.return_value = json_response(response_data)
         files = client.list_files(PROJECT_ID, format=model.ListFilesFormat.JSON)
         assert files == [model.FileInfo(path="README.md")]
-        mock_get.assert_called_once_with(
-            url="http://localhost/projects/123/files",
+        assert_requested(
+            mock_request,
+            "GET",
+            "http://localhost/projects/123/files",
             params={},
             headers={"Accept": "application/json"},
         )
@@ -309,12 +357,16 @@ def test_list_files_json(client):
 
 def test_list_files_tree(client):
     response_data = ".\n├── file1.txt\n└── file2.txt\n"
-    with patch("requests.get") as mock_get:
-        mock_get.return_value = Mock(ok=True, content=response_data.encode())
+    with patch.object(client.session, "request") as mock_request:
+        mock_request.return_value = Mock(
+            status_code=200, content=response_data.encode()
+        )
         files = client.list_files(PROJECT_ID, format=model.ListFilesFormat.TREE)
         assert files == response_data
-        mock_get.assert_called_once_with(
-            url="http://localhost/projects/123/files",
+        assert_requested(
+            mock_request,
+            "GET",
+            "http://localhost/projects/123/files",
             params={},
             headers={"Accept": "text/plain"},
         )
@@ -322,12 +374,14 @@ def test_list_files_tree(client):
 
 def test_list_files_with_include_param(client):
     response_data = [{"path": "src/main.py", "content": "print('Hello')"}]
-    with patch("requests.get") as mock_get:
-        mock_get.return_value = Mock(ok=True, json=lambda: response_data)
+    with patch.object(client.session, "request") as mock_request:
+        mock_request.return_value = json_response(response_data)
         files = client.list_files(PROJECT_ID, include=["src/**/*.py"])
         assert files == [model.FileInfo(path="src/main.py")]
-        mock_get.assert_called_once_with(
-            url="http://localhost/projects/123/files",
+        assert_requested(
+            mock_request,
+            "GET",
+            "http://localhost/projects/123/files",
             params={"include": ["src/**/*.py"]},
             headers={"Accept": "application/json"},
         )
@@ -335,12 +389,14 @@ def test_list_files_with_include_param(client):
 
 def test_list_files_with_exclude_param(client):
     response_data = [{"path": "README.md", "content": "# Project"}]
-    with patch("requests.get") as mock_get:
-        mock_get.return_value = Mock(ok=True, json=lambda: response_data)
+    with patch.object(client.session, "request") as mock_request:
+        mock_request.return_value = json_response(response_data)
         files = client.list_files(PROJECT_ID, exclude=["*.py", "*.js"])
         assert files == [model.FileInfo(path="README.md")]
-        mock_get.assert_called_once_with(
-            url="http://localhost/projects/123/files",
+        assert_requested(
+            mock_request,
+            "GET",
+            "http://localhost/projects/123/files",
             params={"exclude": ["*.py", "*.js"]},
             headers={"Accept": "application/json"},
         )
@@ -348,22 +404,24 @@ def test_list_files_with_exclude_param(client):
 
 def test_list_files_with_include_and_exclude_params(client):
     response_data = [{"path": "src/util.py", "content": "# Utility functions"}]
-    with patch("requests.get") as mock_get:
-        mock_get.return_value = Mock(ok=True, json=lambda: response_data)
+    with patch.object(client.session, "request") as mock_request:
+        mock_request.return_value = json_response(response_data)
         files = client.list_files(
             PROJECT_ID, include=["src/**/*.py"], exclude=["src/test_*.py"]
         )
         assert files == [model.FileInfo(path="src/util.py")]
-        mock_get.assert_called_once_with(
-            url="http://localhost/projects/123/files",
+        assert_requested(
+            mock_request,
+            "GET",
+            "http://localhost/projects/123/files",
             params={"include": ["src/**/*.py"], "exclude": ["src/test_*.py"]},
             headers={"Accept": "application/json"},
         )
 
 
 def test_list_files_failure(client):
-    with patch("requests.get") as mock_get:
-        mock_get.return_value = Mock(ok=False, text="Error")
+    with patch.object(client.session, "request") as mock_request:
+        mock_request.return_value = Mock(status_code=500, text="Error")
         with pytest.raises(HideClientError, match="Error"):
             client.list_files(PROJECT_ID)
 
@@ -372,11 +430,13 @@ def test_search_files_default(client):
     response_data = [
         {"path": "src/main.py", "lines": [{"number": 1, "content": "Hello"}]}
     ]
-    with patch("requests.get") as mock_get:
-        mock_get.return_value = Mock(ok=True, json=lambda: response_data)
+    with patch.object(client.session, "request") as mock_request:
+        mock_request.return_value = json_response(response_data)
         files = client.search_files(PROJECT_ID, query="Hello")
         assert files == [model.File.from_content(path="src/main.py", content="Hello")]
-        mock_get.assert_called_once_with(
+        assert_requested(
+            mock_request,
+            "GET",
             f"http://localhost/projects/{PROJECT_ID}/search",
             params={"query": "Hello", "type": "content"},
         )
@@ -389,8 +449,8 @@ def test_search_files_exact(client):
             "lines": [{"number": 1, "content": "def hello(): pass"}],
         }
     ]
-    with patch("requests.get") as mock_get:
-        mock_get.return_value = Mock(ok=True, json=lambda: response_data)
+    with patch.object(client.session, "request") as mock_request:
+        mock_request.return_value = json_response(response_data)
         files = client.search_files(
             PROJECT_ID,
             query="hello",
@@ -399,7 +459,9 @@ def test_search_files_exact(client):
         assert files == [
             model.File.from_content(path="src/util.py", content="def hello(): pass")
         ]
-        mock_get.assert_called_once_with(
+        assert_requested(
+            mock_request,
+            "GET",
             f"http://localhost/projects/{PROJECT_ID}/search",
             params={
                 "query": "hello",
@@ -416,8 +478,8 @@ def test_search_files_regex(client):
             "lines": [{"number": 1, "content": "def hello(): pass"}],
         }
     ]
-    with patch("requests.get") as mock_get:
-        mock_get.return_value = Mock(ok=True, json=lambda: response_data)
+    with patch.object(client.session, "request") as mock_request:
+        mock_request.return_value = json_response(response_data)
         files = client.search_files(
             PROJECT_ID,
             query="hello",
@@ -426,7 +488,9 @@ def test_search_files_regex(client):
         assert files == [
             model.File.from_content(path="src/util.py", content="def hello(): pass")
         ]
-        mock_get.assert_called_once_with(
+        assert_requested(
+            mock_request,
+            "GET",
             f"http://localhost/projects/{PROJECT_ID}/search",
             params={
                 "query": "hello",
@@ -443,8 +507,8 @@ def test_search_files_hidden(client):
             "lines": [{"number": 1, "content": "def hello(): pass"}],
         }
     ]
-    with patch("requests.get") as mock_get:
-        mock_get.return_value = Mock(ok=True, json=lambda: response_data)
+    with patch.object(client.session, "request") as mock_request:
+        mock_request.return_value = json_response(response_data)
         files = client.search_files(
             PROJECT_ID,
             query="hello",
@@ -453,7 +517,9 @@ def test_search_files_hidden(client):
         assert files == [
             model.File.from_content(path="src/util.py", content="def hello(): pass")
         ]
-        mock_get.assert_called_once_with(
+        assert_requested(
+            mock_request,
+            "GET",
             f"http://localhost/projects/{PROJECT_ID}/search",
             params={
                 "query": "hello",
@@ -470,8 +536,8 @@ def test_search_files_with_include(client):
             "lines": [{"number": 1, "content": "def hello(): pass"}],
         }
     ]
-    with patch("requests.get") as mock_get:
-        mock_get.return_value = Mock(ok=True, json=lambda: response_data)
+    with patch.object(client.session, "request") as mock_request:
+        mock_request.return_value = json_response(response_data)
         files = client.search_files(
             PROJECT_ID,
             query="hello",
@@ -480,7 +546,9 @@ def test_search_files_with_include(client):
         assert files == [
             model.File.from_content(path="src/util.py", content="def hello(): pass")
         ]
-        mock_get.assert_called_once_with(
+        assert_requested(
+            mock_request,
+            "GET",
             f"http://localhost/projects/{PROJECT_ID}/search",
             params={
                 "query": "hello",
@@ -497,8 +565,8 @@ def test_search_files_with_exclude(client):
             "lines": [{"number": 1, "content": "def hello(): pass"}],
         }
     ]
-    with patch("requests.get") as mock_get:
-        mock_get.return_value = Mock(ok=True, json=lambda: response_data)
+    with patch.object(client.session, "request") as mock_request:
+        mock_request.return_value = json_response(response_data)
         files = client.search_files(
             PROJECT_ID,
             query="hello",
@@ -507,7 +575,9 @@ def test_search_files_with_exclude(client):
         assert files == [
             model.File.from_content(path="src/util.py", content="def hello(): pass")
         ]
-        mock_get.assert_called_once_with(
+        assert_requested(
+            mock_request,
+            "GET",
             f"http://localhost/projects/{PROJECT_ID}/search",
             params={
                 "query": "hello",
@@ -517,9 +587,35 @@ def test_search_files_with_exclude(client):
         )
 
 
+def test_search_files_with_caps(client):
+    with patch.object(client.session, "request") as mock_request:
+        mock_request.return_value = json_response([])
+        client.search_files(
+            PROJECT_ID,
+            query="test",
+            limit=20,
+            offset=40,
+            max_matches_per_file=3,
+            context_lines=2,
+        )
+        assert_requested(
+            mock_request,
+            "GET",
+            f"http://localhost/projects/{PROJECT_ID}/search",
+            params={
+                "query": "test",
+                "type": "content",
+                "limit": 20,
+                "offset": 40,
+                "maxMatchesPerFile": 3,
+                "contextLines": 2,
+            },
+        )
+
+
 def test_search_files_failure(client):
-    with patch("requests.get") as mock_get:
-        mock_get.return_value = Mock(ok=False, text="Error")
+    with patch.object(client.session, "request") as mock_request:
+        mock_request.return_value = Mock(status_code=500, text="Error")
         with pytest.raises(HideClientError, match="Error"):
             client.search_files(PROJECT_ID, query="test")
 
@@ -551,17 +647,19 @@ def test_document_outline_success(client):
             }
         ],
     }
-    with patch("requests.get") as mock_get:
-        mock_get.return_value = Mock(ok=True, json=lambda: response_data)
+    with patch.object(client.session, "request") as mock_request:
+        mock_request.return_value = json_response(response_data)
         outline = client.document_outline(PROJECT_ID, PATH)
         assert outline == model.DocumentOutline.model_validate(response_data)
-        mock_get.assert_called_once_with(
-            f"http://localhost/projects/{PROJECT_ID}/outline/{PATH}"
+        assert_requested(
+            mock_request,
+            "GET",
+            f"http://localhost/projects/{PROJECT_ID}/outline/{PATH}",
         )
 
 
 def test_document_outline_failure(client):
-    with patch("requests.get") as mock_get:
-        mock_get.return_value = Mock(ok=False, text="Error")
+    with patch.object(client.session, "request") as mock_request:
+        mock_request.return_value = Mock(status_code=500, text="Error")
         with pytest.raises(HideClientError, match="Error"):
             client.document_outline(PROJECT_ID, PATH)
@@ -0,0 +1,46 @@
+import subprocess
+import sys
+
+import pytest
+
+import hide
+
+DEFERRED = ["requests", "httpx", "pydantic", "hide.devcontainer.model", "langchain"]
+
+
+def imported_after(statement: str) -> list[str]:
+    check = f"import sys; {statement}; print(*(m for m in {DEFERRED!r} if m in sys.modules))"
+    result = subprocess.run(
+        [sys.executable, "-c", check], capture_output=True, text=True, check=True
+    )
+    return result.stdout.split()
+
+
+@pytest.mark.parametrize(
+    "statement, expected",
+    [
+        ("import hide", []),
+        ("import hide.client", []),
+        ("import hide.toolkit", []),
+        ("import hide; hide.Client", ["requests", "pydantic"]),
+        ("import hide; hide.AsyncClient", ["httpx", "pydantic"]),
+        ("import hide; hide.model", ["pydantic"]),
+    ],
+)
+def test_import_defers_dependencies(statement: str, expected: list[str]):
+    assert imported_after(statement) == expected
+
+
+def test_lazy_attributes():
+    assert hide.Client.__name__ == "HideClient"
+    assert "AsyncClient" in dir(hide)
+    with pytest.raises(AttributeError, match="no attribute 'Missing'"):
+        hide.Missing
+
+
+def test_lazy_submodules():
+    check = "import hide; print(hide.model.File.__name__, hide.client.__name__)"
+    result = subprocess.run(
+        [sys.executable, "-c", check], capture_output=True, text=True, check=True
+    )
+    assert result.stdout.split() == ["File", "hide.client"]
@@ -0,0 +1,167 @@
+import asyncio
+import random
+
+import pytest
+import requests
+
+import hide
+from hide.client import HideClientError, LatencyHistograms, RequestEvent, RequestHook
+from hide.client.instrumentation import Histogram, Span
+from hide.client.retry import NO_RETRY, RetryPolicy
+from hide.toolkit import AsyncToolkit, Toolkit
+from tests.fake_server import FakeHideServer
+
+
+class Recorder(RequestHook):
+    def __init__(self) -> None:
+        self.calls: list[tuple[str, object]] = []
+
+    def before_request(self, event: RequestEvent) -> None:
+        assert event.latency is None
+        self.calls.append(("before", event))
+
+    def after_request(self, event: RequestEvent) -> None:
+        self.calls.append(("after", event))
+
+    def span_started(self, span: Span) -> None:
+        self.calls.append(("span_started", span))
+
+    def span_ended(self, span: Span) -> None:
+        self.calls.append(("span_ended", span))
+
+    def events(self) -> list[RequestEvent]:
+        return [event for kind, event in self.calls if kind == "after"]
+
+
+def test_histogram_quantiles():
+    histogram = Histogram()
+    values = [random.uniform(0.001, 1) for _ in range(10_000)]
+    for value in values:
+        histogram.add(value)
+    values.sort()
+    assert histogram.count == 10_000
+    assert histogram.quantile(0.5) == pytest.approx(values[4_999], rel=0.05)
+    assert histogram.quantile(0.99) == pytest.approx(values[9_899], rel=0.05)
+    assert histogram.quantile(1) == histogram.max == values[-1]
+    assert Histogram().quantile(0.5) == 0
+
+
+def test_hooks_see_each_request(fake_server):
+    project = fake_server.add_project()
+    project.files["a.txt"] = "a\n"
+    recorder = Recorder()
+    fake_server.fail_next(1, status=503, headers={"Retry-After": "0"})
+    with hide.Client(base_url=fake_server.base_url, hooks=[recorder]) as client:
+        client.get_file(project.id, "a.txt")
+        client.create_file(project.id, "b.txt", "b\n")
+
+    assert [kind for kind, _ in recorder.calls] == ["before", "after"] * 2
+    read, write = recorder.events()
+    assert (read.name, read.method, read.project_id) == ("get_file", "GET", project.id)
+    assert read.status_code == 200
+    assert read.retries == 1
+    assert read.request_bytes == 0
+    assert read.response_bytes > 0
+    assert read.latency > 0
+    assert read.span is None
+    assert write.name == "create_file"
+    assert write.request_bytes > len("b\n")
+    assert write.retries == 0
+
+
+def test_hooks_see_failed_requests(fake_server):
+    project = fake_server.add_project()
+    recorder = Recorder()
+    fake_server.fail_next(1, status=None)
+    client = hide.Client(
+        base_url=fake_server.base_url, hooks=[recorder], retry=NO_RETRY
+    )
+    with client:
+        with pytest.raises(requests.ConnectionError):
+            client.get_project(project.id)
+        with pytest.raises(HideClientError):
+            client.get_file(project.id, "missing.txt")
+
+    dropped, missing = recorder.events()
+    assert isinstance(dropped.error, requests.ConnectionError)
+    assert dropped.status_code is None
+    assert missing.error is None
+    assert missing.status_code == 404
+
+
+def test_toolkit_calls_are_spans(fake_server):
+    project = fake_server.add_project()
+    project.files["a.txt"] = "a\n"
+    histograms = LatencyHistograms()
+    recorder = Recorder()
+    client = hide.Client(base_url=fake_server.base_url, hooks=[histograms, recorder])
+    with client:
+        toolkit = Toolkit(client.get_project(project.id), client)
+        toolkit.get_file("a.txt")
+        toolkit.get_file("missing.txt")
+        toolkit.list_files()
+
+    assert [kind for kind, _ in recorder.calls[2:6]] == [
+        "span_started",
+        "before",
+        "after",
+        "span_ended",
+    ]
+    span = recorder.calls[2][1]
+    assert span.name == "tool.get_file"
+    assert span.attributes == {"project_id": project.id}
+    assert span.duration >= recorder.calls[4][1].latency
+    assert all(event.span is not None for event in recorder.events()[1:])
+
+    summary = histograms.summary()
+    assert summary["get_file"].count == 2
+    assert summary["get_file"].errors == 1
+    assert summary["tool.get_file"].count == 2
+    assert summary["tool.list_files"].count == 1
+    assert summary["get_project"].count == 1
+    assert summary["get_file"].p50 <= summary["get_file"].p99
+    histograms.reset()
+    assert histograms.summary() == {}
+
+
+def test_spans_nest(fake_server):
+    project = fake_server.add_project()
+    recorder = Recorder()
+    with hide.Client(base_url=fake_server.base_url, hooks=[recorder]) as client:
+        with client.span("agent step", step=1) as outer:
+            Toolkit(client.get_project(project.id), client).get_tasks()
+
+    spans = [event for kind, event in recorder.calls if kind == "span_ended"]
+    assert [span.name for span in spans] == ["tool.get_tasks", "agent step"]
+    assert spans[0].parent is outer
+    assert [event.span for event in recorder.events()] == [outer, spans[0]]
+
+
+def test_client_without_hooks_has_no_spans():
+    with hide.Client().span("step") as span:
+        assert span is None
+
+
+def test_async_hooks():
+    recorder = Recorder()
+
+    async def main(server: FakeHideServer, project_id: str) -> None:
+        async with hide.AsyncClient(
+            base_url=server.base_url, hooks=[recorder], retry=RetryPolicy(backoff=0)
+        ) as client:
+            toolkit = AsyncToolkit(await client.get_project(project_id), client)
+            await asyncio.gather(toolkit.get_tasks(), toolkit.list_files())
+            async for _ in client.stream_task(project_id, command="echo"):
+                pass
+
+    with FakeHideServer() as server:
+        project = server.add_project()
+        server.fail_next(1, status=502)
+        asyncio.run(main(server, project.id))
+
+    events = {event.name: event for event in recorder.events()}
+    assert events["get_project"].retries == 1
+    assert events["get_tasks"].span.name == "tool.get_tasks"
+    assert events["list_files"].span.name == "tool.list_files"
+    assert events["stream_task"].status_code == 200
+    assert events["stream_task"].span is None
@@ -0,0 +1,218 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+import hide
+from hide.client import DeadlineExceeded, Limit, RateLimiter, RateLimits, deadline
+from hide.client.limits import (
+    EndpointClass,
+    _Slots,
+    _TokenBucket,
+    endpoint_class,
+    shared_limiter,
+)
+from tests.fake_server import FakeHideServer
+
+
+def test_endpoint_class():
+    assert endpoint_class("/projects/p1/tasks") == EndpointClass.TASKS
+    assert endpoint_class("/projects/p1/tasks/t1") == EndpointClass.TASKS
+    assert endpoint_class("/projects/p1/files/src/main.py") == EndpointClass.FILES
+    assert endpoint_class("/projects/p1/outline/main.py") == EndpointClass.FILES
+    assert endpoint_class("/projects/p1/changesets") == EndpointClass.FILES
+    assert endpoint_class("/projects/p1/search") == EndpointClass.SEARCH
+    assert endpoint_class("/projects/p1") == EndpointClass.OTHER
+    assert endpoint_class("/projects") == EndpointClass.OTHER
+
+
+def test_limit_validates():
+    with pytest.raises(ValueError):
+        Limit(rate=0)
+    with pytest.raises(ValueError):
+        Limit(burst=0)
+    with pytest.raises(ValueError):
+        Limit(max_in_flight=0)
+
+
+def test_token_bucket_bursts_then_spaces_out_requests():
+    bucket = _TokenBucket(rate=10, burst=2)
+    assert bucket.reserve() == 0
+    assert bucket.reserve() == 0
+    delays = [bucket.reserve() for _ in range(3)]
+    assert delays == sorted(delays)
+    assert delays[0] == pytest.approx(0.1, abs=0.01)
+    assert delays[2] == pytest.approx(0.3, abs=0.01)
+
+
+def test_token_bucket_does_not_reserve_past_max_delay():
+    bucket = _TokenBucket(rate=10, burst=1)
+    assert bucket.reserve() == 0
+    assert bucket.reserve(max_delay=0.05) is None
+    assert bucket.reserve(max_delay=0.5) == pytest.approx(0.1, abs=0.01)
+
+
+def test_slots_are_handed_out_in_order():
+    slots = _Slots(1)
+    slots.acquire()
+    order = []
+
+    def take(i: int) -> None:
+        slots.acquire()
+        order.append(i)
+        slots.release()
+
+    threads = []
+    for i in range(5):
+        thread = threading.Thread(target=take, args=(i,))
+        thread.start()
+        threads.append(thread)
+        while len(slots._waiters) <= i:
+            time.sleep(0.001)
+    slots.release()
+    for thread in threads:
+        thread.join()
+    assert order == [0, 1, 2, 3, 4]
+
+
+def test_async_slots_survive_cancellation():
+    async def main() -> None:
+        slots = _Slots(1)
+        await slots.acquire_async()
+        waiter = asyncio.ensure_future(slots.acquire_async())
+        await asyncio.sleep(0)
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+        slots.release()
+        await asyncio.wait_for(slots.acquire_async(), 1)
+
+    asyncio.run(main())
+
+
+def test_slots_time_out():
+    slots = _Slots(1)
+    slots.acquire()
+    assert not slots.acquire(timeout=0.01)
+    assert not slots._waiters
+
+    async def main() -> None:
+        assert not await slots.acquire_async(timeout=0.01)
+        slots.release()
+        assert await slots.acquire_async(timeout=0.01)
+
+    asyncio.run(main())
+
+
+def test_rate_limit_spaces_out_requests(fake_server):
+    limits = RateLimits(files=Limit(rate=20, burst=1))
+    project = fake_server.add_project()
+    project.files["a.py"] = "a\n"
+    with hide.Client(base_url=fake_server.base_url, rate_limits=limits) as client:
+        start = time.monotonic()
+        for _ in range(5):
+            client.get_file(project.id, "a.py")
+        assert time.monotonic() - start >= 0.19
+        client.get_project(project.id)
+
+
+def test_max_in_flight_queues_instead_of_failing():
+    limits = RateLimits(files=Limit(max_in_flight=2))
+    with FakeHideServer(latency=0.05) as server:
+        project = server.add_project()
+        project.files["a.py"] = "a\n"
+        client = hide.Client(
+            base_url=server.base_url, pool_maxsize=8, rate_limits=limits
+        )
+        with client, ThreadPoolExecutor(8) as pool:
+            files = list(
+                pool.map(lambda _: client.get_file(project.id, "a.py"), range(8))
+            )
+        assert len(files) == 8
+        assert server.max_in_flight == 2
+
+
+def test_max_in_flight_is_shared_with_async_clients():
+    limits = RateLimits(files=Limit(max_in_flight=3))
+
+    async def main(server: FakeHideServer, project_id: str) -> None:
+        async with hide.AsyncClient(
+            base_url=server.base_url, rate_limits=limits
+        ) as first, hide.AsyncClient(
+            base_url=server.base_url, rate_limits=limits
+        ) as second:
+            await asyncio.gather(
+                *(client.get_file(project_id, "a.py") for client in [first, second] * 5)
+            )
+
+    with FakeHideServer(latency=0.05) as server:
+        project = server.add_project()
+        project.files["a.py"] = "a\n"
+        asyncio.run(main(server, project.id))
+        assert server.max_in_flight == 3
+
+
+def test_limiter_is_shared_per_server_and_limits():
+    limits = RateLimits(tasks=Limit(rate=5))
+    limiter = shared_limiter("http://localhost:8080", limits)
+    assert shared_limiter("http://localhost:8080/", limits) is limiter
+    assert shared_limiter("http://localhost:8080", RateLimits()) is not limiter
+    assert shared_limiter("http://localhost:9090", limits) is not limiter
+    assert isinstance(limiter, RateLimiter)
+
+    client = hide.Client(base_url="http://localhost:8080", rate_limits=limits)
+    assert client.rate_limiter is limiter
+    assert hide.Client(base_url="http://localhost:8080").rate_limiter is None
+
+
+@pytest.mark.parametrize(
+    "limit", [Limit(rate=0.5, burst=1), Limit(max_in_flight=1)], ids=["rate", "slots"]
+)
+def test_limits_give_up_at_deadline(limit: Limit):
+    limiter = RateLimiter(RateLimits(files=limit))
+    path = "/projects/p1/files/a.py"
+
+    async def wait_async() -> None:
+        async with limiter.limit_async(path):
+            pass
+
+    with limiter.limit(path):
+        start = time.monotonic()
+        with deadline(0.1), pytest.raises(DeadlineExceeded):
+            with limiter.limit(path):
+                pass
+        with deadline(0.1), pytest.raises(DeadlineExceeded):
+            asyncio.run(wait_async())
+        assert time.monotonic() - start < 0.5
+
+
+def test_streamed_responses_hold_their_slot(fake_server):
+    limits = RateLimits(tasks=Limit(max_in_flight=1))
+    project = fake_server.add_project()
+    with hide.Client(base_url=fake_server.base_url, rate_limits=limits) as client:
+        events = client.stream_task(project.id, command="echo")
+        next(events)
+        with deadline(0.1), pytest.raises(DeadlineExceeded):
+            client.run_task(project.id, command="echo")
+        events.close()
+        client.run_task(project.id, command="echo")
+
+
+def test_async_streamed_responses_hold_their_slot(fake_server):
+    limits = RateLimits(tasks=Limit(max_in_flight=1))
+    project = fake_server.add_project()
+
+    async def main() -> None:
+        async with hide.AsyncClient(
+            base_url=fake_server.base_url, rate_limits=limits
+        ) as client:
+            events = client.stream_task(project.id, command="echo")
+            await events.__anext__()
+            with deadline(0.1), pytest.raises(DeadlineExceeded):
+                await client.run_task(project.id, command="echo")
+            await events.aclose()
+            await client.run_task(project.id, command="echo")
+
+    asyncio.run(main())
@@ -0,0 +1,109 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+
+import pytest
+import requests
+
+import hide
+from hide.client import HideClientError
+from hide.client.retry import NO_RETRY, RetryPolicy
+from tests.fake_server import FakeHideServer
+
+FAST = RetryPolicy(backoff=0.001)
+
+
+def test_delay_grows_exponentially_with_jitter():
+    policy = RetryPolicy(max_attempts=10, backoff=1, max_backoff=5)
+    for attempt, limit in [(1, 1), (2, 2), (3, 4), (4, 5), (8, 5)]:
+        delays = [policy.delay("GET", attempt, 503) for _ in range(100)]
+        assert all(0 <= delay <= limit for delay in delays)
+        assert max(delays) > limit / 2
+
+
+def test_delay_honours_retry_after():
+    policy = RetryPolicy(max_backoff=10)
+    assert policy.delay("GET", 1, 503, {"Retry-After": "2"}) == 2
+    assert policy.delay("GET", 1, 503, {"Retry-After": "60"}) is None
+
+    date = format_datetime(datetime.now(timezone.utc) + timedelta(seconds=5))
+    assert 3 < policy.delay("GET", 1, 429, {"Retry-After": date}) <= 5
+
+
+def test_delay_only_for_retryable_requests():
+    policy = RetryPolicy(max_attempts=2)
+    assert policy.delay("GET", 1) is not None
+    assert policy.delay("DELETE", 1, 502) is not None
+    assert policy.delay("GET", 2, 502) is None
+    assert policy.delay("GET", 1, 500) is None
+    assert policy.delay("POST", 1, 503) is None
+    assert RetryPolicy(methods=frozenset({"POST"})).delay("POST", 1, 503) is not None
+
+
+def test_rejects_invalid_policy():
+    with pytest.raises(ValueError):
+        RetryPolicy(max_attempts=0)
+
+
+@pytest.mark.parametrize("status", [503, None])
+def test_client_retries_get(fake_server: FakeHideServer, status):
+    project = fake_server.add_project()
+    client = hide.Client(base_url=fake_server.base_url, retry=FAST)
+
+    fake_server.fail_next(2, status=status)
+
+    assert client.get_project(project.id).id == project.id
+    assert client.retry_stats.retries == 2
+
+
+def test_client_gives_up_after_max_attempts(fake_server: FakeHideServer):
+    project = fake_server.add_project()
+    client = hide.Client(base_url=fake_server.base_url, retry=FAST)
+
+    fake_server.fail_next(3)
+
+    with pytest.raises(HideClientError, match="unavailable") as error:
+        client.get_tasks(project.id)
+    assert error.value.status_code == 503
+    assert client.retry_stats.retries == 2
+
+
+def test_client_does_not_retry_post_unless_asked(fake_server: FakeHideServer):
+    project = fake_server.add_project()
+
+    fake_server.fail_next(status=None)
+    client = hide.Client(base_url=fake_server.base_url, retry=FAST)
+    with pytest.raises(requests.ConnectionError):
+        client.run_task(project.id, command="make")
+
+    fake_server.fail_next()
+    retry = RetryPolicy(backoff=0.001, methods=frozenset({"GET", "DELETE", "POST"}))
+    client = hide.Client(base_url=fake_server.base_url, retry=retry)
+    assert client.run_task(project.id, command="make").exit_code == 0
+    assert client.retry_stats.retries == 1
+
+
+def test_retries_can_be_disabled(fake_server: FakeHideServer):
+    project = fake_server.add_project()
+    client = hide.Client(base_url=fake_server.base_url, retry=NO_RETRY)
+
+    fake_server.fail_next()
+    with pytest.raises(HideClientError):
+        client.get_project(project.id)
+
+
+@pytest.mark.parametrize("status", [503, None])
+def test_async_client_retries_get(fake_server: FakeHideServer, status):
+    project = fake_server.add_project()
+
+    async def scenario():
+        async with hide.AsyncClient(
+            base_url=fake_server.base_url, retry=FAST
+        ) as client:
+            fake_server.fail_next(2, status=status)
+            fetched = await client.get_project(project.id)
+            return fetched, client.retry_stats.retries
+
+    fetched, retries = asyncio.run(scenario())
+    assert fetched.id == project.id
+    assert retries == 2
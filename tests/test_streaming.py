@@ -0,0 +1,287 @@
+import asyncio
+import itertools
+import json
+
+import pytest
+
+import hide
+from hide import model
+from hide.client import HideClientError, TaskOutputBuffer
+from hide.client.streaming import (
+    CHUNK_SIZE,
+    JsonArrayDecoder,
+    TaskEventDecoder,
+    decode_json_array,
+    decode_task_events,
+)
+from tests.fake_server import FakeHideServer
+
+STREAM = (
+    ": keep-alive\r\n"
+    "event: stdout\r\n"
+    "data: first\r\n"
+    "data: \r\n"
+    "\r\n"
+    "event: stderr\n"
+    "data: héllo\n"
+    "\n"
+    "event: exit\n"
+    'data: {"exitCode": 1}\n'
+    "\n"
+).encode()
+
+EVENTS = [
+    model.TaskOutput(stream=model.TaskStream.STDOUT, data="first\n"),
+    model.TaskOutput(stream=model.TaskStream.STDERR, data="héllo"),
+    model.TaskExit(exit_code=1),
+]
+
+
+def test_decode_task_events():
+    assert list(decode_task_events([STREAM])) == EVENTS
+
+
+def test_decode_task_events_split_anywhere():
+    chunks = [STREAM[i : i + 1] for i in range(len(STREAM))]
+    assert list(decode_task_events(chunks)) == EVENTS
+
+
+def test_decode_task_events_without_exit():
+    with pytest.raises(HideClientError, match="without an exit code"):
+        list(decode_task_events([b"event: stdout\ndata: out\n\n"]))
+
+
+def test_decode_task_events_error():
+    decoder = TaskEventDecoder()
+    with pytest.raises(HideClientError, match="container stopped"):
+        decoder.feed(b"event: error\ndata: container stopped\n\n")
+
+
+ITEMS = [
+    {"path": 'a"]}{[\\', "lines": [{"number": 1, "content": "]"}]},
+    {"path": "héllo ☃"},
+    [1, {}],
+    12.5,
+    None,
+]
+ARRAY = json.dumps(ITEMS, ensure_ascii=False, indent=1).encode()
+
+
+def test_decode_json_array_split_anywhere():
+    for i in range(len(ARRAY) + 1):
+        assert list(decode_json_array([ARRAY[:i], ARRAY[i:]])) == ITEMS
+    chunks = [ARRAY[i : i + 1] for i in range(len(ARRAY))]
+    assert list(decode_json_array(chunks)) == ITEMS
+
+
+def test_decode_json_array_yields_complete_items():
+    decoder = JsonArrayDecoder()
+    assert decoder.feed(b'[{"path": "a"}, {"pa') == [{"path": "a"}]
+    assert decoder.feed(b'th": "b"}, 1') == [{"path": "b"}]
+    assert decoder.feed(b"2]") == [12]
+    assert decoder.close() == []
+
+
+@pytest.mark.parametrize(
+    "data", [b"", b"[1, 2", b'{"path": "a"}', b"[1 2]", b"[1,]", b"[1] 2"]
+)
+def test_decode_json_array_invalid(data: bytes):
+    with pytest.raises(HideClientError, match="JSON list"):
+        list(decode_json_array([data]))
+
+
+def test_output_buffer_keeps_tail():
+    buffer = TaskOutputBuffer(max_chars=5)
+    for data in ["abc", "defg", "h"]:
+        buffer.add(model.TaskOutput(stream=model.TaskStream.STDOUT, data=data))
+    buffer.add(model.TaskOutput(stream=model.TaskStream.STDERR, data="error"))
+    buffer.add(model.TaskExit(exit_code=2))
+
+    assert buffer.result() == model.TaskResult(
+        stdout="defgh", stderr="error", exit_code=2
+    )
+
+
+def test_output_buffer_requires_exit():
+    buffer = TaskOutputBuffer()
+    buffer.add(model.TaskOutput(stream=model.TaskStream.STDOUT, data="out"))
+    with pytest.raises(HideClientError):
+        buffer.result()
+
+
+def test_client_streams_task(fake_server: FakeHideServer):
+    project = fake_server.add_project()
+    client = hide.Client(base_url=fake_server.base_url)
+
+    events = list(client.stream_task(project.id, command="make\nmake test"))
+
+    assert events == [
+        model.TaskOutput(stream=model.TaskStream.STDOUT, data="make\n"),
+        model.TaskOutput(stream=model.TaskStream.STDOUT, data="make test\n"),
+        model.TaskExit(exit_code=0),
+    ]
+
+
+def test_client_stream_task_failure(fake_server: FakeHideServer):
+    project = fake_server.add_project()
+    client = hide.Client(base_url=fake_server.base_url)
+
+    with pytest.raises(HideClientError, match="Cannot provide both"):
+        client.stream_task(project.id, command="ls", alias="build")
+    with pytest.raises(HideClientError, match="task not found"):
+        list(client.stream_task(project.id, alias="build"))
+
+
+def test_async_client_streams_task(fake_server: FakeHideServer):
+    project = fake_server.add_project()
+    buffer = TaskOutputBuffer(max_chars=5)
+
+    async def scenario():
+        async with hide.AsyncClient(base_url=fake_server.base_url) as client:
+            async for event in client.stream_task(project.id, command="make test"):
+                buffer.add(event)
+
+    asyncio.run(scenario())
+    assert buffer.result() == model.TaskResult(stdout="test\n", stderr="", exit_code=0)
+
+
+def test_client_iterates_files(fake_server: FakeHideServer):
+    project = fake_server.add_project()
+    for i in range(2_000):
+        project.files[f"src/module_{i:04}.py"] = f"value = {i}\n"
+    client = hide.Client(base_url=fake_server.base_url)
+
+    assert list(client.iter_files(project.id)) == client.list_files(project.id)
+    assert list(client.iter_search_files(project.id, "value = 12")) == (
+        client.search_files(project.id, "value = 12")
+    )
+
+    files = client.iter_files(project.id)
+    first = list(itertools.islice(files, 3))
+    files.close()
+    assert [file.path for file in first] == [f"src/module_{i:04}.py" for i in range(3)]
+    assert client.get_file(project.id, "src/module_0000.py").path == first[0].path
+
+
+def test_client_reads_sized_responses_in_chunks(
+    fake_server: FakeHideServer, monkeypatch: pytest.MonkeyPatch
+):
+    project = fake_server.add_project()
+    for i in range(5_000):
+        project.files[f"src/module_{i:04}.py"] = ""
+    chunks = []
+    feed = JsonArrayDecoder.feed
+    monkeypatch.setattr(
+        JsonArrayDecoder,
+        "feed",
+        lambda self, chunk: chunks.append(len(chunk)) or feed(self, chunk),
+    )
+    client = hide.Client(base_url=fake_server.base_url)
+
+    files = client.iter_files(project.id)
+    next(files)
+    files.close()
+    assert chunks == [CHUNK_SIZE]
+
+
+def test_client_searches_page_by_page(fake_server: FakeHideServer):
+    project = fake_server.add_project()
+    for i in range(25):
+        project.files[f"m{i:02}.py"] = "a\nneedle 1\nb\nneedle 2\nc\n"
+    client = hide.Client(base_url=fake_server.base_url)
+
+    found = client.iter_search_files(
+        project.id, "needle", max_matches_per_file=1, context_lines=1, page_size=10
+    )
+    first = list(itertools.islice(found, 12))
+    assert [file.path for file in first] == [f"m{i:02}.py" for i in range(12)]
+    assert [line.number for line in first[0].lines] == [1, 2, 3]
+    assert len(fake_server.requests) == 2
+
+    assert len(list(found)) == 13
+    assert len(fake_server.requests) == 3
+    assert client.search_files(project.id, "needle", limit=5, offset=20) == (
+        client.search_files(project.id, "needle")[20:]
+    )
+
+
+def ignore_params(
+    server: FakeHideServer, monkeypatch: pytest.MonkeyPatch, ignored: tuple[str, ...]
+) -> None:
+    search = server._search
+    monkeypatch.setattr(
+        server,
+        "_search",
+        lambda project, query: search(
+            project, {k: v for k, v in query.items() if k not in ignored}
+        ),
+    )
+
+
+@pytest.mark.parametrize(
+    "files, ignored, pages",
+    [
+        (5, ("limit", "offset"), 1),
+        (2, ("limit", "offset"), 2),
+        (5, ("offset",), 2),
+    ],
+)
+def test_paging_stops_if_server_does_not_paginate(
+    fake_server: FakeHideServer,
+    monkeypatch: pytest.MonkeyPatch,
+    files: int,
+    ignored: tuple[str, ...],
+    pages: int,
+):
+    project = fake_server.add_project()
+    project.files.update({f"m{i}.py": "needle\n" for i in range(files)})
+    ignore_params(fake_server, monkeypatch, ignored)
+    client = hide.Client(base_url=fake_server.base_url)
+
+    found = list(client.iter_search_files(project.id, "needle", page_size=2))
+    # Without offset, only the first page can be read.
+    expected = files if "limit" in ignored else 2
+    assert [file.path for file in found] == [f"m{i}.py" for i in range(expected)]
+    assert len(fake_server.requests) == pages
+
+
+def test_client_iterate_files_failure(fake_server: FakeHideServer):
+    client = hide.Client(base_url=fake_server.base_url)
+    with pytest.raises(HideClientError, match="project not found"):
+        list(client.iter_files("missing"))
+    with pytest.raises(ValueError, match="page_size"):
+        client.iter_search_files("missing", "needle", page_size=0)
+
+
+def test_async_client_iterates_files(fake_server: FakeHideServer):
+    project = fake_server.add_project()
+    project.files.update({"a.py": "a = 1\n", "b.py": "b = 2\n"})
+
+    async def scenario():
+        async with hide.AsyncClient(base_url=fake_server.base_url) as client:
+            paths = [file.path async for file in client.iter_files(project.id)]
+            found = [f async for f in client.iter_search_files(project.id, "b =")]
+            pages = client.iter_search_files(project.id, " = ", page_size=1)
+            paged = [file.path async for file in pages]
+            return paths, found, paged
+
+    paths, found, paged = asyncio.run(scenario())
+    assert paths == ["a.py", "b.py"]
+    assert found == [model.File.from_content("b.py", "b = 2\n")]
+    assert paged == ["a.py", "b.py"]
+
+
+def test_async_paging_stops_if_server_ignores_offset(
+    fake_server: FakeHideServer, monkeypatch: pytest.MonkeyPatch
+):
+    project = fake_server.add_project()
+    project.files.update({f"m{i}.py": "needle\n" for i in range(5)})
+    ignore_params(fake_server, monkeypatch, ("offset",))
+
+    async def scenario():
+        async with hide.AsyncClient(base_url=fake_server.base_url) as client:
+            pages = client.iter_search_files(project.id, "needle", page_size=2)
+            return [file.path async for file in pages]
+
+    assert asyncio.run(scenario()) == ["m0.py", "m1.py"]
+    assert len(fake_server.requests) == 2
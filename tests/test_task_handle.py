@@ -0,0 +1,58 @@
+import asyncio
+
+import pytest
+
+import hide
+from hide import model
+from hide.client import HideClientError
+from tests.fake_server import FakeHideServer
+
+
+def test_start_task_and_wait(fake_server: FakeHideServer):
+    project = fake_server.add_project()
+    client = hide.Client(base_url=fake_server.base_url)
+
+    handle = client.start_task(project.id, command="make test")
+
+    assert not handle.done
+    assert handle.wait(timeout=5) == model.TaskResult(
+        stdout="make test\n", stderr="", exit_code=0
+    )
+    assert handle.task.status == model.TaskStatus.COMPLETED
+    assert not handle.cancel()
+
+
+def test_wait_times_out_and_cancel(fake_server: FakeHideServer):
+    project = fake_server.add_project()
+    client = hide.Client(base_url=fake_server.base_url)
+
+    handle = client.start_task(project.id, command="sleep 60")
+
+    with pytest.raises(HideClientError, match="did not finish within 0.1 seconds"):
+        handle.wait(timeout=0.1, poll_interval=0.02)
+    assert handle.poll().status == model.TaskStatus.RUNNING
+    assert handle.cancel()
+    with pytest.raises(HideClientError, match="cancelled"):
+        handle.wait()
+
+
+def test_start_task_validates_arguments(fake_server: FakeHideServer):
+    client = hide.Client(base_url=fake_server.base_url)
+    with pytest.raises(HideClientError, match="Either 'command' or 'alias'"):
+        client.start_task(fake_server.add_project().id)
+
+
+def test_async_task_handle(fake_server: FakeHideServer):
+    project = fake_server.add_project()
+
+    async def scenario():
+        async with hide.AsyncClient(base_url=fake_server.base_url) as client:
+            build = await client.start_task(project.id, command="make build")
+            sleep = await client.start_task(project.id, command="sleep 60")
+            with pytest.raises(HideClientError, match="did not finish"):
+                await sleep.wait(timeout=0.1, poll_interval=0.02)
+            return await build.wait(timeout=5), await sleep.cancel()
+
+    result, cancelled = asyncio.run(scenario())
+    assert result.stdout == "make build\n"
+    assert cancelled
@@ -0,0 +1,139 @@
+import asyncio
+import json
+import time
+from unittest.mock import Mock, patch
+
+import pytest
+import requests
+
+import hide
+from hide.client import DeadlineExceeded, HideClientError, Timeout, deadline
+from hide.client.retry import NO_RETRY, RetryPolicy
+from hide.client.timeouts import remaining, task_timeout
+from hide.toolkit import Toolkit
+from tests.fake_server import FakeHideServer
+
+
+def test_deadline_can_only_be_shortened():
+    assert remaining() is None
+    with deadline(10):
+        assert 9 < remaining() <= 10
+        with deadline(60):
+            assert remaining() <= 10
+        with deadline(1):
+            assert remaining() <= 1
+        with deadline(None):
+            assert 9 < remaining() <= 10
+    assert remaining() is None
+
+
+def test_timeout_limits():
+    timeout = Timeout(connect=5, read=30)
+    assert timeout.limits() == (5, 30)
+    assert timeout.limits(wait=60) == (5, 90)
+    assert timeout.limits(wait=None) == (5, None)
+    assert Timeout(connect=None, read=None).limits() == (None, None)
+
+    with deadline(2):
+        connect, read = timeout.limits(wait=None)
+        assert connect <= 2 and read <= 2
+    with deadline(0):
+        with pytest.raises(DeadlineExceeded):
+            timeout.limits()
+
+    with pytest.raises(ValueError):
+        Timeout(read=0)
+
+
+def test_task_timeout_is_capped_by_deadline():
+    assert task_timeout(None) is None
+    assert task_timeout(30) == 30
+    with deadline(4.5):
+        assert task_timeout(None) == 5
+        assert task_timeout(30) == 5
+        assert task_timeout(2) == 2
+
+
+def test_run_task_within_deadline_limits_the_task():
+    client = hide.Client(base_url="http://localhost")
+    response_data = {"stdout": "", "stderr": "", "exitCode": 0}
+    with patch.object(client.session, "request") as mock_request:
+        mock_request.return_value = Mock(
+            status_code=200, content=json.dumps(response_data).encode()
+        )
+        with deadline(5):
+            client.run_task("123", command="make", timeout=60)
+    kwargs = mock_request.call_args.kwargs
+    assert kwargs["headers"] == {"X-Timeout-Seconds": "5"}
+    assert kwargs["timeout"][1] <= 5
+
+
+def test_read_timeout():
+    with FakeHideServer(latency=0.5) as server:
+        project = server.add_project()
+        client = hide.Client(
+            base_url=server.base_url, timeout=Timeout(read=0.05), retry=NO_RETRY
+        )
+        with client, pytest.raises(requests.Timeout):
+            client.get_project(project.id)
+
+
+def test_deadline_fails_fast():
+    with FakeHideServer(latency=0.5) as server:
+        project = server.add_project()
+        with hide.Client(base_url=server.base_url) as client:
+            start = time.monotonic()
+            with deadline(0.1), pytest.raises(DeadlineExceeded):
+                client.get_project(project.id)
+            assert time.monotonic() - start < 0.4
+
+
+def test_deadline_stops_retries(fake_server):
+    project = fake_server.add_project()
+    fake_server.fail_next(3, status=503, headers={"Retry-After": "1"})
+    client = hide.Client(
+        base_url=fake_server.base_url, retry=RetryPolicy(max_attempts=5)
+    )
+    with client, deadline(0.5), pytest.raises(HideClientError) as error:
+        client.get_project(project.id)
+    assert error.value.status_code == 503
+    assert client.retry_stats.retries == 0
+
+
+def test_deadline_flows_into_parallel_reads():
+    with FakeHideServer(latency=0.2, batch_reads=False) as server:
+        project = server.add_project()
+        project.files.update({"a.txt": "a\n", "b.txt": "b\n"})
+        with hide.Client(base_url=server.base_url) as client, deadline(0.3):
+            # The first 0.2 seconds go to finding out batch reads are unsupported.
+            results = list(client.get_files(project.id, ["a.txt", "b.txt"]))
+    assert [result.error for result in results] == ["Deadline exceeded"] * 2
+
+
+def test_async_deadline_fails_fast():
+    async def main(base_url: str, project_id: str) -> None:
+        async with hide.AsyncClient(base_url=base_url) as client:
+            with deadline(0.1):
+                await client.get_project(project_id)
+
+    with FakeHideServer(latency=0.5) as server:
+        project = server.add_project()
+        start = time.monotonic()
+        with pytest.raises(DeadlineExceeded):
+            asyncio.run(main(server.base_url, project.id))
+        assert time.monotonic() - start < 0.4
+
+
+def test_toolkit_deadline():
+    with FakeHideServer(latency=0.3) as server:
+        project = server.add_project()
+        project.files["a.txt"] = "a\n"
+        with hide.Client(base_url=server.base_url) as client:
+            toolkit = Toolkit(client.get_project(project.id), client, deadline=0.05)
+            assert toolkit.get_file("a.txt") == (
+                "Failed to get file: Deadline exceeded"
+            )
+            with deadline(0.05):
+                assert Toolkit(toolkit.project, client).list_files() == (
+                    "Failed to list files: Deadline exceeded"
+                )
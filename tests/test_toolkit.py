@@ -1,9 +1,19 @@
+import sys
 from unittest.mock import create_autospec
 
 import pytest
 
 from hide import Client
-from hide.model import File, FileInfo, Line, Project, Repository, Task, TaskResult
+from hide.model import (
+    File,
+    FileInfo,
+    Line,
+    LineDiffUpdate,
+    Project,
+    Repository,
+    Task,
+    TaskResult,
+)
 from hide.toolkit.toolkit import Toolkit
 
 PROJECT_ID = "123"
@@ -85,9 +95,6 @@ def test_apply_patch_failure(toolkit: Toolkit, hide_client: Client):
 
 
 def test_insert_lines_success(toolkit: Toolkit, hide_client: Client):
-    hide_client.get_file.return_value = File(
-        path=PATH, lines=[Line(number=1, content=CONTENT)]
-    )
     expected = File(
         path=PATH,
         lines=[Line(number=1, content="New line"), Line(number=2, content=CONTENT)],
@@ -95,19 +102,21 @@ def test_insert_lines_success(toolkit: Toolkit, hide_client: Client):
     hide_client.update_file.return_value = expected
     file = toolkit.insert_lines(PATH, 1, "New line")
     assert file == f"File updated:\n{expected}"
+    hide_client.get_file.assert_not_called()
+    hide_client.update_file.assert_called_once_with(
+        project_id=PROJECT_ID,
+        path=PATH,
+        update=LineDiffUpdate(start_line=1, end_line=1, content="New line"),
+    )
 
 
 def test_insert_lines_failure(toolkit: Toolkit, hide_client: Client):
-    hide_client.get_file.side_effect = Exception("Error")
+    hide_client.update_file.side_effect = Exception("Error")
     file = toolkit.insert_lines(PATH, 1, "New line")
     assert file == "Failed to insert lines: Error"
 
 
 def test_replace_lines_success(toolkit: Toolkit, hide_client: Client):
-    hide_client.get_file.return_value = File(
-        path=PATH,
-        lines=[Line(number=1, content=CONTENT), Line(number=2, content="Old line")],
-    )
     expected = File(
         path=PATH,
         lines=[Line(number=1, content=CONTENT), Line(number=2, content="New line")],
@@ -115,10 +124,16 @@ def test_replace_lines_success(toolkit: Toolkit, hide_client: Client):
     hide_client.update_file.return_value = expected
     file = toolkit.replace_lines(PATH, 2, 3, "New line")
     assert file == f"File updated:\n{expected}"
+    hide_client.get_file.assert_not_called()
+    hide_client.update_file.assert_called_once_with(
+        project_id=PROJECT_ID,
+        path=PATH,
+        update=LineDiffUpdate(start_line=2, end_line=3, content="New line"),
+    )
 
 
 def test_replace_lines_failure(toolkit: Toolkit, hide_client: Client):
-    hide_client.get_file.side_effect = Exception("Error")
+    hide_client.update_file.side_effect = Exception("Error")
     file = toolkit.replace_lines(PATH, 1, 2, "New line")
     assert file == "Failed to replace lines: Error"
 
@@ -134,6 +149,11 @@ def test_append_lines_success(toolkit: Toolkit, hide_client: Client):
     hide_client.update_file.return_value = expected
     file = toolkit.append_lines(PATH, "New line")
     assert file == f"File updated:\n{expected}"
+    hide_client.update_file.assert_called_once_with(
+        project_id=PROJECT_ID,
+        path=PATH,
+        update=LineDiffUpdate(start_line=2, end_line=2, content="New line"),
+    )
 
 
 def test_append_lines_failure(toolkit: Toolkit, hide_client: Client):
@@ -177,3 +197,65 @@ def test_list_files_failure(toolkit: Toolkit, hide_client: Client):
     hide_client.list_files.side_effect = Exception("Error")
     files = toolkit.list_files()
     assert files == "Failed to list files: Error"
+
+
+def test_line_edits_against_server(fake_server):
+    fake_project = fake_server.add_project()
+    fake_project.files[PATH] = "Line 1\nLine 2\nLine 3\n"
+    project = Project(
+        id=fake_project.id, repository=Repository(url="http://example.com/repo.git")
+    )
+    toolkit = Toolkit(project=project, client=Client(base_url=fake_server.base_url))
+
+    toolkit.insert_lines(PATH, 2, "Inserted")
+    toolkit.replace_lines(PATH, 3, 4, "Replaced")
+    toolkit.append_lines(PATH, "Appended")
+
+    assert fake_project.files[PATH] == "Line 1\nInserted\nReplaced\nLine 3\nAppended\n"
+
+
+def test_background_tasks_against_server(fake_server):
+    fake_project = fake_server.add_project()
+    project = Project(
+        id=fake_project.id, repository=Repository(url="http://example.com/repo.git")
+    )
+    toolkit = Toolkit(project=project, client=Client(base_url=fake_server.base_url))
+
+    build = toolkit.start_task(command="make build").removeprefix("Task started: ")
+    server = toolkit.start_task(command="sleep 60").removeprefix("Task started: ")
+
+    assert (
+        toolkit.wait_for_task(build) == "exit code: 0\nstdout: make build\n\nstderr: "
+    )
+    assert toolkit.get_task_status(server) == f"Task {server} is running"
+    assert toolkit.cancel_task(server) == f"Task cancelled: {server}"
+    assert toolkit.cancel_task(build) == f"Task {build} already finished"
+
+
+def test_start_task_failure(toolkit: Toolkit, hide_client: Client):
+    hide_client.start_task.side_effect = Exception("Error")
+    result = toolkit.start_task(command="make build")
+    assert result == "Failed to start task: Error"
+
+
+def test_get_files_against_server(fake_server):
+    fake_project = fake_server.add_project()
+    fake_project.files[PATH] = CONTENT
+    project = Project(
+        id=fake_project.id, repository=Repository(url="http://example.com/repo.git")
+    )
+    toolkit = Toolkit(project=project, client=Client(base_url=fake_server.base_url))
+
+    result = toolkit.get_files([PATH, "missing.txt"])
+
+    assert result == (
+        f"{File.from_content(PATH, CONTENT)}\n\n"
+        "Failed to get file missing.txt: file not found"
+    )
+
+
+def test_as_langchain_requires_extra(toolkit: Toolkit, monkeypatch):
+    monkeypatch.delitem(sys.modules, "hide.langchain.toolkit", raising=False)
+    monkeypatch.setitem(sys.modules, "langchain_community", None)
+    with pytest.raises(ImportError, match="hide-py\\[langchain\\]"):
+        toolkit.as_langchain()
@@ -0,0 +1,46 @@
+import pytest
+import requests
+
+import hide
+from hide import model
+from hide.client import create_session
+from tests.fake_server import FakeHideServer
+
+
+def test_create_session_mounts_sized_adapter():
+    session = create_session(pool_connections=2, pool_maxsize=5, pool_block=True)
+    for prefix in ("http://", "https://"):
+        adapter = session.get_adapter(f"{prefix}localhost")
+        assert adapter._pool_connections == 2
+        assert adapter._pool_maxsize == 5
+        assert adapter._pool_block
+
+
+@pytest.mark.parametrize("kwargs", [{"pool_connections": 0}, {"pool_maxsize": 0}])
+def test_create_session_rejects_non_positive_sizes(kwargs):
+    with pytest.raises(ValueError):
+        create_session(**kwargs)
+
+
+def test_client_reuses_connection(fake_server: FakeHideServer):
+    project = fake_server.add_project()
+    project.files["README.md"] = "Hello\n"
+
+    with hide.Client(base_url=fake_server.base_url) as client:
+        for _ in range(10):
+            file = client.get_file(project.id, "README.md")
+            assert file == model.File.from_content(path="README.md", content="Hello")
+
+    assert len(fake_server.requests) == 10
+    assert fake_server.connections == 1
+
+
+def test_client_uses_injected_session(fake_server: FakeHideServer):
+    project = fake_server.add_project()
+    session = requests.Session()
+
+    client = hide.Client(base_url=fake_server.base_url, session=session)
+    assert client.session is session
+    assert client.get_project(project.id) == model.Project(
+        id=project.id, repository=model.Repository(url="http://example.com/repo.git")
+    )